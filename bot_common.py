@@ -0,0 +1,114 @@
+"""
+Bot Common - Shared Telegram Bot Pieces
+=======================================
+
+Configuration, logging and handlers shared by cloud_bot.py and
+cloud_bot_v2.py. Each bot only defines its backend-specific handlers
+(/status, /help, /start text and the trigger workflow).
+
+Author: Mohammad Khair AbuShanab
+Created: January 28, 2026
+"""
+
+import os
+import re
+import sys
+import logging
+
+# Telegram imports
+try:
+    from telegram import Update
+    from telegram.ext import Application, ContextTypes
+except ImportError:
+    print("ERROR: python-telegram-bot not installed!")
+    print("Install: pip install python-telegram-bot==20.7")
+    sys.exit(1)
+
+# =============================================================================
+# CONFIGURATION - From Environment Variables
+# =============================================================================
+
+# Telegram Bot
+BOT_TOKEN = os.getenv("BOT_TOKEN", "8401341002:AAHf4fB2bp4JATnaYo3RbK9EG_ziRHxz1f4")
+AUTHORIZED_USER_ID = int(os.getenv("AUTHORIZED_USER_ID", "1003476862"))
+TRIGGER_CODEWORD = os.getenv("TRIGGER_CODEWORD", "RUNNIT")
+# Compiled once - filters.Regex routes the codeword straight to handle_trigger
+TRIGGER_PATTERN = re.compile(rf"^\s*{re.escape(TRIGGER_CODEWORD)}\s*$", re.IGNORECASE)
+
+# Webhook (Railway) - Telegram pushes updates instead of the bot polling.
+# Used when RAILWAY_PUBLIC_DOMAIN is set; USE_POLLING=1 forces polling (local dev)
+WEBHOOK_DOMAIN = os.getenv("RAILWAY_PUBLIC_DOMAIN")
+WEBHOOK_PORT = int(os.getenv("PORT", "8443"))
+USE_POLLING = os.getenv("USE_POLLING", "").lower() in ("1", "true", "yes")
+
+# =============================================================================
+# LOGGING CONFIGURATION
+# =============================================================================
+
+logging.basicConfig(
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    level=logging.INFO,
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# TELEGRAM BOT HANDLERS
+# =============================================================================
+
+def is_authorized(user_id: int) -> bool:
+    """Check if user is authorized"""
+    return user_id == AUTHORIZED_USER_ID
+
+async def handle_other(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle any other text message"""
+    user_id = update.effective_user.id
+
+    # Reject before doing any other work for unauthorized users
+    if not is_authorized(user_id):
+        await update.message.reply_text("⛔ Unauthorized")
+        return
+
+    message_text = update.message.text.strip()
+    logger.info("Message from %s: %s", user_id, message_text)
+
+    await update.message.reply_text(
+        f"❓ Unknown command: `{message_text}`\n\n"
+        f"Send `{TRIGGER_CODEWORD}` to trigger automation",
+        parse_mode='Markdown'
+    )
+
+async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle errors"""
+    logger.error("Update %s caused error %s", update, context.error)
+
+# =============================================================================
+# STARTUP
+# =============================================================================
+
+def run_application(application: Application) -> None:
+    """
+    Run the bot until stopped - webhook on Railway, polling otherwise.
+
+    Args:
+        application: Fully configured telegram Application
+    """
+    if WEBHOOK_DOMAIN and not USE_POLLING:
+        # Telegram pushes each update to us - no polling delay
+        logger.info("Listening for webhook on port %s (%s)", WEBHOOK_PORT, WEBHOOK_DOMAIN)
+        application.run_webhook(
+            listen='0.0.0.0',
+            port=WEBHOOK_PORT,
+            url_path=BOT_TOKEN,
+            webhook_url=f"https://{WEBHOOK_DOMAIN}/{BOT_TOKEN}",
+            drop_pending_updates=True
+        )
+    else:
+        # Start polling
+        application.run_polling(
+            poll_interval=30,
+            timeout=10,
+            drop_pending_updates=True
+        )
@@ -18,8 +18,10 @@ Created: January 6, 2026
 import os
 import sys
 import logging
+import asyncio
 import tempfile
-import shutil
+import threading
+import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -33,18 +35,16 @@ except ImportError:
     print("Install: pip install python-telegram-bot==20.7")
     sys.exit(1)
 
-# Local imports
-from email_downloader import OutlookIMAPDownloader
-from ticket_processor import TicketsToGPRSFormatter
+from bot_common import (
+    BOT_TOKEN, AUTHORIZED_USER_ID, TRIGGER_CODEWORD, TRIGGER_PATTERN,
+    is_authorized, handle_other, error_handler, run_application
+)
 
 # =============================================================================
 # CONFIGURATION - From Environment Variables
 # =============================================================================
 
-# Telegram Bot
-BOT_TOKEN = os.getenv("BOT_TOKEN", "8401341002:AAHf4fB2bp4JATnaYo3RbK9EG_ziRHxz1f4")
-AUTHORIZED_USER_ID = int(os.getenv("AUTHORIZED_USER_ID", "1003476862"))
-TRIGGER_CODEWORD = os.getenv("TRIGGER_CODEWORD", "RUNNIT")
+# Telegram bot + webhook settings live in bot_common.py
 
 # Outlook/Email
 OUTLOOK_EMAIL = os.getenv("OUTLOOK_EMAIL", "mkhair.abushanab@jepco.com.jo")
@@ -54,24 +54,38 @@ EMAIL_SUBJECT = os.getenv("EMAIL_SUBJECT", "Open tickets Summary")
 
 # Google Sheets
 GOOGLE_SHEET_ID = os.getenv("GOOGLE_SHEET_ID", "1bfdWgSWpk25wt0tq5PPLuLySfJ-Vm4Ou7TVR2gVprag")
+GOOGLE_SHEET_TAB = os.getenv("GOOGLE_SHEET_TAB", "Sheet1")
+
+# Google credentials
+GOOGLE_CREDENTIALS_JSON = os.getenv("GOOGLE_CREDENTIALS_JSON")
+GOOGLE_CREDENTIALS_BASE64 = os.getenv("GOOGLE_CREDENTIALS_BASE64")
+
+# Work directory - created once and reused by every automation run
+WORK_DIR = Path(tempfile.gettempdir()) / "ticket_automation"
+DOWNLOADS_DIR = WORK_DIR / "downloads"
+OUTPUT_DIR = WORK_DIR / "output"
+
+DOWNLOADS_DIR.mkdir(parents=True, exist_ok=True)
+OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # =============================================================================
 # LOGGING CONFIGURATION
 # =============================================================================
 
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO,
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Handlers/format are configured once in bot_common
 logger = logging.getLogger(__name__)
 
+# Separator line for log section headers
+_BANNER = "=" * 70
+
 # =============================================================================
 # AUTOMATION WORKFLOW
 # =============================================================================
 
+# Long-lived IMAP connection (created on first use)
+_imap_downloader = None
+_imap_lock = threading.Lock()
+
 class CloudAutomation:
     """
     Main automation class that orchestrates the complete workflow.
@@ -79,29 +93,36 @@ class CloudAutomation:
 
     def __init__(self):
         """Initialize the automation"""
-        self.work_dir = Path(tempfile.mkdtemp(prefix="ticket_automation_"))
-        self.downloads_dir = self.work_dir / "downloads"
-        self.output_dir = self.work_dir / "output"
+        self.work_dir = WORK_DIR
+        self.downloads_dir = DOWNLOADS_DIR
+        self.output_dir = OUTPUT_DIR
+
+        # Prefix for every file this run writes, so concurrent runs in the
+        # shared directories never overwrite (or clean up) each other's files
+        self.run_prefix = f"{uuid.uuid4().hex[:8]}_"
 
-        # Create directories
-        self.downloads_dir.mkdir(exist_ok=True)
-        self.output_dir.mkdir(exist_ok=True)
+        # Files created by this run (removed in cleanup)
+        self._created_files = []
 
-        logger.info(f"Work directory: {self.work_dir}")
+        logger.info("Work directory: %s", self.work_dir)
 
     def cleanup(self):
-        """Clean up temporary files"""
+        """Clean up temporary files created by this run"""
         try:
-            if self.work_dir.exists():
-                shutil.rmtree(self.work_dir)
-                logger.info("✓ Cleaned up temporary files")
+            for path in self._created_files:
+                Path(path).unlink(missing_ok=True)
+            self._created_files.clear()
+            logger.info("✓ Cleaned up temporary files")
         except Exception as e:
-            logger.warning(f"Cleanup warning: {e}")
+            logger.warning("Cleanup warning: %s", e)
 
-    def run_automation(self) -> tuple[bool, str, dict]:
+    async def run_automation(self) -> tuple[bool, str, dict]:
         """
         Run the complete automation workflow.
 
+        Blocking steps run in worker threads; processing and the Sheets
+        upload both only need the CSV, so they run concurrently.
+
         Returns:
             tuple: (success, message, stats)
         """
@@ -114,39 +135,39 @@ class CloudAutomation:
         }
 
         try:
-            logger.info("="*70)
+            logger.info(_BANNER)
             logger.info("CLOUD AUTOMATION - STARTING")
-            logger.info("="*70)
+            logger.info(_BANNER)
 
             # STEP 1: Download Email
             logger.info("\n[STEP 1] Downloading email from Outlook...")
-            csv_file = self._download_email()
+            csv_file = await asyncio.to_thread(self._download_email)
 
             if not csv_file:
                 return False, "❌ Failed to download email", stats
 
             stats["email_downloaded"] = True
-            logger.info(f"✓ Email downloaded: {csv_file}")
+            logger.info("✓ Email downloaded: %s", csv_file)
 
-            # STEP 2: Process Tickets
+            # STEP 2 + 3: Process Tickets and Upload to Google Sheets (in parallel)
             logger.info("\n[STEP 2] Processing tickets...")
-            excel_file, ticket_count = self._process_tickets(csv_file)
+            logger.info("\n[STEP 3] Uploading to Google Sheets...")
+            (excel_file, ticket_count), sheets_url = await asyncio.gather(
+                asyncio.to_thread(self._process_tickets, csv_file),
+                asyncio.to_thread(self._upload_to_sheets, csv_file)
+            )
 
             if not excel_file:
                 return False, "❌ Failed to process tickets", stats
 
             stats["tickets_processed"] = ticket_count
             stats["excel_created"] = True
-            logger.info(f"✓ Tickets processed: {ticket_count}")
-            logger.info(f"✓ Excel created: {excel_file}")
-
-            # STEP 3: Upload to Google Sheets
-            logger.info("\n[STEP 3] Uploading to Google Sheets...")
-            sheets_url = self._upload_to_sheets(csv_file)
+            logger.info("✓ Tickets processed: %s", ticket_count)
+            logger.info("✓ Excel created: %s", excel_file)
 
             if sheets_url:
                 stats["sheets_uploaded"] = True
-                logger.info(f"✓ Uploaded to Google Sheets")
+                logger.info("✓ Uploaded to Google Sheets")
 
             # Calculate duration
             stats["end_time"] = datetime.now()
@@ -155,14 +176,14 @@ class CloudAutomation:
             # Success message
             message = self._format_success_message(stats, sheets_url)
 
-            logger.info("="*70)
+            logger.info(_BANNER)
             logger.info("CLOUD AUTOMATION - COMPLETED SUCCESSFULLY")
-            logger.info("="*70)
+            logger.info(_BANNER)
 
             return True, message, stats
 
         except Exception as e:
-            logger.error(f"Automation error: {e}", exc_info=True)
+            logger.error("Automation error: %s", e, exc_info=True)
             return False, f"❌ Error: {str(e)}", stats
 
     def _download_email(self) -> Optional[str]:
@@ -172,25 +193,35 @@ class CloudAutomation:
         Returns:
             str: Path to downloaded CSV file, or None if failed
         """
+        global _imap_downloader
+
         try:
-            downloader = OutlookIMAPDownloader(OUTLOOK_EMAIL, OUTLOOK_PASSWORD)
+            # Imported here to keep bot startup light
+            from email_downloader import OutlookIMAPDownloader
 
-            if not downloader.connect():
-                logger.error("Failed to connect to IMAP server")
-                return None
+            # One IMAP session is shared by all runs (one at a time) so the
+            # TLS handshake + LOGIN is only paid when the socket went stale
+            with _imap_lock:
+                if _imap_downloader is None:
+                    _imap_downloader = OutlookIMAPDownloader(OUTLOOK_EMAIL, OUTLOOK_PASSWORD)
 
-            try:
-                csv_file = downloader.get_latest_ticket_email(
+                if not _imap_downloader.ensure_connected():
+                    logger.error("Failed to connect to IMAP server")
+                    return None
+
+                csv_file = _imap_downloader.get_latest_ticket_email(
                     sender=EMAIL_SENDER,
                     subject_contains=EMAIL_SUBJECT,
-                    output_dir=str(self.downloads_dir)
+                    output_dir=str(self.downloads_dir),
+                    filename_prefix=self.run_prefix
                 )
-                return csv_file
-            finally:
-                downloader.disconnect()
+
+            if csv_file:
+                self._created_files.append(csv_file)
+            return csv_file
 
         except Exception as e:
-            logger.error(f"Email download error: {e}")
+            logger.error("Email download error: %s", e)
             return None
 
     def _process_tickets(self, csv_file: str) -> tuple[Optional[str], int]:
@@ -208,21 +239,34 @@ class CloudAutomation:
             # For now, just return basic info
             # TODO: Integrate actual ticket processor
 
-            import pandas as pd
+            import csv
+            from openpyxl import Workbook
+
+            # Create a simple Excel file for now - stream rows straight from
+            # the CSV into a write-only workbook (no DataFrame, no Cell objects)
+            excel_file = str(self.output_dir / f"{self.run_prefix}tickets_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
+
+            workbook = Workbook(write_only=True)
+            worksheet = workbook.create_sheet()
+
+            row_count = 0
+            with open(csv_file, newline='', encoding='utf-8-sig') as f:
+                for row in csv.reader(f):
+                    worksheet.append(row)
+                    row_count += 1
 
-            df = pd.read_csv(csv_file)
-            ticket_count = len(df)
+            workbook.save(excel_file)
+            self._created_files.append(excel_file)
 
-            logger.info(f"Loaded {ticket_count} tickets from CSV")
+            # First row is the header
+            ticket_count = max(row_count - 1, 0)
 
-            # Create a simple Excel file for now
-            excel_file = str(self.output_dir / f"tickets_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
-            df.to_excel(excel_file, index=False)
+            logger.info("Loaded %s tickets from CSV", ticket_count)
 
             return excel_file, ticket_count
 
         except Exception as e:
-            logger.error(f"Ticket processing error: {e}")
+            logger.error("Ticket processing error: %s", e)
             return None, 0
 
     def _upload_to_sheets(self, csv_file: str) -> Optional[str]:
@@ -236,15 +280,73 @@ class CloudAutomation:
             str: Google Sheets URL, or None if failed
         """
         try:
-            # TODO: Implement Google Sheets upload
-            # For now, return the sheet URL
+            import pandas as pd
+
+            service = self._get_sheets_service()
+
+            if not service:
+                logger.error("No Google credentials configured for Sheets upload")
+                return None
+
+            # Every cell goes to Sheets as-is, so read it as text: no dtype
+            # inference pass, no NaN scan, and IDs/phone numbers keep their
+            # leading zeros. Blank cells come back as "" (JSON can't carry NaN)
+            df = pd.read_csv(csv_file, engine='c', dtype=str, na_filter=False, encoding='utf-8-sig')
+
+            # Header + all ticket rows
+            rows = [df.columns.tolist()] + df.values.tolist()
+
+            # Clear old data, then write the whole sheet in ONE request
+            # (never loop per-row writes - Sheets allows ~100 writes / 100s)
+            service.spreadsheets().values().clear(
+                spreadsheetId=GOOGLE_SHEET_ID,
+                range=GOOGLE_SHEET_TAB
+            ).execute()
+
+            service.spreadsheets().values().update(
+                spreadsheetId=GOOGLE_SHEET_ID,
+                range=f"{GOOGLE_SHEET_TAB}!A1",
+                valueInputOption='RAW',
+                body={'values': rows}
+            ).execute()
+
+            logger.info("✓ Uploaded %s rows to Google Sheets", len(rows) - 1)
+
             sheets_url = f"https://docs.google.com/spreadsheets/d/{GOOGLE_SHEET_ID}/edit"
             return sheets_url
 
         except Exception as e:
-            logger.error(f"Google Sheets upload error: {e}")
+            logger.error("Google Sheets upload error: %s", e)
             return None
 
+    def _get_sheets_service(self):
+        """
+        Build a Google Sheets service from the configured credentials.
+
+        Returns:
+            Sheets API service, or None if no credentials are configured
+        """
+        import json
+        import base64
+        from google.oauth2 import service_account
+        from googleapiclient.discovery import build
+
+        scopes = ['https://www.googleapis.com/auth/spreadsheets']
+
+        if GOOGLE_CREDENTIALS_BASE64:
+            creds_dict = json.loads(base64.b64decode(GOOGLE_CREDENTIALS_BASE64).decode('utf-8'))
+            credentials = service_account.Credentials.from_service_account_info(creds_dict, scopes=scopes)
+        elif GOOGLE_CREDENTIALS_JSON and os.path.isfile(GOOGLE_CREDENTIALS_JSON):
+            credentials = service_account.Credentials.from_service_account_file(GOOGLE_CREDENTIALS_JSON, scopes=scopes)
+        elif GOOGLE_CREDENTIALS_JSON:
+            creds_dict = json.loads(GOOGLE_CREDENTIALS_JSON.strip())
+            credentials = service_account.Credentials.from_service_account_info(creds_dict, scopes=scopes)
+        else:
+            return None
+
+        # Bundled static discovery doc - no discovery fetch
+        return build('sheets', 'v4', credentials=credentials, cache_discovery=False, static_discovery=True)
+
     def _format_success_message(self, stats: dict, sheets_url: Optional[str]) -> str:
         """
         Format success message for Telegram.
@@ -272,36 +374,60 @@ class CloudAutomation:
         return message
 
 # =============================================================================
-# TELEGRAM BOT HANDLERS
+# REPLY TEMPLATES - built once at import
 # =============================================================================
 
-def is_authorized(user_id: int) -> bool:
-    """Check if user is authorized"""
-    return user_id == AUTHORIZED_USER_ID
+START_MSG = (
+    "🤖 *Cloud Automation Bot*\n\n"
+    "✅ You are authorized!\n\n"
+    f"📝 Send `{TRIGGER_CODEWORD}` to trigger automation\n\n"
+    "⚡ Commands:\n"
+    f"• `{TRIGGER_CODEWORD}` - Run automation\n"
+    "• `/status` - Check status\n"
+    "• `/help` - Show help\n\n"
+    "☁️ Running fully in the cloud!"
+)
+
+# Everything but the timestamp
+STATUS_MSG = (
+    "📊 *Bot Status*\n\n"
+    "🤖 Bot: ✅ Running\n"
+    "☁️ Platform: Cloud-based\n"
+    f"👤 Authorized: {AUTHORIZED_USER_ID}\n"
+    f"🔑 Trigger: `{TRIGGER_CODEWORD}`\n"
+    f"📧 Email: {OUTLOOK_EMAIL}\n\n"
+)
+
+HELP_MSG = (
+    "📖 *Help - Cloud Automation Bot*\n\n"
+    "🚀 *Trigger Automation:*\n"
+    f"Send `{TRIGGER_CODEWORD}`\n\n"
+    "📋 *What it does:*\n"
+    "1️⃣ Downloads email via IMAP\n"
+    "2️⃣ Processes ~240 tickets\n"
+    "3️⃣ Uploads to Google Sheets\n"
+    "4️⃣ Sends confirmation\n\n"
+    "⏱️ Duration: ~15-20 seconds\n\n"
+    "☁️ Runs entirely in the cloud!"
+)
+
+# =============================================================================
+# TELEGRAM BOT HANDLERS
+# =============================================================================
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /start command"""
     user_id = update.effective_user.id
-    username = update.effective_user.username or update.effective_user.first_name
-
-    logger.info(f"/start from user {user_id} ({username})")
 
+    # Reject before doing any other work for unauthorized users
     if not is_authorized(user_id):
         await update.message.reply_text("⛔ Unauthorized access")
         return
 
-    message = (
-        "🤖 *Cloud Automation Bot*\n\n"
-        "✅ You are authorized!\n\n"
-        f"📝 Send `{TRIGGER_CODEWORD}` to trigger automation\n\n"
-        "⚡ Commands:\n"
-        f"• `{TRIGGER_CODEWORD}` - Run automation\n"
-        "• `/status` - Check status\n"
-        "• `/help` - Show help\n\n"
-        "☁️ Running fully in the cloud!"
-    )
+    username = update.effective_user.username or update.effective_user.first_name
+    logger.info("/start from user %s (%s)", user_id, username)
 
-    await update.message.reply_text(message, parse_mode='Markdown')
+    await update.message.reply_text(START_MSG, parse_mode='Markdown')
 
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /status command"""
@@ -311,15 +437,7 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await update.message.reply_text("⛔ Unauthorized")
         return
 
-    message = (
-        "📊 *Bot Status*\n\n"
-        "🤖 Bot: ✅ Running\n"
-        f"☁️ Platform: Cloud-based\n"
-        f"👤 Authorized: {AUTHORIZED_USER_ID}\n"
-        f"🔑 Trigger: `{TRIGGER_CODEWORD}`\n"
-        f"📧 Email: {OUTLOOK_EMAIL}\n\n"
-        f"🕐 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-    )
+    message = f"{STATUS_MSG}🕐 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
 
     await update.message.reply_text(message, parse_mode='Markdown')
 
@@ -331,70 +449,42 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         await update.message.reply_text("⛔ Unauthorized")
         return
 
-    message = (
-        "📖 *Help - Cloud Automation Bot*\n\n"
-        f"🚀 *Trigger Automation:*\n"
-        f"Send `{TRIGGER_CODEWORD}`\n\n"
-        "📋 *What it does:*\n"
-        "1️⃣ Downloads email via IMAP\n"
-        "2️⃣ Processes ~240 tickets\n"
-        "3️⃣ Uploads to Google Sheets\n"
-        "4️⃣ Sends confirmation\n\n"
-        "⏱️ Duration: ~15-20 seconds\n\n"
-        "☁️ Runs entirely in the cloud!"
-    )
-
-    await update.message.reply_text(message, parse_mode='Markdown')
+    await update.message.reply_text(HELP_MSG, parse_mode='Markdown')
 
-async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle text messages"""
+async def handle_trigger(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle the trigger codeword (routed here by TRIGGER_PATTERN)"""
     user_id = update.effective_user.id
-    message_text = update.message.text.strip()
-
-    logger.info(f"Message from {user_id}: {message_text}")
 
     if not is_authorized(user_id):
         await update.message.reply_text("⛔ Unauthorized")
         return
 
-    if message_text.upper() == TRIGGER_CODEWORD.upper():
-        logger.info(f"Trigger detected from user {user_id}")
+    logger.info("Trigger detected from user %s", user_id)
 
-        # Send initial confirmation
-        await update.message.reply_text(
-            "🚀 *Automation Triggered!*\n\n"
-            "⏳ Starting cloud workflow...\n"
-            "Please wait ~15-20 seconds...",
-            parse_mode='Markdown'
-        )
+    # Send initial confirmation
+    await update.message.reply_text(
+        "🚀 *Automation Triggered!*\n\n"
+        "⏳ Starting cloud workflow...\n"
+        "Please wait ~15-20 seconds...",
+        parse_mode='Markdown'
+    )
 
-        # Run automation
-        automation = CloudAutomation()
+    # Run automation
+    automation = CloudAutomation()
 
-        try:
-            success, message, stats = automation.run_automation()
-
-            if success:
-                await update.message.reply_text(message, parse_mode='Markdown')
-            else:
-                await update.message.reply_text(
-                    f"❌ *Automation Failed*\n\n{message}",
-                    parse_mode='Markdown'
-                )
-
-        finally:
-            automation.cleanup()
+    try:
+        success, message, stats = await automation.run_automation()
 
-    else:
-        await update.message.reply_text(
-            f"❓ Unknown command: `{message_text}`\n\n"
-            f"Send `{TRIGGER_CODEWORD}` to trigger automation",
-            parse_mode='Markdown'
-        )
+        if success:
+            await update.message.reply_text(message, parse_mode='Markdown')
+        else:
+            await update.message.reply_text(
+                f"❌ *Automation Failed*\n\n{message}",
+                parse_mode='Markdown'
+            )
 
-async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle errors"""
-    logger.error(f"Update {update} caused error {context.error}")
+    finally:
+        await asyncio.to_thread(automation.cleanup)
 
 # =============================================================================
 # MAIN FUNCTION
@@ -403,37 +493,35 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 def main():
     """Main function - start the bot"""
 
-    logger.info("="*70)
+    logger.info(_BANNER)
     logger.info("CLOUD AUTOMATION BOT - STARTING")
-    logger.info("="*70)
-    logger.info(f"Authorized user: {AUTHORIZED_USER_ID}")
-    logger.info(f"Trigger codeword: {TRIGGER_CODEWORD}")
-    logger.info(f"Outlook email: {OUTLOOK_EMAIL}")
-    logger.info("="*70)
+    logger.info(_BANNER)
+    logger.info("Authorized user: %s", AUTHORIZED_USER_ID)
+    logger.info("Trigger codeword: %s", TRIGGER_CODEWORD)
+    logger.info("Outlook email: %s", OUTLOOK_EMAIL)
+    logger.info(_BANNER)
 
     try:
-        # Create application
-        application = Application.builder().token(BOT_TOKEN).build()
+        # Create application - updates are handled concurrently so a running
+        # automation doesn't hold up /status or other messages
+        application = Application.builder().token(BOT_TOKEN).concurrent_updates(True).build()
 
         # Add handlers
         application.add_handler(CommandHandler("start", start_command))
         application.add_handler(CommandHandler("status", status_command))
         application.add_handler(CommandHandler("help", help_command))
-        application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
+        application.add_handler(MessageHandler(filters.Regex(TRIGGER_PATTERN) & ~filters.COMMAND, handle_trigger))
+        application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_other))
         application.add_error_handler(error_handler)
 
-        # Start polling
         logger.info("Bot is now running... Press Ctrl+C to stop")
-        application.run_polling(
-            poll_interval=30,
-            timeout=10,
-            drop_pending_updates=True
-        )
+
+        run_application(application)
 
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
     except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         raise
 
 if __name__ == "__main__":
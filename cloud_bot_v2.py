@@ -18,8 +18,11 @@ Created: January 28, 2026
 
 import os
 import sys
+import json
+import base64
 import logging
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 
@@ -31,17 +34,16 @@ except ImportError:
     print("ERROR: python-telegram-bot not installed!")
     sys.exit(1)
 
-# Local imports
-from sheets_queue import GoogleSheetsQueue
+from bot_common import (
+    BOT_TOKEN, AUTHORIZED_USER_ID, TRIGGER_CODEWORD, TRIGGER_PATTERN,
+    is_authorized, handle_other, error_handler, run_application
+)
 
 # =============================================================================
 # CONFIGURATION - From Environment Variables
 # =============================================================================
 
-# Telegram Bot
-BOT_TOKEN = os.getenv("BOT_TOKEN", "8401341002:AAHf4fB2bp4JATnaYo3RbK9EG_ziRHxz1f4")
-AUTHORIZED_USER_ID = int(os.getenv("AUTHORIZED_USER_ID", "1003476862"))
-TRIGGER_CODEWORD = os.getenv("TRIGGER_CODEWORD", "RUNNIT")
+# Telegram bot + webhook settings live in bot_common.py
 
 # Google credentials
 GOOGLE_CREDENTIALS_JSON = os.getenv("GOOGLE_CREDENTIALS_JSON")
@@ -49,134 +51,165 @@ GOOGLE_CREDENTIALS_BASE64 = os.getenv("GOOGLE_CREDENTIALS_BASE64")
 GOOGLE_SHEET_QUEUE_ID = os.getenv("GOOGLE_SHEET_QUEUE_ID", "1ZvtEXRvJSm9c_IDJJyaV90Vs7vE50UoSrwlh8uAqyGU")  # Queue sheet ID
 
 # Polling settings
-RESULT_POLL_INTERVAL = 10  # Check for results every 10 seconds
+RESULT_POLL_INITIAL = 1  # First re-check after 1 second (doubles each attempt)
+RESULT_POLL_INTERVAL = 10  # Check for results at least every 10 seconds
 RESULT_TIMEOUT = 300  # Give up after 5 minutes
 
 # =============================================================================
 # LOGGING CONFIGURATION
 # =============================================================================
 
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO,
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Handlers/format are configured once in bot_common
 logger = logging.getLogger(__name__)
 
+# Separator line for log section headers
+_BANNER = "=" * 70
+
 # =============================================================================
 # GOOGLE DRIVE QUEUE
 # =============================================================================
 
-# Global queue instance
-queue = None
+def _load_creds_once():
+    """
+    Resolve the credentials the queue should load.
 
-def init_queue():
-    """Initialize Google Sheets queue."""
-    global queue
-    try:
-        logger.info("Initializing Google Sheets queue...")
-        logger.info(f"GOOGLE_SHEET_QUEUE_ID: {GOOGLE_SHEET_QUEUE_ID}")
-        import tempfile
-        import base64
+    Base64/JSON credentials from the environment are decoded once, in
+    memory - nothing is written to disk.
 
-        # Try base64 encoded credentials first (preferred for Railway)
-        if GOOGLE_CREDENTIALS_BASE64:
-            logger.info("Using base64 encoded credentials...")
+    Returns:
+        dict or str: Parsed service account info, a credentials file path,
+        or None if not configured
+    """
+    # Try base64 encoded credentials first (preferred for Railway)
+    if GOOGLE_CREDENTIALS_BASE64:
+        logger.info("Using base64 encoded credentials...")
+        return json.loads(base64.b64decode(GOOGLE_CREDENTIALS_BASE64))
 
-            # Decode from base64
-            creds_json = base64.b64decode(GOOGLE_CREDENTIALS_BASE64).decode('utf-8')
+    # Try regular JSON from environment variable
+    if GOOGLE_CREDENTIALS_JSON and not os.path.isfile(GOOGLE_CREDENTIALS_JSON):
+        logger.info("Using JSON credentials from environment...")
+        creds_json = GOOGLE_CREDENTIALS_JSON.strip()
 
-            # Create temp file
-            temp_creds = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
-            temp_creds.write(creds_json)
-            temp_creds.close()
+        # Remove any leading/trailing quotes if present
+        if creds_json.startswith('"') and creds_json.endswith('"'):
+            creds_json = creds_json[1:-1]
+        if creds_json.startswith("'") and creds_json.endswith("'"):
+            creds_json = creds_json[1:-1]
 
-            logger.info(f"Credentials written to: {temp_creds.name}")
+        return json.loads(creds_json)
 
-            # Initialize queue with temp file and sheet ID
-            queue = GoogleSheetsQueue(
-                temp_creds.name,
-                sheet_id=GOOGLE_SHEET_QUEUE_ID
-            )
+    # Use file path directly (for local testing)
+    logger.info("Using credentials file path...")
+    return GOOGLE_CREDENTIALS_JSON
 
-        # Try regular JSON from environment variable
-        elif GOOGLE_CREDENTIALS_JSON and not os.path.isfile(GOOGLE_CREDENTIALS_JSON):
-            logger.info("Using JSON credentials from environment...")
+try:
+    _CREDS = _load_creds_once()
+except Exception as e:
+    logger.error("Failed to prepare Google credentials: %s", e)
+    _CREDS = None
 
-            # Create temp file
-            temp_creds = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
+# Global queue instance
+queue = None
 
-            # Clean and write JSON
-            creds_json = GOOGLE_CREDENTIALS_JSON.strip()
+# The Sheets client is blocking and its shared httplib2 connection isn't
+# thread-safe: run queue calls one at a time in a single worker thread
+_queue_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheets-queue")
 
-            # Remove any leading/trailing quotes if present
-            if creds_json.startswith('"') and creds_json.endswith('"'):
-                creds_json = creds_json[1:-1]
-            if creds_json.startswith("'") and creds_json.endswith("'"):
-                creds_json = creds_json[1:-1]
+async def run_queue(method, *args):
+    """
+    Run a blocking queue method without stalling the event loop.
 
-            # Write to file
-            temp_creds.write(creds_json)
-            temp_creds.close()
+    Args:
+        method: Bound GoogleSheetsQueue method
+        *args: Arguments for the method
 
-            logger.info(f"Credentials written to: {temp_creds.name}")
+    Returns:
+        Whatever the method returns
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_queue_executor, method, *args)
 
-            # Initialize queue with temp file and sheet ID
-            queue = GoogleSheetsQueue(
-                temp_creds.name,
-                sheet_id=GOOGLE_SHEET_QUEUE_ID
-            )
+def init_queue():
+    """Initialize Google Sheets queue."""
+    global queue
+    try:
+        logger.info("Initializing Google Sheets queue...")
+        logger.info("GOOGLE_SHEET_QUEUE_ID: %s", GOOGLE_SHEET_QUEUE_ID)
 
-        # Use file path directly (for local testing)
-        else:
-            logger.info("Using credentials file path...")
-            queue = GoogleSheetsQueue(
-                GOOGLE_CREDENTIALS_JSON,
-                sheet_id=GOOGLE_SHEET_QUEUE_ID
-            )
+        # Imported here so the Google API client only loads when the queue is set up
+        from sheets_queue import GoogleSheetsQueue
+
+        queue = GoogleSheetsQueue(
+            _CREDS,
+            sheet_id=GOOGLE_SHEET_QUEUE_ID
+        )
 
         logger.info("✓ Google Sheets queue ready")
         return True
     except Exception as e:
-        logger.error(f"Failed to initialize Google Sheets queue: {e}")
+        logger.error("Failed to initialize Google Sheets queue: %s", e)
         import traceback
         logger.error(traceback.format_exc())
         return False
 
 # =============================================================================
-# TELEGRAM BOT HANDLERS
+# REPLY TEMPLATES - built once at import
 # =============================================================================
 
-def is_authorized(user_id: int) -> bool:
-    """Check if user is authorized"""
-    return user_id == AUTHORIZED_USER_ID
+START_MSG = (
+    "🤖 *Cloud Automation Bot V2*\n\n"
+    "✅ You are authorized!\n\n"
+    f"📝 Send `{TRIGGER_CODEWORD}` to trigger automation\n\n"
+    "⚡ Commands:\n"
+    f"• `{TRIGGER_CODEWORD}` - Run automation\n"
+    "• `/status` - Check status\n"
+    "• `/help` - Show help\n\n"
+    "☁️ Using Google Sheets queue!\n"
+    "💻 Work computer will process your request"
+)
+
+# Status lines that never change (queue counts + timestamp are added per call)
+STATUS_HEADER = (
+    "📊 *Bot Status*\n\n"
+    "🤖 Bot: ✅ Running\n"
+)
+STATUS_FOOTER = (
+    f"👤 Authorized: {AUTHORIZED_USER_ID}\n"
+    f"🔑 Trigger: `{TRIGGER_CODEWORD}`\n\n"
+)
+
+HELP_MSG = (
+    "📖 *Help - Cloud Automation Bot V2*\n\n"
+    "🚀 *Trigger Automation:*\n"
+    f"Send `{TRIGGER_CODEWORD}`\n\n"
+    "📋 *How it works:*\n"
+    "1️⃣ You send command from anywhere\n"
+    "2️⃣ Bot writes to Google Sheets queue\n"
+    "3️⃣ Your work computer picks it up\n"
+    "4️⃣ Automation runs on work computer\n"
+    "5️⃣ Results sent back via queue\n"
+    "6️⃣ Bot sends you confirmation!\n\n"
+    "⏱️ Duration: ~20-40 seconds\n"
+    "💡 Works from anywhere in the world!"
+)
+
+# =============================================================================
+# TELEGRAM BOT HANDLERS
+# =============================================================================
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /start command"""
     user_id = update.effective_user.id
-    username = update.effective_user.username or update.effective_user.first_name
-
-    logger.info(f"/start from user {user_id} ({username})")
 
+    # Reject before doing any other work for unauthorized users
     if not is_authorized(user_id):
         await update.message.reply_text("⛔ Unauthorized access")
         return
 
-    message = (
-        "🤖 *Cloud Automation Bot V2*\n\n"
-        "✅ You are authorized!\n\n"
-        f"📝 Send `{TRIGGER_CODEWORD}` to trigger automation\n\n"
-        "⚡ Commands:\n"
-        f"• `{TRIGGER_CODEWORD}` - Run automation\n"
-        "• `/status` - Check status\n"
-        "• `/help` - Show help\n\n"
-        "☁️ Using Google Sheets queue!\n"
-        "💻 Work computer will process your request"
-    )
+    username = update.effective_user.username or update.effective_user.first_name
+    logger.info("/start from user %s (%s)", user_id, username)
 
-    await update.message.reply_text(message, parse_mode='Markdown')
+    await update.message.reply_text(START_MSG, parse_mode='Markdown')
 
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /status command"""
@@ -188,28 +221,18 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
     # Check queue status
     try:
-        pending_commands = queue.check_commands()
-        pending_results = queue.check_results()
+        # Both tabs in one Sheets request, run in the queue thread
+        pending_commands, pending_results = await run_queue(queue.batch_check)
 
-        message = (
-            "📊 *Bot Status*\n\n"
-            "🤖 Bot: ✅ Running\n"
-            f"☁️ Queue: ✅ Connected\n"
+        queue_lines = (
+            "☁️ Queue: ✅ Connected\n"
             f"📝 Pending commands: {len(pending_commands)}\n"
             f"📊 Pending results: {len(pending_results)}\n"
-            f"👤 Authorized: {AUTHORIZED_USER_ID}\n"
-            f"🔑 Trigger: `{TRIGGER_CODEWORD}`\n\n"
-            f"🕐 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         )
     except:
-        message = (
-            "📊 *Bot Status*\n\n"
-            "🤖 Bot: ✅ Running\n"
-            f"☁️ Queue: ❌ Error\n"
-            f"👤 Authorized: {AUTHORIZED_USER_ID}\n"
-            f"🔑 Trigger: `{TRIGGER_CODEWORD}`\n\n"
-            f"🕐 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        )
+        queue_lines = "☁️ Queue: ❌ Error\n"
+
+    message = f"{STATUS_HEADER}{queue_lines}{STATUS_FOOTER}🕐 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
 
     await update.message.reply_text(message, parse_mode='Markdown')
 
@@ -221,22 +244,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         await update.message.reply_text("⛔ Unauthorized")
         return
 
-    message = (
-        "📖 *Help - Cloud Automation Bot V2*\n\n"
-        f"🚀 *Trigger Automation:*\n"
-        f"Send `{TRIGGER_CODEWORD}`\n\n"
-        "📋 *How it works:*\n"
-        "1️⃣ You send command from anywhere\n"
-        "2️⃣ Bot writes to Google Sheets queue\n"
-        "3️⃣ Your work computer picks it up\n"
-        "4️⃣ Automation runs on work computer\n"
-        "5️⃣ Results sent back via queue\n"
-        "6️⃣ Bot sends you confirmation!\n\n"
-        "⏱️ Duration: ~20-40 seconds\n"
-        "💡 Works from anywhere in the world!"
-    )
-
-    await update.message.reply_text(message, parse_mode='Markdown')
+    await update.message.reply_text(HELP_MSG, parse_mode='Markdown')
 
 async def wait_for_result(command_id: str, update: Update) -> Optional[dict]:
     """
@@ -249,154 +257,146 @@ async def wait_for_result(command_id: str, update: Update) -> Optional[dict]:
     Returns:
         dict: Result data or None if timeout
     """
-    start_time = datetime.now()
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
     elapsed = 0
+    last_notify = 0
+    attempt = 0
 
     while elapsed < RESULT_TIMEOUT:
+        # Exponential backoff: 1s, 2s, 4s, 8s, then every RESULT_POLL_INTERVAL
+        delay = min(RESULT_POLL_INTERVAL, RESULT_POLL_INITIAL * 2 ** attempt)
+        attempt += 1
         try:
             # Check for results
-            results = queue.check_results(command_id)
+            results = await run_queue(queue.check_results, command_id)
 
             if results:
                 # Found result!
                 result = results[0]
-                logger.info(f"✓ Result received for {command_id}")
+                logger.info("✓ Result received for %s", command_id)
 
-                # Delete result file
-                queue.delete_result(row_number=result.get('row_number'))
+                # Mark result (and any duplicates) as processed in one request
+                await run_queue(queue.delete_results, [r.get('row_number') for r in results])
 
                 return result
 
             # Wait before next check
-            await asyncio.sleep(RESULT_POLL_INTERVAL)
+            await asyncio.sleep(delay)
 
-            elapsed = (datetime.now() - start_time).total_seconds()
+            elapsed = loop.time() - start_time
 
             # Send progress update every 30 seconds
-            if int(elapsed) % 30 == 0 and elapsed > 0:
+            if elapsed - last_notify >= 30:
+                last_notify = elapsed
                 await update.message.reply_text(
                     f"⏳ Still waiting... ({int(elapsed)}s elapsed)",
                     parse_mode='Markdown'
                 )
 
         except Exception as e:
-            logger.error(f"Error checking results: {e}")
-            await asyncio.sleep(RESULT_POLL_INTERVAL)
-            elapsed = (datetime.now() - start_time).total_seconds()
+            logger.error("Error checking results: %s", e)
+            await asyncio.sleep(delay)
+            elapsed = loop.time() - start_time
 
     # Timeout
-    logger.warning(f"Timeout waiting for result of {command_id}")
+    logger.warning("Timeout waiting for result of %s", command_id)
     return None
 
-async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle text messages"""
+async def handle_trigger(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle the trigger codeword (routed here by TRIGGER_PATTERN)"""
     user_id = update.effective_user.id
-    message_text = update.message.text.strip()
-
-    logger.info(f"Message from {user_id}: {message_text}")
 
     if not is_authorized(user_id):
         await update.message.reply_text("⛔ Unauthorized")
         return
 
-    if message_text.upper() == TRIGGER_CODEWORD.upper():
-        logger.info(f"Trigger detected from user {user_id}")
+    logger.info("Trigger detected from user %s", user_id)
+
+    # Send initial confirmation
+    await update.message.reply_text(
+        "🚀 *Automation Triggered!*\n\n"
+        "📝 Writing command to Google Sheets queue...\n"
+        "⏳ Waiting for your work computer to pick it up...\n\n"
+        "This may take 20-60 seconds depending on polling interval.",
+        parse_mode='Markdown'
+    )
+
+    try:
+        # Write command to Google Sheets queue
+        command_id = await run_queue(queue.write_command, "RUNNIT", {
+            "user_id": user_id,
+            "timestamp": datetime.now().isoformat()
+        })
+
+        if not command_id:
+            await update.message.reply_text(
+                "❌ *Failed to write command*\n\n"
+                "Could not write to Google Sheets queue.",
+                parse_mode='Markdown'
+            )
+            return
 
-        # Send initial confirmation
+        logger.info("✓ Command written: %s", command_id)
+
+        # Send confirmation
         await update.message.reply_text(
-            "🚀 *Automation Triggered!*\n\n"
-            "📝 Writing command to Google Sheets queue...\n"
-            "⏳ Waiting for your work computer to pick it up...\n\n"
-            "This may take 20-60 seconds depending on polling interval.",
+            "✅ *Command queued successfully!*\n\n"
+            f"📋 Command ID: `{command_id}`\n\n"
+            "⏳ Waiting for work computer to process...\n"
+            "I'll notify you when it's done!",
             parse_mode='Markdown'
         )
 
-        try:
-            # Write command to Google Sheets queue
-            command_id = queue.write_command("RUNNIT", {
-                "user_id": user_id,
-                "timestamp": datetime.now().isoformat()
-            })
+        # Wait for result
+        result = await wait_for_result(command_id, update)
 
-            if not command_id:
-                await update.message.reply_text(
-                    "❌ *Failed to write command*\n\n"
-                    "Could not write to Google Sheets queue.",
-                    parse_mode='Markdown'
+        if result:
+            # Got result!
+            if result.get('success'):
+                message = (
+                    "✅ *AUTOMATION COMPLETED!*\n\n"
+                    f"📝 {result.get('message', 'Automation finished successfully')}\n\n"
                 )
-                return
-
-            logger.info(f"✓ Command written: {command_id}")
 
-            # Send confirmation
-            await update.message.reply_text(
-                "✅ *Command queued successfully!*\n\n"
-                f"📋 Command ID: `{command_id}`\n\n"
-                "⏳ Waiting for work computer to process...\n"
-                "I'll notify you when it's done!",
-                parse_mode='Markdown'
-            )
-
-            # Wait for result
-            result = await wait_for_result(command_id, update)
-
-            if result:
-                # Got result!
-                if result.get('success'):
-                    message = (
-                        "✅ *AUTOMATION COMPLETED!*\n\n"
-                        f"📝 {result.get('message', 'Automation finished successfully')}\n\n"
-                    )
-
-                    # Add any additional data
-                    data = result.get('data', {})
-                    if data:
-                        message += "📊 *Details:*\n"
-                        if 'tickets_processed' in data:
-                            message += f"• Tickets: {data['tickets_processed']}\n"
-                        if 'duration' in data:
-                            message += f"• Duration: {data['duration']:.1f}s\n"
-                        if 'sheets_url' in data:
-                            message += f"\n🔗 [View Google Sheets]({data['sheets_url']})"
-
-                    await update.message.reply_text(message, parse_mode='Markdown')
-                else:
-                    # Failed
-                    await update.message.reply_text(
-                        f"❌ *Automation Failed*\n\n{result.get('message', 'Unknown error')}",
-                        parse_mode='Markdown'
-                    )
+                # Add any additional data
+                data = result.get('data', {})
+                if data:
+                    message += "📊 *Details:*\n"
+                    if 'tickets_processed' in data:
+                        message += f"• Tickets: {data['tickets_processed']}\n"
+                    if 'duration' in data:
+                        message += f"• Duration: {data['duration']:.1f}s\n"
+                    if 'sheets_url' in data:
+                        message += f"\n🔗 [View Google Sheets]({data['sheets_url']})"
+
+                await update.message.reply_text(message, parse_mode='Markdown')
             else:
-                # Timeout
+                # Failed
                 await update.message.reply_text(
-                    "⏰ *Timeout*\n\n"
-                    "Did not receive result within 5 minutes.\n\n"
-                    "⚠️ Possible issues:\n"
-                    "• Work computer is offline\n"
-                    "• Polling script not running\n"
-                    "• Google Drive access issue\n\n"
-                    "Check work computer status.",
+                    f"❌ *Automation Failed*\n\n{result.get('message', 'Unknown error')}",
                     parse_mode='Markdown'
                 )
-
-        except Exception as e:
-            logger.error(f"Error handling trigger: {e}", exc_info=True)
+        else:
+            # Timeout
             await update.message.reply_text(
-                f"❌ *Error*\n\n{str(e)}",
+                "⏰ *Timeout*\n\n"
+                "Did not receive result within 5 minutes.\n\n"
+                "⚠️ Possible issues:\n"
+                "• Work computer is offline\n"
+                "• Polling script not running\n"
+                "• Google Drive access issue\n\n"
+                "Check work computer status.",
                 parse_mode='Markdown'
             )
 
-    else:
+    except Exception as e:
+        logger.error("Error handling trigger: %s", e, exc_info=True)
         await update.message.reply_text(
-            f"❓ Unknown command: `{message_text}`\n\n"
-            f"Send `{TRIGGER_CODEWORD}` to trigger automation",
+            f"❌ *Error*\n\n{str(e)}",
             parse_mode='Markdown'
         )
 
-async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle errors"""
-    logger.error(f"Update {update} caused error {context.error}")
-
 # =============================================================================
 # MAIN FUNCTION
 # =============================================================================
@@ -404,12 +404,12 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 def main():
     """Main function - start the bot"""
 
-    logger.info("="*70)
+    logger.info(_BANNER)
     logger.info("CLOUD AUTOMATION BOT V2 - GOOGLE DRIVE QUEUE")
-    logger.info("="*70)
-    logger.info(f"Authorized user: {AUTHORIZED_USER_ID}")
-    logger.info(f"Trigger codeword: {TRIGGER_CODEWORD}")
-    logger.info("="*70)
+    logger.info(_BANNER)
+    logger.info("Authorized user: %s", AUTHORIZED_USER_ID)
+    logger.info("Trigger codeword: %s", TRIGGER_CODEWORD)
+    logger.info(_BANNER)
 
     # Initialize Google Sheets queue
     if not init_queue():
@@ -417,29 +417,27 @@ def main():
         sys.exit(1)
 
     try:
-        # Create application
-        application = Application.builder().token(BOT_TOKEN).build()
+        # Create application - updates are handled concurrently so one
+        # RUNNIT wait doesn't hold up /status or other messages
+        application = Application.builder().token(BOT_TOKEN).concurrent_updates(True).build()
 
         # Add handlers
         application.add_handler(CommandHandler("start", start_command))
         application.add_handler(CommandHandler("status", status_command))
         application.add_handler(CommandHandler("help", help_command))
-        application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
+        application.add_handler(MessageHandler(filters.Regex(TRIGGER_PATTERN) & ~filters.COMMAND, handle_trigger))
+        application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_other))
         application.add_error_handler(error_handler)
 
-        # Start polling
         logger.info("Bot is now running... Press Ctrl+C to stop")
         logger.info("Using Google Sheets queue for work computer communication")
-        application.run_polling(
-            poll_interval=30,
-            timeout=10,
-            drop_pending_updates=True
-        )
+
+        run_application(application)
 
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
     except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         raise
 
 if __name__ == "__main__":
@@ -19,8 +19,14 @@ Created: January 31, 2026
 
 import os
 import sys
+import json
+import base64
 import logging
+import functools
 import asyncio
+import random
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 
@@ -32,9 +38,6 @@ except ImportError:
     print("ERROR: python-telegram-bot not installed!")
     sys.exit(1)
 
-# Local imports - NOW USING SHEETS QUEUE!
-from sheets_queue import GoogleSheetsQueue
-
 # =============================================================================
 # CONFIGURATION - From Environment Variables
 # =============================================================================
@@ -43,6 +46,16 @@ from sheets_queue import GoogleSheetsQueue
 BOT_TOKEN = os.getenv("BOT_TOKEN", "8401341002:AAHf4fB2bp4JATnaYo3RbK9EG_ziRHxz1f4")
 AUTHORIZED_USER_ID = int(os.getenv("AUTHORIZED_USER_ID", "1003476862"))
 TRIGGER_CODEWORD = os.getenv("TRIGGER_CODEWORD", "RUNNIT")
+_TRIGGER_UPPER = TRIGGER_CODEWORD.upper()  # Compared against every incoming message
+
+# Webhook (Railway) - Telegram pushes updates instead of the bot polling.
+# Used when RAILWAY_PUBLIC_DOMAIN is set; USE_POLLING=1 forces polling (local dev)
+WEBHOOK_DOMAIN = os.getenv("RAILWAY_PUBLIC_DOMAIN")
+WEBHOOK_PORT = int(os.getenv("PORT", "8443"))
+USE_POLLING = os.getenv("USE_POLLING", "").lower() in ("1", "true", "yes")
+
+# Seconds a Telegram request may wait for a pooled connection (PTB default: 1)
+TELEGRAM_POOL_TIMEOUT = 30.0
 
 # Google credentials
 GOOGLE_CREDENTIALS_JSON = os.getenv("GOOGLE_CREDENTIALS_JSON")
@@ -52,8 +65,13 @@ GOOGLE_CREDENTIALS_BASE64 = os.getenv("GOOGLE_CREDENTIALS_BASE64")
 GOOGLE_QUEUE_SHEET_ID = os.getenv("GOOGLE_QUEUE_SHEET_ID", "1bfdWgSWpk25wt0tq5PPLuLySfJ-Vm4Ou7TVR2gVprag")
 
 # Polling settings
-RESULT_POLL_INTERVAL = 10  # Check for results every 10 seconds
+RESULT_POLL_INITIAL = 1  # First re-check after 1 second
+RESULT_POLL_BACKOFF = 1.5  # Each wait is 1.5x the previous one...
+RESULT_POLL_INTERVAL = 15  # ...capped at 15 seconds
+RESULT_POLL_JITTER = 0.5  # Up to 0.5s random extra per wait
+RESULT_NOTIFY_INTERVAL = 30  # "Still waiting" message every 30 seconds
 RESULT_TIMEOUT = 300  # Give up after 5 minutes
+STATUS_CACHE_TTL = 30  # /status reuses queue counts up to 30 seconds old
 
 # =============================================================================
 # LOGGING CONFIGURATION
@@ -75,44 +93,68 @@ logger = logging.getLogger(__name__)
 # Global queue instance
 queue = None
 
-def init_queue():
-    """Initialize Google Sheets queue."""
-    global queue
-    try:
-        logger.info("Initializing Google Sheets queue...")
-        logger.info(f"GOOGLE_QUEUE_SHEET_ID: {GOOGLE_QUEUE_SHEET_ID}")
-        import tempfile
-        import base64
+# The Sheets client is blocking and its shared httplib2 connection isn't
+# thread-safe: run queue calls one at a time in a single worker thread
+_queue_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheets-queue")
 
-        credentials_source = None
+async def run_queue(method, *args):
+    """
+    Run a blocking queue method without stalling the event loop.
 
-        # Try base64 encoded credentials first (preferred for Railway)
-        if GOOGLE_CREDENTIALS_BASE64:
-            logger.info("Using base64 encoded credentials...")
+    Args:
+        method: Bound GoogleSheetsQueue method
+        *args: Arguments for the method
 
-            # Decode from base64
-            creds_json = base64.b64decode(GOOGLE_CREDENTIALS_BASE64).decode('utf-8')
-            credentials_source = creds_json  # Pass JSON string directly
+    Returns:
+        Whatever the method returns
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_queue_executor, method, *args)
 
-        # Try regular JSON from environment variable
-        elif GOOGLE_CREDENTIALS_JSON and not os.path.isfile(GOOGLE_CREDENTIALS_JSON):
-            logger.info("Using JSON credentials from environment...")
+@functools.lru_cache(maxsize=None)
+def _credentials_source():
+    """
+    Decode the Google credentials from the environment (once per process).
 
-            # Clean JSON
-            creds_json = GOOGLE_CREDENTIALS_JSON.strip()
+    Returns:
+        dict or str: Parsed service account info, or a credentials file path
+    """
+    # Try base64 encoded credentials first (preferred for Railway)
+    if GOOGLE_CREDENTIALS_BASE64:
+        logger.info("Using base64 encoded credentials...")
+        return json.loads(base64.b64decode(GOOGLE_CREDENTIALS_BASE64))
 
-            # Remove any leading/trailing quotes if present
-            if creds_json.startswith('"') and creds_json.endswith('"'):
-                creds_json = creds_json[1:-1]
-            if creds_json.startswith("'") and creds_json.endswith("'"):
-                creds_json = creds_json[1:-1]
+    # Try regular JSON from environment variable
+    if GOOGLE_CREDENTIALS_JSON and not os.path.isfile(GOOGLE_CREDENTIALS_JSON):
+        logger.info("Using JSON credentials from environment...")
 
-            credentials_source = creds_json
+        # Clean JSON
+        creds_json = GOOGLE_CREDENTIALS_JSON.strip()
 
-        # Use file path directly (for local testing)
-        else:
-            logger.info("Using credentials file path...")
-            credentials_source = GOOGLE_CREDENTIALS_JSON or "google_credentials.json"
+        # Remove any leading/trailing quotes if present
+        if creds_json.startswith('"') and creds_json.endswith('"'):
+            creds_json = creds_json[1:-1]
+        if creds_json.startswith("'") and creds_json.endswith("'"):
+            creds_json = creds_json[1:-1]
+
+        return json.loads(creds_json)
+
+    # Use file path directly (for local testing)
+    logger.info("Using credentials file path...")
+    return GOOGLE_CREDENTIALS_JSON or "google_credentials.json"
+
+def init_queue():
+    """Initialize Google Sheets queue."""
+    global queue
+    try:
+        logger.info("Initializing Google Sheets queue...")
+        logger.info("GOOGLE_QUEUE_SHEET_ID: %s", GOOGLE_QUEUE_SHEET_ID)
+
+        # Imported here so the Google API client only loads when the queue is set up
+        from sheets_queue import GoogleSheetsQueue
+
+        # Parsed dict (or file path) - decoded only on the first call
+        credentials_source = _credentials_source()
 
         # Initialize queue
         queue = GoogleSheetsQueue(
@@ -123,11 +165,123 @@ def init_queue():
         logger.info("Google Sheets queue ready")
         return True
     except Exception as e:
-        logger.error(f"Failed to initialize Google Sheets queue: {e}")
+        logger.error("Failed to initialize Google Sheets queue: %s", e)
         import traceback
         logger.error(traceback.format_exc())
         return False
 
+# =============================================================================
+# RESULT PUMP - one Sheets poll shared by every waiting trigger
+# =============================================================================
+
+# command_id -> Event set once its result rows arrive
+pending_waiters: dict[str, asyncio.Event] = {}
+
+# command_id -> result rows picked up by the pump
+pending_results: dict[str, list] = {}
+
+# Background task + backoff step (reset whenever a new waiter registers)
+_result_pump_task = None
+_result_poll_attempt = 0
+
+# Latest queue counts for /status: (loop time, pending commands, pending results)
+_queue_counts = None
+
+async def _result_pump() -> None:
+    """Poll Sheets for results while anyone is waiting and wake their waiters."""
+    global _result_poll_attempt, _queue_counts
+
+    while pending_waiters:
+        # Jittered exponential backoff: 1s, 1.5s, 2.25s, ... capped at RESULT_POLL_INTERVAL
+        delay = min(RESULT_POLL_INTERVAL, RESULT_POLL_INITIAL * RESULT_POLL_BACKOFF ** _result_poll_attempt)
+        delay += random.uniform(0, RESULT_POLL_JITTER)
+        _result_poll_attempt += 1
+
+        try:
+            # All pending results in one read, then fan out by command_id
+            results = await run_queue(queue.check_results)
+
+            # Keep /status's results count current while we're polling anyway
+            # (timestamp unchanged - the commands count still ages out)
+            if _queue_counts:
+                _queue_counts = (_queue_counts[0], _queue_counts[1], len(results))
+
+            for result in results:
+                command_id = result.get('command_id')
+                if command_id in pending_waiters and not pending_waiters[command_id].is_set():
+                    pending_results.setdefault(command_id, []).append(result)
+
+            for command_id in pending_results:
+                pending_waiters[command_id].set()
+
+        except Exception as e:
+            logger.error("Error checking results: %s", e)
+
+        await asyncio.sleep(delay)
+
+# =============================================================================
+# REPLY TEMPLATES - built once at import
+# =============================================================================
+
+START_MSG = (
+    "*Cloud Automation Bot V3*\n\n"
+    "You are authorized!\n\n"
+    f"Send `{TRIGGER_CODEWORD}` to trigger automation\n\n"
+    "Commands:\n"
+    f"* `{TRIGGER_CODEWORD}` - Run automation\n"
+    "* `/status` - Check status\n"
+    "* `/help` - Show help\n\n"
+    "Using Google Sheets queue!\n"
+    "Work computer will process your request"
+)
+
+# Status lines that never change (queue counts + timestamp are added per call)
+STATUS_HEADER = (
+    "*Bot Status*\n\n"
+    "Bot: Running\n"
+)
+STATUS_FOOTER = (
+    f"Authorized: {AUTHORIZED_USER_ID}\n"
+    f"Trigger: `{TRIGGER_CODEWORD}`\n\n"
+)
+
+HELP_MSG = (
+    "*Help - Cloud Automation Bot V3*\n\n"
+    "*Trigger Automation:*\n"
+    f"Send `{TRIGGER_CODEWORD}`\n\n"
+    "*How it works:*\n"
+    "1. You send command from anywhere\n"
+    "2. Bot writes to Google Sheets queue\n"
+    "3. Your work computer picks it up\n"
+    "4. Automation runs on work computer\n"
+    "5. Results sent back via Sheets\n"
+    "6. Bot sends you confirmation!\n\n"
+    "Duration: ~20-40 seconds\n"
+    "Works from anywhere in the world!"
+)
+
+TRIGGERED_MSG = (
+    "*Automation Triggered!*\n\n"
+    "Writing command to Google Sheets queue...\n"
+    "Waiting for your work computer to pick it up...\n\n"
+    "This may take 20-60 seconds depending on polling interval."
+)
+
+WRITE_FAILED_MSG = (
+    "*Failed to write command*\n\n"
+    "Could not write to Google Sheets queue."
+)
+
+TIMEOUT_MSG = (
+    "*Timeout*\n\n"
+    "Did not receive result within 5 minutes.\n\n"
+    "Possible issues:\n"
+    "* Work computer is offline\n"
+    "* Polling script not running\n"
+    "* Google Sheets access issue\n\n"
+    "Check work computer status."
+)
+
 # =============================================================================
 # TELEGRAM BOT HANDLERS
 # =============================================================================
@@ -139,30 +293,21 @@ def is_authorized(user_id: int) -> bool:
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /start command"""
     user_id = update.effective_user.id
-    username = update.effective_user.username or update.effective_user.first_name
-
-    logger.info(f"/start from user {user_id} ({username})")
 
+    # Reject before doing any other work for unauthorized users
     if not is_authorized(user_id):
         await update.message.reply_text("Unauthorized access")
         return
 
-    message = (
-        "*Cloud Automation Bot V3*\n\n"
-        "You are authorized!\n\n"
-        f"Send `{TRIGGER_CODEWORD}` to trigger automation\n\n"
-        "Commands:\n"
-        f"* `{TRIGGER_CODEWORD}` - Run automation\n"
-        "* `/status` - Check status\n"
-        "* `/help` - Show help\n\n"
-        "Using Google Sheets queue!\n"
-        "Work computer will process your request"
-    )
+    username = update.effective_user.username or update.effective_user.first_name
+    logger.info("/start from user %s (%s)", user_id, username)
 
-    await update.message.reply_text(message, parse_mode='Markdown')
+    await update.message.reply_text(START_MSG, parse_mode='Markdown')
 
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /status command"""
+    global _queue_counts
+
     user_id = update.effective_user.id
 
     if not is_authorized(user_id):
@@ -171,28 +316,24 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
     # Check queue status
     try:
-        pending_commands = queue.check_commands()
-        pending_results = queue.check_results()
-
-        message = (
-            "*Bot Status*\n\n"
-            "Bot: Running\n"
-            f"Queue: Connected (Sheets)\n"
-            f"Pending commands: {len(pending_commands)}\n"
-            f"Pending results: {len(pending_results)}\n"
-            f"Authorized: {AUTHORIZED_USER_ID}\n"
-            f"Trigger: `{TRIGGER_CODEWORD}`\n\n"
-            f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        )
-    except:
-        message = (
-            "*Bot Status*\n\n"
-            "Bot: Running\n"
-            f"Queue: Error\n"
-            f"Authorized: {AUTHORIZED_USER_ID}\n"
-            f"Trigger: `{TRIGGER_CODEWORD}`\n\n"
-            f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        # Only ask Sheets when the last counts are stale
+        now = asyncio.get_running_loop().time()
+        if _queue_counts is None or now - _queue_counts[0] > STATUS_CACHE_TTL:
+            # Both tabs in one Sheets request, run off the event loop
+            pending_commands, pending_rows = await run_queue(queue.batch_check)
+            _queue_counts = (now, len(pending_commands), len(pending_rows))
+
+        _, command_count, result_count = _queue_counts
+        queue_lines = (
+            "Queue: Connected (Sheets)\n"
+            f"Pending commands: {command_count}\n"
+            f"Pending results: {result_count}\n"
         )
+    except Exception as e:
+        logger.warning("Status query failed: %s", e)
+        queue_lines = "Queue: Error\n"
+
+    message = f"{STATUS_HEADER}{queue_lines}{STATUS_FOOTER}{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
 
     await update.message.reply_text(message, parse_mode='Markdown')
 
@@ -204,26 +345,11 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         await update.message.reply_text("Unauthorized")
         return
 
-    message = (
-        "*Help - Cloud Automation Bot V3*\n\n"
-        f"*Trigger Automation:*\n"
-        f"Send `{TRIGGER_CODEWORD}`\n\n"
-        "*How it works:*\n"
-        "1. You send command from anywhere\n"
-        "2. Bot writes to Google Sheets queue\n"
-        "3. Your work computer picks it up\n"
-        "4. Automation runs on work computer\n"
-        "5. Results sent back via Sheets\n"
-        "6. Bot sends you confirmation!\n\n"
-        "Duration: ~20-40 seconds\n"
-        "Works from anywhere in the world!"
-    )
-
-    await update.message.reply_text(message, parse_mode='Markdown')
+    await update.message.reply_text(HELP_MSG, parse_mode='Markdown')
 
 async def wait_for_result(command_id: str, update: Update) -> Optional[dict]:
     """
-    Poll Google Sheets for result of a command.
+    Wait for the result pump to deliver the result of a command.
 
     Args:
         command_id: Command ID to wait for
@@ -232,84 +358,145 @@ async def wait_for_result(command_id: str, update: Update) -> Optional[dict]:
     Returns:
         dict: Result data or None if timeout
     """
-    start_time = datetime.now()
-    elapsed = 0
+    global _result_pump_task, _result_poll_attempt
 
-    while elapsed < RESULT_TIMEOUT:
-        try:
-            # Check for results matching our command_id
-            results = queue.check_results(command_id)
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
 
-            if results:
-                # Found result!
-                result = results[0]
-                logger.info(f"Result received for {command_id}")
+    event = pending_waiters.setdefault(command_id, asyncio.Event())
 
-                # Mark result as processed using row_number
-                queue.delete_result(row_number=result.get('row_number'))
+    # New command - poll quickly again, and start the pump if it is idle
+    _result_poll_attempt = 0
+    if _result_pump_task is None or _result_pump_task.done():
+        _result_pump_task = asyncio.create_task(_result_pump())
 
-                return result
+    try:
+        while True:
+            remaining = RESULT_TIMEOUT - (loop.time() - start_time)
+
+            if remaining <= 0:
+                logger.warning("Timeout waiting for result of %s", command_id)
+                return None
+
+            try:
+                await asyncio.wait_for(event.wait(), min(remaining, RESULT_NOTIFY_INTERVAL))
+                break
+            except asyncio.TimeoutError:
+                elapsed = loop.time() - start_time
+
+                # Send progress update every RESULT_NOTIFY_INTERVAL seconds
+                if elapsed < RESULT_TIMEOUT:
+                    await update.message.reply_text(
+                        f"Still waiting... ({int(elapsed)}s elapsed)",
+                        parse_mode='Markdown'
+                    )
 
-            # Wait before next check
-            await asyncio.sleep(RESULT_POLL_INTERVAL)
+        results = pending_results[command_id]
 
-            elapsed = (datetime.now() - start_time).total_seconds()
+    finally:
+        pending_waiters.pop(command_id, None)
+        pending_results.pop(command_id, None)
 
-            # Send progress update every 30 seconds
-            if int(elapsed) % 30 == 0 and elapsed > 0:
-                await update.message.reply_text(
-                    f"Still waiting... ({int(elapsed)}s elapsed)",
-                    parse_mode='Markdown'
-                )
+    # Found result!
+    result = results[0]
+    logger.info("Result received for %s", command_id)
 
-        except Exception as e:
-            logger.error(f"Error checking results: {e}")
-            await asyncio.sleep(RESULT_POLL_INTERVAL)
-            elapsed = (datetime.now() - start_time).total_seconds()
+    # Mark result (and any duplicates) as processed in one request
+    await run_queue(queue.delete_results, [r.get('row_number') for r in results])
+
+    return result
+
+def format_success_message(data: dict) -> str:
+    """
+    Build the plain-text report for a successful automation run.
+
+    No Markdown - connection type names may contain special characters.
+
+    Args:
+        data: Result data written by the work computer
+
+    Returns:
+        str: Message text
+    """
+    lines = ["AUTOMATION COMPLETED!", "=" * 25, ""]
+
+    # Email info
+    if data.get('email_subject'):
+        lines.append(f"Email: {data['email_subject'][:60]}")
+    if data.get('email_date'):
+        lines.append(f"Date: {data['email_date']}")
+
+    lines.append("")
+
+    # Status indicators
+    if data.get('workflow_success'):
+        lines.append("[OK] Download: Done")
+        lines.append("[OK] Processing: Done")
+    if data.get('uploaded_to_sheets'):
+        lines.append("[OK] Upload to Sheets: Done")
+
+    # Ticket Summary
+    ticket_summary = data.get('ticket_summary', {})
+    if ticket_summary:
+        lines.append("\n--- TICKET SUMMARY ---")
+
+        if ticket_summary.get('total_tickets'):
+            lines.append(f"Total Tickets: {ticket_summary['total_tickets']}")
+
+        if ticket_summary.get('latest_date'):
+            lines.append(f"Latest Date: {ticket_summary['latest_date']}")
 
-    # Timeout
-    logger.warning(f"Timeout waiting for result of {command_id}")
-    return None
+        if ticket_summary.get('latest_day_total'):
+            lines.append(f"Today's Tickets: {ticket_summary['latest_day_total']}")
+
+        # Top 5 connection types (heap-based, no full sort)
+        by_type = ticket_summary.get('by_connection_type', {})
+        if by_type:
+            lines.append("\nBy Connection Type:")
+            for conn_type, count in Counter(by_type).most_common(5):
+                lines.append(f"  {conn_type}: {count}")
+
+    # Duration
+    if data.get('duration'):
+        lines.append(f"\nTime: {data['duration']:.1f} seconds")
+
+    # Link to sheets (plain URL, no Markdown link)
+    if data.get('sheets_url'):
+        lines.append(f"\nGoogle Sheets:\n{data['sheets_url']}")
+
+    return "\n".join(lines)
 
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle text messages"""
     user_id = update.effective_user.id
-    message_text = update.message.text.strip()
-
-    logger.info(f"Message from {user_id}: {message_text}")
 
+    # Reject before doing any other work for unauthorized users
     if not is_authorized(user_id):
         await update.message.reply_text("Unauthorized")
         return
 
-    if message_text.upper() == TRIGGER_CODEWORD.upper():
-        logger.info(f"Trigger detected from user {user_id}")
+    message_text = update.message.text.strip()
+    logger.info("Message from %s: %s", user_id, message_text)
 
-        # Send initial confirmation
-        await update.message.reply_text(
-            "*Automation Triggered!*\n\n"
-            "Writing command to Google Sheets queue...\n"
-            "Waiting for your work computer to pick it up...\n\n"
-            "This may take 20-60 seconds depending on polling interval.",
-            parse_mode='Markdown'
-        )
+    if message_text.upper() == _TRIGGER_UPPER:
+        logger.info("Trigger detected from user %s", user_id)
 
         try:
-            # Write command to Google Sheets queue
-            command_id = queue.write_command("RUNNIT", {
-                "user_id": user_id,
-                "timestamp": datetime.now().isoformat()
-            })
+            # Send initial confirmation while the command is written to the
+            # Google Sheets queue (off the event loop)
+            _, command_id = await asyncio.gather(
+                update.message.reply_text(TRIGGERED_MSG, parse_mode='Markdown'),
+                run_queue(queue.write_command, "RUNNIT", {
+                    "user_id": user_id,
+                    "timestamp": datetime.now().isoformat()
+                })
+            )
 
             if not command_id:
-                await update.message.reply_text(
-                    "*Failed to write command*\n\n"
-                    "Could not write to Google Sheets queue.",
-                    parse_mode='Markdown'
-                )
+                await update.message.reply_text(WRITE_FAILED_MSG, parse_mode='Markdown')
                 return
 
-            logger.info(f"Command written: {command_id}")
+            logger.info("Command written: %s", command_id)
 
             # Send confirmation
             await update.message.reply_text(
@@ -326,56 +513,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             if result:
                 # Got result!
                 if result.get('success'):
-                    data = result.get('data', {})
-
-                    # Build message WITHOUT Markdown to avoid parsing errors
-                    # (connection type names may contain special characters)
-                    message = "AUTOMATION COMPLETED!\n"
-                    message += "=" * 25 + "\n\n"
-
-                    # Email info
-                    if data.get('email_subject'):
-                        message += f"Email: {data['email_subject'][:60]}\n"
-                    if data.get('email_date'):
-                        message += f"Date: {data['email_date']}\n"
-
-                    message += "\n"
-
-                    # Status indicators
-                    if data.get('workflow_success'):
-                        message += "[OK] Download: Done\n"
-                        message += "[OK] Processing: Done\n"
-                    if data.get('uploaded_to_sheets'):
-                        message += "[OK] Upload to Sheets: Done\n"
-
-                    # Ticket Summary
-                    ticket_summary = data.get('ticket_summary', {})
-                    if ticket_summary:
-                        message += "\n--- TICKET SUMMARY ---\n"
-
-                        if ticket_summary.get('total_tickets'):
-                            message += f"Total Tickets: {ticket_summary['total_tickets']}\n"
-
-                        if ticket_summary.get('latest_date'):
-                            message += f"Latest Date: {ticket_summary['latest_date']}\n"
-
-                        if ticket_summary.get('latest_day_total'):
-                            message += f"Today's Tickets: {ticket_summary['latest_day_total']}\n"
-
-                        # Breakdown by connection type
-                        by_type = ticket_summary.get('by_connection_type', {})
-                        if by_type:
-                            message += "\nBy Connection Type:\n"
-                            for conn_type, count in sorted(by_type.items(), key=lambda x: x[1], reverse=True)[:5]:
-                                message += f"  {conn_type}: {count}\n"
-
-                    # Duration
-                    if data.get('duration'):
-                        message += f"\nTime: {data['duration']:.1f} seconds\n"
-
-                    # Link to sheets (plain URL, no Markdown link)
-                    if data.get('sheets_url'):
-                        message += f"\nGoogle Sheets:\n{data['sheets_url']}"
+                    message = format_success_message(result.get('data', {}))
 
                     # Send without Markdown parsing to avoid errors
                     await update.message.reply_text(message)
@@ -387,19 +525,10 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                     )
             else:
                 # Timeout
-                await update.message.reply_text(
-                    "*Timeout*\n\n"
-                    "Did not receive result within 5 minutes.\n\n"
-                    "Possible issues:\n"
-                    "* Work computer is offline\n"
-                    "* Polling script not running\n"
-                    "* Google Sheets access issue\n\n"
-                    "Check work computer status.",
-                    parse_mode='Markdown'
-                )
+                await update.message.reply_text(TIMEOUT_MSG, parse_mode='Markdown')
 
         except Exception as e:
-            logger.error(f"Error handling trigger: {e}", exc_info=True)
+            logger.error("Error handling trigger: %s", e, exc_info=True)
             await update.message.reply_text(
                 f"*Error*\n\n{str(e)}",
                 parse_mode='Markdown'
@@ -414,7 +543,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
 async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle errors"""
-    logger.error(f"Update {update} caused error {context.error}")
+    logger.error("Update %s caused error %s", update, context.error)
 
 # =============================================================================
 # MAIN FUNCTION
@@ -423,11 +552,19 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 def main():
     """Main function - start the bot"""
 
+    # Faster libuv-based event loop where available (not on Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop")
+    except ImportError:
+        pass
+
     logger.info("="*70)
     logger.info("CLOUD AUTOMATION BOT V3 - GOOGLE SHEETS QUEUE")
     logger.info("="*70)
-    logger.info(f"Authorized user: {AUTHORIZED_USER_ID}")
-    logger.info(f"Trigger codeword: {TRIGGER_CODEWORD}")
+    logger.info("Authorized user: %s", AUTHORIZED_USER_ID)
+    logger.info("Trigger codeword: %s", TRIGGER_CODEWORD)
     logger.info("="*70)
 
     # Initialize Google Sheets queue
@@ -437,28 +574,48 @@ def main():
 
     try:
         # Create application
-        application = Application.builder().token(BOT_TOKEN).build()
+        # Wait longer for a free pooled connection instead of failing with PoolTimeout,
+        # and handle updates concurrently so one RUNNIT wait doesn't hold up other messages
+        application = (
+            Application.builder()
+            .token(BOT_TOKEN)
+            .pool_timeout(TELEGRAM_POOL_TIMEOUT)
+            .concurrent_updates(True)
+            .build()
+        )
 
         # Add handlers
         application.add_handler(CommandHandler("start", start_command))
         application.add_handler(CommandHandler("status", status_command))
         application.add_handler(CommandHandler("help", help_command))
-        application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
+        application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message, block=False))
         application.add_error_handler(error_handler)
 
-        # Start polling
         logger.info("Bot is now running... Press Ctrl+C to stop")
         logger.info("Using Google SHEETS queue for work computer communication")
-        application.run_polling(
-            poll_interval=30,
-            timeout=10,
-            drop_pending_updates=True
-        )
+
+        if WEBHOOK_DOMAIN and not USE_POLLING:
+            # Telegram pushes each update to us - no polling delay
+            logger.info("Listening for webhook on port %s (%s)", WEBHOOK_PORT, WEBHOOK_DOMAIN)
+            application.run_webhook(
+                listen='0.0.0.0',
+                port=WEBHOOK_PORT,
+                url_path=BOT_TOKEN,
+                webhook_url=f"https://{WEBHOOK_DOMAIN}/{BOT_TOKEN}",
+                drop_pending_updates=True
+            )
+        else:
+            # Start polling
+            application.run_polling(
+                poll_interval=30,
+                timeout=10,
+                drop_pending_updates=True
+            )
 
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
     except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         raise
 
 if __name__ == "__main__":
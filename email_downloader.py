@@ -12,15 +12,204 @@ Purpose: Cloud-based replacement for PowerShell email downloader
 
 import imaplib
 import email
+import email.message
+import email.utils
 from email.header import decode_header
 import os
 import re
-from datetime import datetime
+import select
+import ssl
+import sys
+import time
+import io
+import binascii
+import quopri
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date, timedelta
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Max message UIDs per FETCH command (keeps requests under server size limits)
+FETCH_CHUNK_SIZE = 100
+
+# Matches the UID item in a UID FETCH response line
+FETCH_UID_RE = re.compile(rb'UID (\d+)')
+
+# Only search mail received in the last N days (full-mailbox search as fallback)
+SEARCH_SINCE_DAYS = 7
+
+# IMAP dates use English month names regardless of locale
+IMAP_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+               "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# Connections used to fetch large candidate sets in parallel
+# (Outlook allows ~10 concurrent IMAP connections per mailbox)
+FETCH_POOL_SIZE = 3
+
+# Below this many candidates one connection is faster than opening more
+PARALLEL_FETCH_MIN = 50
+
+# Attachments we download from the ticket summary email
+CSV_FILENAME_RE = re.compile(r'\.csv$', re.IGNORECASE)
+
+# Encoded bytes decoded per step when saving a base64 attachment
+DECODE_CHUNK_SIZE = 64 * 1024
+
+# Everything that is not base64 alphabet or padding (skipped like email does)
+BASE64_JUNK = bytes(
+    set(range(256)) - set(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=')
+)
+
+# Seconds to stay in IMAP IDLE before re-issuing it
+# (servers drop IDLE after ~30 minutes, Outlook sooner)
+IDLE_TIMEOUT = 300
+
+# Wait after IDLE is refused or fails - doubles up to IDLE_TIMEOUT so a
+# server without IDLE isn't hammered with SELECT + IDLE in a tight loop
+IDLE_RETRY_DELAY = 5
+
+# Tag for our hand-written IDLE command (imaplib has no IDLE support)
+IDLE_TAG = b"IDLE1"
+
+# Untagged push sent when new mail arrives: "* 42 EXISTS"
+IDLE_EXISTS_RE = re.compile(rb'^\* \d+ EXISTS')
+
+
+def _tokenize_fetch(msg_data):
+    """
+    Split a FETCH response into tokens: "(", ")", strings, None (NIL)
+    and literal bytes.
+
+    Args:
+        msg_data: Response data list from imaplib (bytes and (bytes, literal) tuples)
+
+    Returns:
+        list: Tokens in response order
+    """
+    tokens = []
+
+    for item in msg_data:
+        text, literal = item if isinstance(item, tuple) else (item, None)
+        i = 0
+
+        while i < len(text):
+            char = text[i:i + 1]
+
+            if char in (b" ", b"\r", b"\n"):
+                i += 1
+            elif char in (b"(", b")"):
+                tokens.append(char.decode())
+                i += 1
+            elif char == b'"':
+                # Quoted string with backslash escapes
+                value = bytearray()
+                i += 1
+                while text[i:i + 1] != b'"':
+                    if i >= len(text):
+                        raise ValueError("Unterminated quoted string in FETCH response")
+                    if text[i:i + 1] == b"\\":
+                        i += 1
+                    value += text[i:i + 1]
+                    i += 1
+                tokens.append(value.decode('utf-8', errors='replace'))
+                i += 1
+            elif char == b"{":
+                # Literal marker - the literal itself is the tuple's second half
+                i = text.index(b"}", i) + 1
+                tokens.append(literal)
+            else:
+                # Atom (keeps BODY[...] sections, which contain spaces/parens, whole)
+                start = i
+                while i < len(text) and text[i:i + 1] not in (b" ", b"(", b")"):
+                    if text[i:i + 1] == b"[":
+                        i = text.index(b"]", i)
+                    i += 1
+                atom = text[start:i].decode('ascii', errors='replace')
+                tokens.append(None if atom.upper() == "NIL" else atom)
+
+    return tokens
+
+
+def _parse_fetch(msg_data):
+    """
+    Parse a single-message FETCH response into its item list.
+
+    Args:
+        msg_data: Response data list from imaplib
+
+    Returns:
+        list: Items, e.g. ["UID", "12", "BODYSTRUCTURE", [...]]
+    """
+    stack = [[]]
+
+    for token in _tokenize_fetch(msg_data):
+        if token == "(":
+            stack.append([])
+        elif token == ")":
+            closed = stack.pop()
+            stack[-1].append(closed)
+        else:
+            stack[-1].append(token)
+
+    # [sequence number, [items...]]
+    return stack[0][1]
+
+
+def _find_attachment_parts(structure, part_id=""):
+    """
+    Walk a parsed BODYSTRUCTURE and collect the parts that carry a filename.
+
+    Args:
+        structure: Parsed BODYSTRUCTURE list
+        part_id: Section number of this node ("" for the message itself)
+
+    Returns:
+        list: (part_id, filename (may be RFC 2047 encoded), transfer encoding) tuples
+    """
+    if structure and isinstance(structure[0], list):
+        # Multipart: children first, then subtype + extension data
+        parts = []
+        for index, child in enumerate(c for c in structure if isinstance(c, list)):
+            child_id = f"{part_id}.{index + 1}" if part_id else str(index + 1)
+            parts.extend(_find_attachment_parts(child, child_id))
+        return parts
+
+    if len(structure) < 7 or not isinstance(structure[0], str):
+        return []
+
+    media_type = structure[0].lower()
+    params = structure[2] if isinstance(structure[2], list) else []
+    encoding = (structure[5] or "7BIT").upper()
+
+    # Disposition follows MD5 in the extension data; text parts carry a line count first
+    disposition_index = 9 if media_type == "text" else 8
+    disposition = structure[disposition_index] if len(structure) > disposition_index else None
+    disposition_params = disposition[1] if isinstance(disposition, list) and len(disposition) > 1 else None
+
+    filename = None
+    for candidates in (disposition_params, params):
+        if not isinstance(candidates, list):
+            continue
+        # Values sent as literals arrive as bytes
+        fields = {
+            str(key).lower(): value.decode('utf-8', errors='replace') if isinstance(value, bytes) else value
+            for key, value in zip(candidates[::2], candidates[1::2])
+        }
+        if fields.get("filename*") or fields.get("name*"):
+            value = fields.get("filename*") or fields.get("name*")
+            filename = email.utils.collapse_rfc2231_value(email.utils.decode_rfc2231(value))
+        else:
+            filename = fields.get("filename") or fields.get("name")
+        if filename:
+            break
+
+    if media_type == "message" or not filename:
+        return []
+
+    return [(part_id or "1", filename, encoding)]
+
 class OutlookIMAPDownloader:
     """
     Downloads emails from Outlook using IMAP protocol.
@@ -41,6 +230,19 @@ class OutlookIMAPDownloader:
         self.imap_server = imap_server
         self.imap_port = imap_port
         self.mail = None
+        self.folder = "INBOX"
+        self._pool = []
+
+    def _login(self):
+        """
+        Open and log in a new IMAP connection.
+
+        Returns:
+            imaplib.IMAP4_SSL: Logged-in connection
+        """
+        conn = imaplib.IMAP4_SSL(self.imap_server, self.imap_port)
+        conn.login(self.email_address, self.password)
+        return conn
 
     def connect(self):
         """
@@ -50,26 +252,89 @@ class OutlookIMAPDownloader:
             bool: True if connection successful, False otherwise
         """
         try:
-            logger.info(f"Connecting to {self.imap_server}:{self.imap_port}...")
-            self.mail = imaplib.IMAP4_SSL(self.imap_server, self.imap_port)
-
-            logger.info(f"Logging in as {self.email_address}...")
-            self.mail.login(self.email_address, self.password)
+            logger.info("Connecting to %s:%s as %s...", self.imap_server, self.imap_port, self.email_address)
+            self.mail = self._login()
 
             logger.info("✓ Connected successfully!")
             return True
 
         except imaplib.IMAP4.error as e:
-            logger.error(f"IMAP error: {e}")
+            logger.error("IMAP error: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Connection error: {e}")
+            logger.error("Connection error: %s", e)
             return False
 
+    def ensure_connected(self):
+        """
+        Make sure the IMAP connection is alive, reconnecting if needed.
+
+        Cheap NOOP check so a long-lived downloader can be reused across
+        runs instead of reconnecting (TLS + LOGIN) every time.
+
+        Returns:
+            bool: True if connected, False otherwise
+        """
+        if self.mail:
+            try:
+                status, _ = self.mail.noop()
+                if status == "OK":
+                    return True
+            except Exception as e:
+                logger.warning("IMAP connection lost (%s), reconnecting...", e)
+
+        return self.connect()
+
+    def connect_pool(self, n=FETCH_POOL_SIZE):
+        """
+        Get up to n connections with the current folder selected (read-only).
+
+        The main connection is always first; extra connections are opened
+        once and kept for later runs.
+
+        Args:
+            n: Total number of connections wanted
+
+        Returns:
+            list: Connections ready for FETCH (at least the main one)
+        """
+        connections = [self.mail]
+
+        # Re-select on pooled connections (also refreshes their mailbox view)
+        for conn in list(self._pool[:n - 1]):
+            try:
+                status, _ = conn.select(self.folder, readonly=True)
+                if status == "OK":
+                    connections.append(conn)
+                    continue
+            except Exception as e:
+                logger.warning("Pooled IMAP connection lost (%s)", e)
+            self._pool.remove(conn)
+
+        while len(connections) < n:
+            try:
+                conn = self._login()
+                conn.select(self.folder, readonly=True)
+            except Exception as e:
+                logger.warning("Could not open extra IMAP connection: %s", e)
+                break
+
+            self._pool.append(conn)
+            connections.append(conn)
+
+        return connections
+
     def disconnect(self):
         """
         Disconnect from the IMAP server.
         """
+        for conn in self._pool:
+            try:
+                conn.logout()
+            except:
+                pass
+        self._pool = []
+
         if self.mail:
             try:
                 self.mail.logout()
@@ -77,7 +342,7 @@ class OutlookIMAPDownloader:
             except:
                 pass
 
-    def search_emails(self, sender=None, subject_contains=None, folder="INBOX"):
+    def search_emails(self, sender=None, subject_contains=None, folder="INBOX", since_days=None):
         """
         Search for emails matching criteria.
 
@@ -85,22 +350,29 @@ class OutlookIMAPDownloader:
             sender: Filter by sender email address
             subject_contains: Filter by subject text
             folder: Email folder to search (default: INBOX)
+            since_days: Only match mail received in the last N days (default: no limit)
 
         Returns:
-            list: List of email IDs matching criteria
+            list: List of email UIDs matching criteria
         """
         try:
             # Select the folder
-            logger.info(f"Selecting folder: {folder}")
+            logger.info("Selecting folder: %s", folder)
             status, messages = self.mail.select(folder)
 
             if status != "OK":
-                logger.error(f"Failed to select folder {folder}")
+                logger.error("Failed to select folder %s", folder)
                 return []
 
+            self.folder = folder
+
             # Build search criteria
             search_criteria = []
 
+            if since_days:
+                since = date.today() - timedelta(days=since_days)
+                search_criteria.append(f"SINCE {since.day}-{IMAP_MONTHS[since.month - 1]}-{since.year}")
+
             if sender:
                 search_criteria.append(f'FROM "{sender}"')
 
@@ -113,41 +385,112 @@ class OutlookIMAPDownloader:
             else:
                 search_query = " ".join(search_criteria)
 
-            logger.info(f"Searching with criteria: {search_query}")
+            logger.info("Searching with criteria: %s", search_query)
 
-            # Search emails
-            status, email_ids = self.mail.search(None, search_query)
+            # Search emails - UIDs stay valid if the mailbox changes meanwhile
+            status, email_ids = self.mail.uid("SEARCH", None, search_query)
 
             if status != "OK":
                 logger.error("Search failed")
                 return []
 
-            # Get list of email IDs
+            # Get list of email UIDs
             email_id_list = email_ids[0].split()
 
-            logger.info(f"Found {len(email_id_list)} matching emails")
+            logger.info("Found %s matching emails", len(email_id_list))
 
             return email_id_list
 
         except Exception as e:
-            logger.error(f"Search error: {e}")
+            logger.error("Search error: %s", e)
             return []
 
+    def fetch_internaldates(self, email_ids, chunk_size=FETCH_CHUNK_SIZE):
+        """
+        Fetch the server arrival date of many emails in batched UID FETCH commands.
+
+        Large candidate sets are split across FETCH_POOL_SIZE connections and
+        fetched in parallel.
+
+        Args:
+            email_ids: List of email UIDs
+            chunk_size: Max UIDs per FETCH command
+
+        Returns:
+            dict: Email UID (bytes) -> arrival time (time.struct_time)
+        """
+        if len(email_ids) < PARALLEL_FETCH_MIN:
+            return self._fetch_internaldates(self.mail, email_ids, chunk_size)
+
+        connections = self.connect_pool()
+        size = -(-len(email_ids) // len(connections))
+        partitions = [email_ids[start:start + size] for start in range(0, len(email_ids), size)]
+
+        logger.info("Fetching dates for %s emails over %s connections", len(email_ids), len(partitions))
+
+        dates = {}
+        with ThreadPoolExecutor(max_workers=len(partitions)) as executor:
+            for partial in executor.map(self._fetch_internaldates, connections, partitions,
+                                        [chunk_size] * len(partitions)):
+                dates.update(partial)
+
+        return dates
+
+    def _fetch_internaldates(self, conn, email_ids, chunk_size):
+        """
+        Fetch arrival dates for a list of email UIDs on one connection.
+
+        Args:
+            conn: IMAP connection with the folder selected
+            email_ids: List of email UIDs
+            chunk_size: Max UIDs per FETCH command
+
+        Returns:
+            dict: Email UID (bytes) -> arrival time (time.struct_time)
+        """
+        dates = {}
+
+        for start in range(0, len(email_ids), chunk_size):
+            chunk = email_ids[start:start + chunk_size]
+
+            try:
+                status, msg_data = conn.uid("FETCH", b",".join(chunk), "(UID INTERNALDATE)")
+
+                if status != "OK":
+                    logger.error("Failed to fetch dates for %s emails", len(chunk))
+                    continue
+
+                for line in msg_data:
+                    if isinstance(line, tuple):
+                        line = line[0]
+
+                    id_match = FETCH_UID_RE.search(line)
+                    arrival = imaplib.Internaldate2tuple(line)
+
+                    if id_match and arrival:
+                        dates[id_match.group(1)] = arrival
+
+            except Exception as e:
+                logger.error("Error fetching email dates: %s", e)
+
+        return dates
+
     def get_email_data(self, email_id):
         """
-        Fetch email data by ID.
+        Fetch email data by UID.
 
         Args:
-            email_id: Email ID to fetch
+            email_id: Email UID to fetch
 
         Returns:
             email.message.Message: Email message object or None
         """
         try:
-            status, msg_data = self.mail.fetch(email_id, "(RFC822)")
+            # BODY.PEEK[] returns the full message without setting \Seen
+            status, msg_data = self.mail.uid("FETCH", email_id, "(BODY.PEEK[])")
 
             if status != "OK":
-                logger.error(f"Failed to fetch email {email_id}")
+                logger.error("Failed to fetch email %s", email_id)
                 return None
 
             # Parse email
@@ -155,9 +498,178 @@ class OutlookIMAPDownloader:
             return msg
 
         except Exception as e:
-            logger.error(f"Error fetching email {email_id}: {e}")
+            logger.error("Error fetching email %s: %s", email_id, e)
             return None
 
+    def fetch_structure(self, email_id):
+        """
+        Fetch an email's MIME structure and Subject/Date headers (no body).
+
+        Args:
+            email_id: Email UID
+
+        Returns:
+            tuple: (parsed BODYSTRUCTURE list, email.message.Message with the headers)
+                   or (None, None) if failed
+        """
+        try:
+            status, msg_data = self.mail.uid(
+                "FETCH", email_id, "(BODYSTRUCTURE BODY.PEEK[HEADER.FIELDS (SUBJECT DATE)])"
+            )
+
+            if status != "OK" or not msg_data or msg_data[0] is None:
+                logger.error("Failed to fetch structure of email %s", email_id)
+                return None, None
+
+            items = _parse_fetch(msg_data)
+            fields = dict(zip(items[::2], items[1::2]))
+
+            structure = fields.get("BODYSTRUCTURE")
+            header_bytes = next(
+                (value for key, value in fields.items() if key.upper().startswith("BODY[HEADER")), b""
+            )
+
+            return structure, email.message_from_bytes(header_bytes or b"")
+
+        except Exception as e:
+            logger.error("Error fetching structure of email %s: %s", email_id, e)
+            return None, None
+
+    def get_part(self, email_id, part_id):
+        """
+        Fetch a single MIME part of an email (still transfer-encoded).
+
+        Args:
+            email_id: Email UID
+            part_id: IMAP section number, e.g. "2" or "1.2"
+
+        Returns:
+            bytes: Raw part content, or None if failed
+        """
+        try:
+            status, msg_data = self.mail.uid("FETCH", email_id, f"(BODY.PEEK[{part_id}])")
+
+            if status != "OK":
+                logger.error("Failed to fetch part %s of email %s", part_id, email_id)
+                return None
+
+            for item in msg_data:
+                if isinstance(item, tuple):
+                    return item[1]
+
+            return None
+
+        except Exception as e:
+            logger.error("Error fetching part %s of email %s: %s", part_id, email_id, e)
+            return None
+
+    def download_csv_part(self, email_id, output_dir=".", filename_prefix=""):
+        """
+        Download the first CSV attachment of an email without fetching the rest of it.
+
+        Uses BODYSTRUCTURE to locate the attachment and fetches only that
+        part, so inline images / HTML bodies never cross the wire.
+
+        Args:
+            email_id: Email UID
+            output_dir: Directory to save the CSV file
+            filename_prefix: Prepended to the saved file name (optional)
+
+        Returns:
+            str: Path to the saved file, or None if no CSV part could be fetched
+        """
+        structure, headers = self.fetch_structure(email_id)
+
+        if not structure:
+            return None
+
+        logger.info("Email subject: %s", self.decode_subject(headers['Subject']))
+        logger.info("Email date: %s", headers['Date'])
+
+        parts = [
+            (part_id, self.decode_subject(filename), encoding)
+            for part_id, filename, encoding in _find_attachment_parts(structure)
+        ]
+        parts = [part for part in parts if CSV_FILENAME_RE.search(part[1])]
+
+        if not parts:
+            logger.warning("No CSV attachment found in email structure")
+            return None
+
+        part_id, filename, encoding = parts[0]
+
+        logger.info("Downloading attachment: %s (part %s)", filename, part_id)
+
+        raw = self.get_part(email_id, part_id)
+
+        if raw is None:
+            return None
+
+        os.makedirs(output_dir, exist_ok=True)
+        filepath = os.path.join(output_dir, filename_prefix + filename)
+
+        self._write_decoded(raw, encoding, filepath)
+
+        logger.info("✓ Saved: %s", filepath)
+        return filepath
+
+    def _write_decoded(self, raw, encoding, filepath):
+        """
+        Decode a transfer-encoded attachment straight into a file.
+
+        base64 is decoded DECODE_CHUNK_SIZE bytes at a time and
+        quoted-printable line by line, so no second full copy of the
+        attachment is built next to the encoded one imaplib returned.
+
+        Args:
+            raw: Transfer-encoded content (bytes)
+            encoding: Content-Transfer-Encoding (upper case)
+            filepath: Destination file
+        """
+        with open(filepath, 'wb') as f:
+            if encoding == "BASE64":
+                self._write_base64(raw, f)
+            elif encoding == "QUOTED-PRINTABLE":
+                quopri.decode(io.BytesIO(raw), f)
+            else:
+                f.write(raw)
+
+    @staticmethod
+    def _write_base64(raw, f):
+        """
+        Decode base64 into a file in chunks.
+
+        Line breaks can fall anywhere in the 4-character groups, so the
+        unaligned tail of each chunk is carried into the next one. Data the
+        chunked decoder rejects is decoded whole by the email package, the
+        same way get_payload(decode=True) would.
+
+        Args:
+            raw: base64 content (bytes)
+            f: Binary file opened for writing
+        """
+        view = memoryview(raw)
+        leftover = b''
+
+        try:
+            for start in range(0, len(view), DECODE_CHUNK_SIZE):
+                chunk = leftover + bytes(view[start:start + DECODE_CHUNK_SIZE]).translate(None, BASE64_JUNK)
+                aligned = len(chunk) - len(chunk) % 4
+                f.write(binascii.a2b_base64(chunk[:aligned]))
+                leftover = chunk[aligned:]
+
+            if leftover:
+                # Missing padding - extra "=" is ignored
+                f.write(binascii.a2b_base64(leftover + b'=='))
+
+        except binascii.Error:
+            f.seek(0)
+            f.truncate()
+            msg = email.message.Message()
+            msg['Content-Transfer-Encoding'] = 'base64'
+            msg.set_payload(raw)
+            f.write(msg.get_payload(decode=True))
+
     def decode_subject(self, subject):
         """
         Decode email subject (handles encoding).
@@ -171,34 +683,48 @@ class OutlookIMAPDownloader:
         if subject is None:
             return ""
 
-        decoded_parts = decode_header(subject)
-        decoded_subject = ""
+        return "".join(
+            self._decode_part(part, encoding) if isinstance(part, bytes) else part
+            for part, encoding in decode_header(subject)
+        )
 
-        for part, encoding in decoded_parts:
-            if isinstance(part, bytes):
-                try:
-                    decoded_subject += part.decode(encoding or 'utf-8')
-                except:
-                    decoded_subject += part.decode('utf-8', errors='ignore')
-            else:
-                decoded_subject += part
+    @staticmethod
+    def _decode_part(part, encoding):
+        """
+        Decode one encoded-word chunk of a header.
 
-        return decoded_subject
+        Args:
+            part: Raw bytes from decode_header
+            encoding: Declared charset (may be None or unknown)
 
-    def download_attachments(self, msg, output_dir=".", filename_pattern=None):
+        Returns:
+            str: Decoded text (falls back to lenient UTF-8)
+        """
+        try:
+            return part.decode(encoding or 'utf-8')
+        except (LookupError, UnicodeDecodeError):
+            return part.decode('utf-8', errors='ignore')
+
+    def download_attachments(self, msg, output_dir=".", filename_pattern=None, filename_prefix=""):
         """
         Download attachments from an email message.
 
         Args:
             msg: Email message object
             output_dir: Directory to save attachments
-            filename_pattern: Regex pattern to match filename (optional)
+            filename_pattern: Compiled regex (or pattern string, matched
+                              case-insensitively) for the filename (optional)
+            filename_prefix: Prepended to each saved file name (optional)
 
         Returns:
             list: List of downloaded file paths
         """
         downloaded_files = []
 
+        # Compile once for all parts
+        if isinstance(filename_pattern, str):
+            filename_pattern = re.compile(filename_pattern, re.IGNORECASE)
+
         try:
             # Create output directory if it doesn't exist
             os.makedirs(output_dir, exist_ok=True)
@@ -223,30 +749,162 @@ class OutlookIMAPDownloader:
 
                 # Check if filename matches pattern (if provided)
                 if filename_pattern:
-                    if not re.search(filename_pattern, filename, re.IGNORECASE):
-                        logger.debug(f"Skipping {filename} (doesn't match pattern)")
+                    if not filename_pattern.search(filename):
+                        logger.debug("Skipping %s (doesn't match pattern)", filename)
                         continue
 
                 # Save attachment
-                filepath = os.path.join(output_dir, filename)
+                filepath = os.path.join(output_dir, filename_prefix + filename)
 
-                logger.info(f"Downloading attachment: {filename}")
+                logger.info("Downloading attachment: %s", filename)
 
-                with open(filepath, 'wb') as f:
-                    f.write(part.get_payload(decode=True))
+                encoding = str(part.get('Content-Transfer-Encoding', '7bit')).strip().upper()
+
+                if encoding in ("BASE64", "QUOTED-PRINTABLE"):
+                    raw = part.get_payload(decode=False).encode('ascii', errors='ignore')
+                    self._write_decoded(raw, encoding, filepath)
+                else:
+                    with open(filepath, 'wb') as f:
+                        f.write(part.get_payload(decode=True))
 
                 downloaded_files.append(filepath)
-                logger.info(f"✓ Saved: {filepath}")
+                logger.info("✓ Saved: %s", filepath)
 
             return downloaded_files
 
         except Exception as e:
-            logger.error(f"Error downloading attachments: {e}")
+            logger.error("Error downloading attachments: %s", e)
             return downloaded_files
 
+    def idle_wait(self, timeout=IDLE_TIMEOUT):
+        """
+        Block until the server pushes new mail (IMAP IDLE, RFC 2177).
+
+        Replaces polling with SELECT + SEARCH: the server sends
+        "* N EXISTS" as soon as a message arrives in the folder.
+
+        Args:
+            timeout: Max seconds to wait before giving up
+
+        Returns:
+            bool: True if new mail arrived, False on timeout,
+            None if the server refused IDLE or it failed
+        """
+        new_mail = False
+
+        try:
+            self.mail.select(self.folder)
+
+            self.mail.send(IDLE_TAG + b" IDLE\r\n")
+            response = self.mail.readline()
+            if not response.startswith(b"+"):
+                logger.warning("Server refused IDLE: %s", response.strip())
+                return None
+
+            # Wait on the socket itself; a timeout just ends IDLE
+            sock = self.mail.sock
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                # The reader may already hold lines select() can't see
+                # (e.g. an EXISTS that arrived with "+ idling")
+                if not (self._idle_data_buffered() or select.select([sock], [], [], remaining)[0]):
+                    break
+
+                line = self.mail.readline()
+                if not line:
+                    break
+                if IDLE_EXISTS_RE.match(line):
+                    new_mail = True
+                    break
+
+            # Leave IDLE and consume the tagged completion (an EXISTS
+            # already buffered by the reader still counts)
+            self.mail.send(b"DONE\r\n")
+            while True:
+                line = self.mail.readline()
+                if not line or line.startswith(IDLE_TAG):
+                    break
+                if IDLE_EXISTS_RE.match(line):
+                    new_mail = True
+
+        except Exception as e:
+            logger.warning("IDLE failed: %s", e)
+            return None
+
+        if new_mail:
+            logger.info("✓ New mail pushed by server")
+        return new_mail
+
+    def _idle_data_buffered(self):
+        """
+        Check for response bytes already read off the socket.
+
+        Peeks imaplib's buffered reader with the socket briefly
+        non-blocking, so bytes held by the reader or by the SSL layer
+        count without waiting for more to arrive.
+
+        Returns:
+            bool: True if readline() has data to return
+        """
+        sock = self.mail.sock
+        sock_timeout = sock.gettimeout()
+        sock.setblocking(False)
+        try:
+            return bool(self.mail.file.peek(1))
+        except (ssl.SSLWantReadError, BlockingIOError):
+            return False
+        finally:
+            sock.settimeout(sock_timeout)
+
+    def watch_ticket_emails(self, callback, sender="mohammad.jarrar@jepco.com.jo",
+                            subject_contains="Open tickets Summary",
+                            output_dir="downloads"):
+        """
+        Download the ticket CSV each time new mail arrives, until interrupted.
+
+        Uses idle_wait() so the server is only queried when it reports
+        a new message, instead of on every poll interval.
+
+        Args:
+            callback: Called with the CSV path after each download
+            sender: Email address of sender
+            subject_contains: Text that should be in subject
+            output_dir: Directory to save CSV file
+        """
+        retry_delay = IDLE_RETRY_DELAY
+
+        while True:
+            if not self.ensure_connected():
+                time.sleep(IDLE_TIMEOUT)
+                continue
+
+            new_mail = self.idle_wait()
+
+            if new_mail is None:
+                # Refused or failed - back off before trying IDLE again
+                logger.info("Retrying IDLE in %s seconds", retry_delay)
+                time.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, IDLE_TIMEOUT)
+                continue
+
+            retry_delay = IDLE_RETRY_DELAY
+            if not new_mail:
+                continue
+
+            csv_file = self.get_latest_ticket_email(
+                sender=sender,
+                subject_contains=subject_contains,
+                output_dir=output_dir
+            )
+            if csv_file:
+                callback(csv_file)
+
     def get_latest_ticket_email(self, sender="mohammad.jarrar@jepco.com.jo",
                                 subject_contains="Open tickets Summary",
-                                output_dir="downloads"):
+                                output_dir="downloads", filename_prefix=""):
         """
         Get the latest ticket summary email and download its CSV attachment.
 
@@ -254,23 +912,38 @@ class OutlookIMAPDownloader:
             sender: Email address of sender
             subject_contains: Text that should be in subject
             output_dir: Directory to save CSV file
+            filename_prefix: Prepended to the saved file name (optional)
 
         Returns:
             str: Path to downloaded CSV file, or None if not found
         """
         try:
-            # Search for matching emails
-            email_ids = self.search_emails(sender=sender, subject_contains=subject_contains)
+            # Search recent mail first; only scan the whole mailbox if nothing matched
+            email_ids = self.search_emails(sender=sender, subject_contains=subject_contains,
+                                           since_days=SEARCH_SINCE_DAYS)
+            if not email_ids:
+                email_ids = self.search_emails(sender=sender, subject_contains=subject_contains)
 
             if not email_ids:
                 logger.warning("No matching emails found")
                 return None
 
-            # Get the most recent email (last ID in list)
-            latest_email_id = email_ids[-1]
-            logger.info(f"Processing most recent email (ID: {latest_email_id.decode()})")
+            # Get the most recent email by arrival date (one FETCH per chunk of
+            # UIDs), falling back to the last UID in the list
+            dates = self.fetch_internaldates(email_ids)
+            if dates:
+                latest_email_id = max(dates, key=lambda email_id: time.mktime(dates[email_id]))
+            else:
+                latest_email_id = email_ids[-1]
+            logger.info("Processing most recent email (UID: %s)", latest_email_id.decode())
+
+            # Fetch only the CSV part when the structure can be read
+            csv_file = self.download_csv_part(latest_email_id, output_dir=output_dir,
+                                              filename_prefix=filename_prefix)
+            if csv_file:
+                return csv_file
 
-            # Fetch email
+            # Fall back to fetching the whole email
             msg = self.get_email_data(latest_email_id)
 
             if not msg:
@@ -281,14 +954,15 @@ class OutlookIMAPDownloader:
             subject = self.decode_subject(msg['Subject'])
             date = msg['Date']
 
-            logger.info(f"Email subject: {subject}")
-            logger.info(f"Email date: {date}")
+            logger.info("Email subject: %s", subject)
+            logger.info("Email date: %s", date)
 
             # Download CSV attachments
             csv_files = self.download_attachments(
                 msg,
                 output_dir=output_dir,
-                filename_pattern=r'\.csv$'  # Only CSV files
+                filename_pattern=CSV_FILENAME_RE,  # Only CSV files
+                filename_prefix=filename_prefix
             )
 
             if not csv_files:
@@ -299,7 +973,7 @@ class OutlookIMAPDownloader:
             return csv_files[0]
 
         except Exception as e:
-            logger.error(f"Error getting latest ticket email: {e}")
+            logger.error("Error getting latest ticket email: %s", e)
             return None
 
 
@@ -330,6 +1004,17 @@ def main():
         return
 
     try:
+        # --watch: keep running and download on every new email
+        if "--watch" in sys.argv:
+            logger.info("Watching for new emails (IMAP IDLE)...")
+            downloader.watch_ticket_emails(
+                lambda csv_file: logger.info("✓ Downloaded: %s", csv_file),
+                sender="mohammad.jarrar@jepco.com.jo",
+                subject_contains="Open tickets Summary",
+                output_dir="downloads"
+            )
+            return
+
         # Download latest ticket email
         csv_file = downloader.get_latest_ticket_email(
             sender="mohammad.jarrar@jepco.com.jo",
@@ -339,7 +1024,7 @@ def main():
 
         if csv_file:
             logger.info("="*70)
-            logger.info(f"SUCCESS! Downloaded: {csv_file}")
+            logger.info("SUCCESS! Downloaded: %s", csv_file)
             logger.info("="*70)
         else:
             logger.warning("No CSV file downloaded")
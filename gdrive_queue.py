@@ -8,6 +8,10 @@ Uses Google Drive as a message queue between cloud bot and work computer.
 - Work computer writes results back to Drive
 - Cloud bot reads results and sends to Telegram
 
+The Drive API description comes from the copy bundled with
+google-api-python-client 2.x (static_discovery=True), so startup makes
+no discovery request.
+
 Author: Mohammad Khair AbuShanab
 Created: January 28, 2026
 """
@@ -15,21 +19,83 @@ Created: January 28, 2026
 import os
 import json
 import time
-from datetime import datetime
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import logging
 
 try:
     from google.oauth2 import service_account
     from googleapiclient.discovery import build
-    from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
-    import io
+    from googleapiclient.http import MediaInMemoryUpload
+    from google_auth_httplib2 import AuthorizedHttp
+    import httplib2
 except ImportError:
     print("ERROR: Google API libraries not installed!")
     print("Install: pip install google-auth google-auth-oauthlib google-api-python-client")
 
+# Faster JSON for queue files when available (stdlib json otherwise)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Drive accepts at most 100 calls per batch request
+BATCH_SIZE = 100
+
+# Socket timeout (seconds) for Drive API calls
+HTTP_TIMEOUT = 30
+
+# Queue files downloaded/uploaded in parallel (each worker has its own connection)
+TRANSFER_WORKERS = 8
+
+# Files per files().list page (Drive maximum)
+LIST_PAGE_SIZE = 1000
+
+# Drive limit for one appProperties key + value (UTF-8 bytes)
+APP_PROPERTY_MAX_BYTES = 124
+
+# Retries for reads on rate limits / 5xx errors (googleapiclient backs off
+# exponentially). Creates are sent once: a create that succeeded but whose
+# response was lost would otherwise write the same file twice
+MAX_RETRIES = 5
+
+# Folder IDs remembered across restarts (one file per service account)
+FOLDER_CACHE_DIR = Path.home() / ".cache" / "telegram-bot"
+
+
+def _dump_json(data):
+    """
+    Serialize a queue file payload.
+
+    Args:
+        data: JSON-serializable dict
+
+    Returns:
+        bytes: Indented UTF-8 JSON
+    """
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def _load_json(raw):
+    """
+    Parse a downloaded queue file.
+
+    Args:
+        raw: UTF-8 JSON bytes
+
+    Returns:
+        dict: Parsed payload
+    """
+    if orjson:
+        return orjson.loads(raw)
+    return json.loads(raw.decode('utf-8'))
+
 
 class GoogleDriveQueue:
     """
@@ -48,16 +114,36 @@ class GoogleDriveQueue:
             results_folder_id: Optional results folder ID (use existing instead of creating)
         """
         self.service = None
+        self.http = None
+        self.credentials = None
         self.queue_folder_id = parent_folder_id  # Use provided folder or create new
         self.commands_folder_id = commands_folder_id
         self.results_folder_id = results_folder_id
 
+        # Cached results folder contents + Drive changes cursor; the cache
+        # holds every result, or only one command's (_results_scope)
+        self._results_cache = []
+        self._results_page_token = None
+        self._results_scope = None
+
+        # Pending commands kept up to date from the Drive changes feed
+        self._commands_cache = []
+        self._commands_page_token = None
+
+        # Transfer workers + their per-thread Drive services (created on first use)
+        self._executor = None
+        self._local = threading.local()
+
         # Initialize Google Drive service
         self._init_service(credentials_json)
 
         # Create/verify queue folders
         self._init_folders()
 
+        # Folder listing queries never change once the folders are known
+        self._commands_query = f"'{self.commands_folder_id}' in parents and trashed=false"
+        self._results_query = f"'{self.results_folder_id}' in parents and trashed=false"
+
     def _init_service(self, credentials_json):
         """Initialize Google Drive service with credentials."""
         try:
@@ -91,8 +177,8 @@ class GoogleDriveQueue:
                 try:
                     creds_dict = json.loads(creds_json)
                 except json.JSONDecodeError as e:
-                    logger.error(f"JSON decode error: {e}")
-                    logger.error(f"First 100 chars of JSON: {creds_json[:100]}")
+                    logger.error("JSON decode error: %s", e)
+                    logger.error("First 100 chars of JSON: %s", creds_json[:100])
                     raise Exception(f"Invalid JSON in GOOGLE_CREDENTIALS_JSON: {e}")
 
                 credentials = service_account.Credentials.from_service_account_info(
@@ -100,22 +186,32 @@ class GoogleDriveQueue:
                     scopes=['https://www.googleapis.com/auth/drive']
                 )
 
-            self.service = build('drive', 'v3', credentials=credentials)
+            self.credentials = credentials
+            self.http, self.service = self._build_service()
+            self._local.service = self.service
             logger.info("✓ Google Drive service initialized")
 
         except Exception as e:
-            logger.error(f"Failed to initialize Google Drive: {e}")
+            logger.error("Failed to initialize Google Drive: %s", e)
             raise
 
     def _init_folders(self):
         """Create queue folder structure in Google Drive."""
         try:
+            # Reuse the folders found on a previous run (skips up to 3 lookups)
+            if not (self.queue_folder_id or self.commands_folder_id or self.results_folder_id):
+                if self._load_folder_cache():
+                    logger.info("✓ Queue folders loaded from cache")
+                    logger.info("  - Commands: %s", self.commands_folder_id)
+                    logger.info("  - Results: %s", self.results_folder_id)
+                    return
+
             # Use existing queue folder or create new one
             if not self.queue_folder_id:
                 logger.info("Creating new queue folder...")
                 self.queue_folder_id = self._get_or_create_folder("TelegramBotQueue")
             else:
-                logger.info(f"Using existing queue folder: {self.queue_folder_id}")
+                logger.info("Using existing queue folder: %s", self.queue_folder_id)
 
             # Use existing subfolders or create new ones
             if not self.commands_folder_id:
@@ -125,7 +221,7 @@ class GoogleDriveQueue:
                     parent_id=self.queue_folder_id
                 )
             else:
-                logger.info(f"Using existing commands folder: {self.commands_folder_id}")
+                logger.info("Using existing commands folder: %s", self.commands_folder_id)
 
             if not self.results_folder_id:
                 logger.info("Creating results folder...")
@@ -134,16 +230,81 @@ class GoogleDriveQueue:
                     parent_id=self.queue_folder_id
                 )
             else:
-                logger.info(f"Using existing results folder: {self.results_folder_id}")
+                logger.info("Using existing results folder: %s", self.results_folder_id)
 
-            logger.info(f"✓ Queue folders ready")
-            logger.info(f"  - Commands: {self.commands_folder_id}")
-            logger.info(f"  - Results: {self.results_folder_id}")
+            logger.info("✓ Queue folders ready")
+            logger.info("  - Commands: %s", self.commands_folder_id)
+            logger.info("  - Results: %s", self.results_folder_id)
+
+            self._save_folder_cache()
 
         except Exception as e:
-            logger.error(f"Failed to setup queue folders: {e}")
+            logger.error("Failed to setup queue folders: %s", e)
             raise
 
+    def _folder_cache_path(self):
+        """
+        Get the folder cache file for this service account.
+
+        Returns:
+            Path: Cache file path
+        """
+        account = getattr(self.credentials, 'service_account_email', None) or "default"
+        return FOLDER_CACHE_DIR / f"queue_ids_{account}.json"
+
+    def _load_folder_cache(self):
+        """
+        Load cached folder IDs and check they still exist (one batch request).
+
+        Returns:
+            bool: True if all three folder IDs were loaded and verified
+        """
+        try:
+            with open(self._folder_cache_path()) as f:
+                cached = json.load(f)
+
+            folder_ids = [cached['queue_folder_id'], cached['commands_folder_id'], cached['results_folder_id']]
+        except (OSError, ValueError, KeyError):
+            return False
+
+        missing = []
+
+        def on_get(request_id, response, exception):
+            if exception is not None or response.get('trashed'):
+                missing.append(request_id)
+
+        batch = self.service.new_batch_http_request(callback=on_get)
+        for folder_id in folder_ids:
+            batch.add(self.service.files().get(fileId=folder_id, fields='id, trashed'), request_id=folder_id)
+
+        try:
+            batch.execute()
+        except Exception as e:
+            logger.warning("Could not verify cached queue folders: %s", e)
+            return False
+
+        if missing:
+            logger.info("Cached queue folders are gone, looking them up again...")
+            return False
+
+        self.queue_folder_id, self.commands_folder_id, self.results_folder_id = folder_ids
+        return True
+
+    def _save_folder_cache(self):
+        """Remember the folder IDs for the next start (best effort)."""
+        try:
+            cache_path = self._folder_cache_path()
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+            with open(cache_path, 'w') as f:
+                json.dump({
+                    'queue_folder_id': self.queue_folder_id,
+                    'commands_folder_id': self.commands_folder_id,
+                    'results_folder_id': self.results_folder_id
+                }, f)
+        except OSError as e:
+            logger.warning("Could not save queue folder cache: %s", e)
+
     def _get_or_create_folder(self, folder_name, parent_id=None):
         """
         Get existing folder or create new one.
@@ -161,11 +322,13 @@ class GoogleDriveQueue:
             if parent_id:
                 query += f" and '{parent_id}' in parents"
 
+            # Only the first match is used
             results = self.service.files().list(
                 q=query,
                 spaces='drive',
+                pageSize=1,
                 fields='files(id, name)'
-            ).execute()
+            ).execute(num_retries=MAX_RETRIES)
 
             files = results.get('files', [])
 
@@ -186,11 +349,11 @@ class GoogleDriveQueue:
                     fields='id'
                 ).execute()
 
-                logger.info(f"✓ Created folder: {folder_name}")
+                logger.info("✓ Created folder: %s", folder_name)
                 return folder.get('id')
 
         except Exception as e:
-            logger.error(f"Error with folder {folder_name}: {e}")
+            logger.error("Error with folder %s: %s", folder_name, e)
             raise
 
     def write_command(self, command_type, data=None):
@@ -205,8 +368,9 @@ class GoogleDriveQueue:
             str: Command ID (filename)
         """
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            command_id = f"{command_type}_{timestamp}"
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            # Random suffix - commands written in the same second get distinct IDs
+            command_id = f"{command_type}_{timestamp}_{uuid.uuid4().hex[:8]}"
             filename = f"{command_id}.json"
 
             command_data = {
@@ -215,87 +379,168 @@ class GoogleDriveQueue:
                 "data": data or {}
             }
 
-            # Write to temp file
-            temp_file = Path(f"/tmp/{filename}")
-            with open(temp_file, 'w') as f:
-                json.dump(command_data, f, indent=2)
-
             # Upload to Google Drive
             file_metadata = {
                 'name': filename,
-                'parents': [self.commands_folder_id]
+                'parents': [self.commands_folder_id],
+                # Small commands travel in the listing itself (no download)
+                'appProperties': self._command_properties(command_data)
             }
 
-            media = MediaFileUpload(str(temp_file), mimetype='application/json')
+            # Upload straight from memory - no temp file
+            media = MediaInMemoryUpload(
+                _dump_json(command_data),
+                mimetype='application/json'
+            )
 
-            file = self.service.files().create(
+            file = self._thread_service().files().create(
                 body=file_metadata,
                 media_body=media,
                 fields='id'
             ).execute()
 
-            # Clean up temp file
-            temp_file.unlink()
-
-            logger.info(f"✓ Command written: {command_id}")
+            logger.info("✓ Command written: %s", command_id)
             return command_id
 
         except Exception as e:
-            logger.error(f"Failed to write command: {e}")
+            logger.error("Failed to write command: %s", e)
             return None
 
+    @staticmethod
+    def _command_properties(command_data):
+        """
+        Pack a command into Drive appProperties.
+
+        Args:
+            command_data: Command payload written to the file
+
+        Returns:
+            dict: appProperties - 'overflow' is set when the data doesn't fit
+        """
+        properties = {
+            'cmd': command_data['command'],
+            'ts': command_data['timestamp']
+        }
+
+        data = json.dumps(command_data['data'], separators=(',', ':'))
+        if len('data') + len(data.encode('utf-8')) <= APP_PROPERTY_MAX_BYTES:
+            properties['data'] = data
+        else:
+            properties['overflow'] = '1'
+
+        return properties
+
+    def _read_commands(self, files):
+        """
+        Build commands from their appProperties, downloading only the rest.
+
+        Args:
+            files: Drive file dicts with 'id', 'name' and 'appProperties'
+
+        Returns:
+            list: Command dictionaries, in file order
+        """
+        to_download = [
+            file for file in files
+            if 'data' not in (file.get('appProperties') or {})
+        ]
+        downloaded = {c['file_id']: c for c in self._fetch_files_json(to_download)}
+
+        commands = []
+        for file in files:
+            properties = file.get('appProperties') or {}
+
+            if 'data' in properties:
+                commands.append({
+                    'command': properties['cmd'],
+                    'timestamp': properties['ts'],
+                    'data': json.loads(properties['data']),
+                    'file_id': file['id'],
+                    'filename': file['name']
+                })
+            elif file['id'] in downloaded:
+                commands.append(downloaded[file['id']])
+
+        return commands
+
     def check_commands(self):
         """
         Check for pending commands in the queue.
 
+        The commands folder is listed once; after that only the Drive
+        changes feed is read and new command files are downloaded.
+
         Returns:
             list: List of command dictionaries
         """
         try:
-            # List files in commands folder
-            query = f"'{self.commands_folder_id}' in parents and trashed=false"
+            if self._commands_page_token:
+                self.poll_new_commands()
+            else:
+                self._fetch_commands()
 
-            results = self.service.files().list(
-                q=query,
-                spaces='drive',
-                fields='files(id, name)',
-                orderBy='createdTime'
-            ).execute()
+            return list(self._commands_cache)
 
-            files = results.get('files', [])
+        except Exception as e:
+            logger.error("Failed to check commands: %s", e)
+            self._commands_page_token = None
+            return []
 
-            if not files:
-                return []
+    def _fetch_commands(self):
+        """
+        List and download all command files, refreshing the cache.
 
-            commands = []
-            for file in files:
-                try:
-                    # Download file content
-                    request = self.service.files().get_media(fileId=file['id'])
-                    fh = io.BytesIO()
-                    downloader = MediaIoBaseDownload(fh, request)
+        Returns:
+            list: List of command dictionaries
+        """
+        # Take the changes cursor BEFORE listing so no change is missed
+        page_token = self.service.changes().getStartPageToken().execute(num_retries=MAX_RETRIES)['startPageToken']
 
-                    done = False
-                    while not done:
-                        status, done = downloader.next_chunk()
+        # List files in commands folder
+        files = self._list_folder(self._commands_query)
 
-                    # Parse JSON
-                    fh.seek(0)
-                    command_data = json.loads(fh.read().decode('utf-8'))
-                    command_data['file_id'] = file['id']
-                    command_data['filename'] = file['name']
+        self._commands_cache = self._read_commands(files)
+        self._commands_page_token = page_token
 
-                    commands.append(command_data)
+        return self._commands_cache
 
-                except Exception as e:
-                    logger.error(f"Error reading command file {file['name']}: {e}")
+    def poll_new_commands(self):
+        """
+        Apply Drive changes since the last check to the pending commands.
 
-            return commands
+        Only files added to the commands folder are downloaded; removed,
+        trashed or moved files are dropped from the cache.
 
-        except Exception as e:
-            logger.error(f"Failed to check commands: {e}")
+        Returns:
+            list: Commands that arrived since the last check
+        """
+        changes, self._commands_page_token = self._list_changes(self._commands_page_token)
+
+        changed_ids = set()
+        new_files = {}
+
+        for change in changes:
+            file_id = change.get('fileId')
+            file = change.get('file') or {}
+            changed_ids.add(file_id)
+
+            if (not change.get('removed') and not file.get('trashed')
+                    and self.commands_folder_id in file.get('parents', [])):
+                new_files[file_id] = {'id': file_id, 'name': file.get('name'),
+                                      'appProperties': file.get('appProperties')}
+            else:
+                new_files.pop(file_id, None)
+
+        if not changed_ids:
             return []
 
+        new_commands = self._read_commands(list(new_files.values()))
+
+        self._commands_cache = [c for c in self._commands_cache if c['file_id'] not in changed_ids]
+        self._commands_cache.extend(new_commands)
+
+        return new_commands
+
     def delete_command(self, file_id):
         """
         Delete a command file after processing.
@@ -303,11 +548,39 @@ class GoogleDriveQueue:
         Args:
             file_id: Google Drive file ID
         """
-        try:
-            self.service.files().delete(fileId=file_id).execute()
-            logger.info(f"✓ Command deleted: {file_id}")
-        except Exception as e:
-            logger.error(f"Failed to delete command {file_id}: {e}")
+        self.delete_commands([file_id])
+
+    def delete_commands(self, file_ids):
+        """
+        Delete several command files using batched HTTP requests.
+
+        Args:
+            file_ids: Google Drive file IDs
+
+        Returns:
+            list: File IDs that were deleted
+        """
+        deleted = self._delete_files_batch(file_ids)
+
+        if deleted:
+            # Drop from cache right away (the changes feed would catch it later)
+            deleted_ids = set(deleted)
+            self._commands_cache = [c for c in self._commands_cache if c['file_id'] not in deleted_ids]
+            logger.info("✓ Commands deleted: %s", len(deleted))
+
+        return deleted
+
+    def write_commands(self, commands):
+        """
+        Write several commands, uploading them in parallel.
+
+        Args:
+            commands: List of (command_type, data) tuples
+
+        Returns:
+            list: Command IDs in input order (None where the write failed)
+        """
+        return list(self._transfer_pool().map(lambda command: self.write_command(*command), commands))
 
     def write_result(self, command_id, success, message, data=None):
         """
@@ -323,8 +596,8 @@ class GoogleDriveQueue:
             str: Result ID
         """
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            result_id = f"RESULT_{command_id}_{timestamp}"
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            result_id = f"RESULT_{command_id}_{timestamp}_{uuid.uuid4().hex[:8]}"
             filename = f"{result_id}.json"
 
             result_data = {
@@ -335,94 +608,310 @@ class GoogleDriveQueue:
                 "data": data or {}
             }
 
-            # Write to temp file
-            temp_file = Path(f"/tmp/{filename}")
-            with open(temp_file, 'w') as f:
-                json.dump(result_data, f, indent=2)
-
             # Upload to Google Drive
             file_metadata = {
                 'name': filename,
-                'parents': [self.results_folder_id]
+                'parents': [self.results_folder_id],
+                # Lets check_results(command_id) filter on the server
+                'appProperties': {'command_id': command_id}
             }
 
-            media = MediaFileUpload(str(temp_file), mimetype='application/json')
+            # Upload straight from memory - no temp file
+            media = MediaInMemoryUpload(
+                _dump_json(result_data),
+                mimetype='application/json'
+            )
 
-            file = self.service.files().create(
+            file = self._thread_service().files().create(
                 body=file_metadata,
                 media_body=media,
                 fields='id'
             ).execute()
 
-            # Clean up temp file
-            temp_file.unlink()
-
-            logger.info(f"✓ Result written: {result_id}")
+            logger.info("✓ Result written: %s", result_id)
             return result_id
 
         except Exception as e:
-            logger.error(f"Failed to write result: {e}")
+            logger.error("Failed to write result: %s", e)
             return None
 
-    def check_results(self, command_id=None):
+    def write_results(self, results):
         """
-        Check for results in the queue.
+        Write several results, uploading them in parallel.
 
         Args:
-            command_id: Optional - filter for specific command
+            results: List of (command_id, success, message, data) tuples
 
         Returns:
-            list: List of result dictionaries
+            list: Result IDs in input order (None where the write failed)
         """
-        try:
-            # List files in results folder
-            query = f"'{self.results_folder_id}' in parents and trashed=false"
+        return list(self._transfer_pool().map(lambda result: self.write_result(*result), results))
 
-            results = self.service.files().list(
+    def _list_folder(self, query):
+        """
+        List every file matching a query, oldest first, following all pages.
+
+        Args:
+            query: Drive files.list query
+
+        Returns:
+            list: File dicts with 'id', 'name' and 'appProperties'
+        """
+        files = []
+        page_token = None
+
+        while True:
+            response = self.service.files().list(
                 q=query,
                 spaces='drive',
-                fields='files(id, name)',
+                pageSize=LIST_PAGE_SIZE,
+                pageToken=page_token,
+                fields='nextPageToken, files(id, name, appProperties)',
                 orderBy='createdTime'
-            ).execute()
+            ).execute(num_retries=MAX_RETRIES)
 
-            files = results.get('files', [])
+            files.extend(response.get('files', []))
 
-            if not files:
-                return []
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return files
 
-            results_list = []
-            for file in files:
-                try:
-                    # Download file content
-                    request = self.service.files().get_media(fileId=file['id'])
-                    fh = io.BytesIO()
-                    downloader = MediaIoBaseDownload(fh, request)
+    def _list_changes(self, page_token):
+        """
+        List all Drive changes since a page token.
+
+        Args:
+            page_token: Token from getStartPageToken or a previous call
+
+        Returns:
+            tuple: (list of changes, token to use for the next call)
+        """
+        changes = []
+
+        while True:
+            response = self.service.changes().list(
+                pageToken=page_token,
+                spaces='drive',
+                includeRemoved=True,
+                fields='nextPageToken, newStartPageToken, changes(fileId, removed, file(name, parents, trashed, appProperties))'
+            ).execute(num_retries=MAX_RETRIES)
+
+            changes.extend(response.get('changes', []))
+
+            if 'newStartPageToken' in response:
+                return changes, response['newStartPageToken']
+
+            page_token = response['nextPageToken']
+
+    def _results_changed(self):
+        """
+        Check whether the results folder changed since the last listing.
+
+        Returns:
+            bool: True if the cached results are stale
+        """
+        changes, self._results_page_token = self._list_changes(self._results_page_token)
+
+        cached_ids = {result['file_id'] for result in self._results_cache}
+
+        for change in changes:
+            if change.get('fileId') in cached_ids:
+                return True
+            if self.results_folder_id in change.get('file', {}).get('parents', []):
+                return True
+
+        return False
+
+    def check_results(self, command_id=None):
+        """
+        Check for results in the queue.
 
-                    done = False
-                    while not done:
-                        status, done = downloader.next_chunk()
+        Uses the Drive changes feed so that, when nothing in the results
+        folder changed, the cached list is returned without listing or
+        downloading any files. Otherwise, with a command_id, only that
+        command's result files are listed and downloaded (and cached for
+        the next check of the same command).
 
-                    # Parse JSON
-                    fh.seek(0)
-                    result_data = json.loads(fh.read().decode('utf-8'))
-                    result_data['file_id'] = file['id']
-                    result_data['filename'] = file['name']
+        Args:
+            command_id: Optional - filter for specific command
 
-                    # Filter by command_id if specified
-                    if command_id and result_data.get('command_id') != command_id:
-                        continue
+        Returns:
+            list: List of result dictionaries
+        """
+        try:
+            # A cache of one command's results can't answer other queries
+            in_scope = self._results_scope is None or self._results_scope == command_id
 
-                    results_list.append(result_data)
+            if self._results_page_token and in_scope and not self._results_changed():
+                results_list = self._results_cache
+            elif command_id:
+                results_list = self._fetch_command_results(command_id)
+            else:
+                results_list = self._fetch_results()
 
-                except Exception as e:
-                    logger.error(f"Error reading result file {file['name']}: {e}")
+            # Filter by command_id if specified
+            if command_id:
+                return [r for r in results_list if r.get('command_id') == command_id]
 
-            return results_list
+            return list(results_list)
 
         except Exception as e:
-            logger.error(f"Failed to check results: {e}")
+            logger.error("Failed to check results: %s", e)
+            self._results_page_token = None
             return []
 
+    def _fetch_command_results(self, command_id):
+        """
+        List and download only the result files for one command, caching them.
+
+        Args:
+            command_id: Command ID the results belong to
+
+        Returns:
+            list: List of result dictionaries
+        """
+        # Take the changes cursor BEFORE listing so no change is missed
+        page_token = self.service.changes().getStartPageToken().execute(num_retries=MAX_RETRIES)['startPageToken']
+
+        # Tagged at upload; the name match covers files written before tagging
+        name_prefix = f"RESULT_{command_id}_"
+        files = self._list_folder(
+            f"{self._results_query}"
+            f" and (appProperties has {{ key='command_id' and value='{command_id}' }}"
+            f" or name contains '{name_prefix}')"
+        )
+
+        # "name contains" matches loosely - check before downloading, not after
+        files = [
+            file for file in files
+            if (file.get('appProperties') or {}).get('command_id') == command_id
+            or file['name'].startswith(name_prefix)
+        ]
+
+        results_list = self._fetch_files_json(files)
+
+        self._results_cache = results_list
+        self._results_page_token = page_token
+        self._results_scope = command_id
+
+        return results_list
+
+    def _fetch_results(self):
+        """
+        List and download all result files, refreshing the cache.
+
+        Returns:
+            list: List of result dictionaries
+        """
+        # Take the changes cursor BEFORE listing so no change is missed
+        page_token = self.service.changes().getStartPageToken().execute(num_retries=MAX_RETRIES)['startPageToken']
+
+        # List files in results folder
+        files = self._list_folder(self._results_query)
+
+        results_list = self._fetch_files_json(files)
+
+        self._results_cache = results_list
+        self._results_page_token = page_token
+        self._results_scope = None
+
+        return results_list
+
+    def _thread_service(self):
+        """
+        Get the Drive service for the current thread.
+
+        httplib2 connections aren't thread-safe, so each transfer worker
+        builds its own service once and keeps it (the thread that created
+        the queue uses self.service).
+
+        Returns:
+            Resource: Drive v3 service
+        """
+        service = getattr(self._local, 'service', None)
+
+        if service is None:
+            _, service = self._build_service()
+            self._local.service = service
+
+        return service
+
+    def _build_service(self):
+        """
+        Build a Drive service on its own persistent authorized connection.
+
+        Every API call made through the service reuses one keep-alive
+        connection, so the TLS handshake and token lookup happen once. The
+        bundled static discovery doc is used, so discovery is never fetched or cached.
+
+        Returns:
+            tuple: (AuthorizedHttp, Drive v3 service)
+        """
+        http = AuthorizedHttp(self.credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+        return http, build('drive', 'v3', http=http, cache_discovery=False, static_discovery=True)
+
+    def _fetch_file_json(self, file):
+        """
+        Download and parse one queue file.
+
+        Args:
+            file: Drive file dict with 'id' and 'name'
+
+        Returns:
+            dict: File content with file_id/filename added
+        """
+        # Queue files are tiny - one GET returns the whole body
+        content = self._thread_service().files().get_media(fileId=file['id']).execute(num_retries=MAX_RETRIES)
+
+        # Parse JSON
+        file_data = _load_json(content)
+        file_data['file_id'] = file['id']
+        file_data['filename'] = file['name']
+
+        return file_data
+
+    def _fetch_files_json(self, files):
+        """
+        Download and parse queue files in parallel, keeping their order.
+
+        Args:
+            files: Drive file dicts with 'id' and 'name'
+
+        Returns:
+            list: Parsed files (unreadable files are skipped)
+        """
+        errors = []
+
+        def fetch(file):
+            try:
+                return self._fetch_file_json(file)
+            except Exception as e:
+                errors.append(f"{file['name']} ({e})")
+                return None
+
+        files_data = [data for data in self._transfer_pool().map(fetch, files) if data is not None]
+
+        # One line per poll instead of one per file
+        if errors:
+            logger.warning("%s queue files could not be read: %s", len(errors), errors[:5])
+
+        return files_data
+
+    def _transfer_pool(self):
+        """
+        Get the worker pool for parallel uploads/downloads.
+
+        Returns:
+            ThreadPoolExecutor: Shared pool (created on first use)
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=TRANSFER_WORKERS,
+                thread_name_prefix="drive-transfer"
+            )
+
+        return self._executor
+
     def delete_result(self, file_id):
         """
         Delete a result file after processing.
@@ -430,11 +919,71 @@ class GoogleDriveQueue:
         Args:
             file_id: Google Drive file ID
         """
-        try:
-            self.service.files().delete(fileId=file_id).execute()
-            logger.info(f"✓ Result deleted: {file_id}")
-        except Exception as e:
-            logger.error(f"Failed to delete result {file_id}: {e}")
+        self.delete_results([file_id])
+
+    def delete_results(self, file_ids):
+        """
+        Delete several result files using batched HTTP requests.
+
+        Args:
+            file_ids: Google Drive file IDs
+
+        Returns:
+            list: File IDs that were deleted
+        """
+        deleted = self._delete_files_batch(file_ids)
+
+        if deleted:
+            # Drop from cache so our own delete doesn't force a re-list
+            deleted_ids = set(deleted)
+            self._results_cache = [r for r in self._results_cache if r['file_id'] not in deleted_ids]
+            logger.info("✓ Results deleted: %s", len(deleted))
+
+        return deleted
+
+    def _delete_files_batch(self, file_ids):
+        """
+        Delete files in batches of BATCH_SIZE (one HTTP round-trip per batch).
+
+        Args:
+            file_ids: Google Drive file IDs
+
+        Returns:
+            list: File IDs that were deleted
+        """
+        file_ids = list(file_ids)
+        deleted = []
+        failed = []
+
+        def on_delete(request_id, response, exception):
+            if exception is not None:
+                failed.append(request_id)
+            else:
+                deleted.append(request_id)
+
+        for start in range(0, len(file_ids), BATCH_SIZE):
+            batch_ids = file_ids[start:start + BATCH_SIZE]
+            batch = self.service.new_batch_http_request(callback=on_delete)
+
+            for file_id in batch_ids:
+                batch.add(self.service.files().delete(fileId=file_id), request_id=file_id)
+
+            try:
+                batch.execute()
+            except Exception as e:
+                logger.warning("Delete batch failed, retrying its files one by one: %s", e)
+                done = set(deleted) | set(failed)
+                failed.extend(file_id for file_id in batch_ids if file_id not in done)
+
+        # Deletes are safe to repeat - retry the failures individually
+        for file_id in failed:
+            try:
+                self.service.files().delete(fileId=file_id).execute(num_retries=MAX_RETRIES)
+                deleted.append(file_id)
+            except Exception as e:
+                logger.error("Failed to delete %s: %s", file_id, e)
+
+        return deleted
 
 
 def main():
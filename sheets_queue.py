@@ -14,20 +14,186 @@ Author: Mohammad Khair AbuShanab
 Created: January 29, 2026
 """
 
+import os
 import json
 import time
-from datetime import datetime
+import functools
+import threading
+import uuid
+import traceback
+from pathlib import Path
 import logging
 
 try:
     from google.oauth2 import service_account
     from googleapiclient.discovery import build
+    from google_auth_httplib2 import AuthorizedHttp
+    import httplib2
 except ImportError:
     print("ERROR: Google API libraries not installed!")
     print("Install: pip install google-auth google-auth-oauthlib google-api-python-client")
 
+# Faster JSON for the data column when available (stdlib json otherwise)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Seconds a /status read (batch_check) is reused before hitting Sheets again
+QUEUE_CACHE_TTL = 5
+
+# Socket timeout (seconds) for Sheets API calls
+HTTP_TIMEOUT = 30
+
+# Marker files for sheets whose tabs were already verified (skips the probe)
+# and the saved read cursors (restarts don't re-read processed rows)
+SHEET_CACHE_DIR = Path.home() / ".cache" / "telegram-bot"
+
+# Deferred results (defer=True) are sent together once this many are queued
+# or the oldest has waited WRITE_FLUSH_DELAY seconds
+WRITE_BATCH_SIZE = 64
+WRITE_FLUSH_DELAY = 0.2
+
+# compact() only deletes once at least this many processed rows piled up
+COMPACT_MIN_ROWS = 200
+
+# Timestamp column / id format (local time)
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# Success column values read as True - '1' is written now, the rest are
+# rows written before the switch (or hand-typed checkboxes; 1 also matches True)
+SUCCESS_VALUES = frozenset(('1', 1, 'True', 'true', 'TRUE'))
+
+# Header rows of the two queue tabs
+COMMANDS_HEADER = ['command_id', 'command', 'timestamp', 'data', 'status']
+RESULTS_HEADER = ['result_id', 'command_id', 'success', 'message', 'timestamp', 'data', 'status']
+
+
+def cached_ttl(seconds=QUEUE_CACHE_TTL):
+    """
+    Cache a GoogleSheetsQueue read method for a few seconds.
+
+    Results are keyed by method name + arguments and stored in the
+    instance's _cache; writes clear it via _invalidate_cache(). Only a
+    normal return is cached - use it on methods that raise on failure,
+    so an error is never served again from the cache.
+
+    Args:
+        seconds: How long a cached result stays valid
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            cached = self._cache.get(key)
+
+            if cached and time.monotonic() - cached[0] < seconds:
+                return cached[1]
+
+            value = method(self, *args, **kwargs)
+            self._cache[key] = (time.monotonic(), value)
+            return value
+        return wrapper
+    return decorator
+
+
+def _id_suffix():
+    """Short random hex suffix keeping ids written within the same second unique."""
+    return uuid.uuid4().hex[:8]
+
+
+def _dump_data(data):
+    """
+    Serialize a row's data column.
+
+    Args:
+        data: JSON-serializable dict
+
+    Returns:
+        str: Compact JSON
+    """
+    if orjson:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data)
+
+
+def _load_data(text):
+    """
+    Parse a row's data column.
+
+    Args:
+        text: JSON string from the sheet (may be empty)
+
+    Returns:
+        dict: Parsed data ({} for an empty cell)
+    """
+    if not text:
+        return {}
+    if orjson:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _row_data(values):
+    """
+    Build a row as Sheets RowData.
+
+    Args:
+        values: Cell strings (column names, queue row values)
+
+    Returns:
+        dict: RowData with one string cell per column
+    """
+    return {'values': [{'userEnteredValue': {'stringValue': value}} for value in values]}
+
+
+def _next_pending_row(rows, start_row, status_index):
+    """
+    Find where the next read of a queue tab has to start.
+
+    Rows are only ever appended and flipped from 'pending' to 'processed',
+    so everything above the first pending row never needs reading again.
+
+    Args:
+        rows: Values read from the tab, starting at start_row
+        start_row: Sheet row number of the first entry in rows
+        status_index: Index of the status column
+
+    Returns:
+        int: Row number of the first pending row (or the row after the last)
+    """
+    for i, row in enumerate(rows, start=start_row):
+        if len(row) > status_index and row[status_index] == 'pending':
+            return i
+
+    return start_row + len(rows)
+
+
+def _pending_runs(statuses, start_row):
+    """
+    Group the pending rows of a status column into contiguous runs.
+
+    Args:
+        statuses: Values of a single status column, starting at start_row
+        start_row: Sheet row number of the first entry in statuses
+
+    Returns:
+        list: (first row, last row) tuples, top to bottom
+    """
+    runs = []
+    for i, row in enumerate(statuses, start=start_row):
+        if not row or row[0] != 'pending':
+            continue
+
+        if runs and runs[-1][1] == i - 1:
+            runs[-1] = (runs[-1][0], i)
+        else:
+            runs.append((i, i))
+
+    return runs
+
 
 class GoogleSheetsQueue:
     """
@@ -43,25 +209,51 @@ class GoogleSheetsQueue:
         Initialize Google Sheets queue.
 
         Args:
-            credentials_json: Path to service account credentials JSON file
+            credentials_json: Path to service account credentials JSON file,
+                the JSON itself as a string, or an already parsed dict
             sheet_id: Google Sheets ID (will create new if not provided)
         """
         self.service = None
+        self.http = None
         self.sheet_id = sheet_id
 
+        # Recent read results: (method, args) -> (timestamp, value)
+        self._cache = {}
+
+        # First row of each tab that may still be pending - every row above
+        # it is processed, so reads start here instead of re-reading row 2
+        self._cmd_next_row = 2
+        self._result_next_row = 2
+
+        # Deferred rows per tab, sent by _flush_pending() in one batchUpdate
+        self._pending_writes = {'commands': [], 'results': []}
+        self._pending_since = None
+        self._write_lock = threading.Lock()
+
+        # Tab title -> sheetId (needed by appendCells), loaded on first flush
+        self._tab_ids = None
+
         # Initialize Google Sheets service
         self._init_service(credentials_json)
 
         # Setup sheet tabs
         self._init_sheets()
 
+        # Resume the read cursors from the last run
+        self._load_cursors()
+
     def _init_service(self, credentials_json):
         """Initialize Google Sheets service with credentials."""
         try:
-            import os
-
-            # Handle credentials from environment variable or file
-            if credentials_json and os.path.isfile(credentials_json):
+            # Handle credentials from a parsed dict, environment variable or file
+            if isinstance(credentials_json, dict):
+                # Already parsed by the caller
+                logger.info("Loading credentials from dict...")
+                credentials = service_account.Credentials.from_service_account_info(
+                    credentials_json,
+                    scopes=['https://www.googleapis.com/auth/spreadsheets']
+                )
+            elif credentials_json and os.path.isfile(credentials_json):
                 # Load from file
                 logger.info("Loading credentials from file...")
                 credentials = service_account.Credentials.from_service_account_file(
@@ -79,7 +271,10 @@ class GoogleSheetsQueue:
             else:
                 raise Exception("No Google credentials provided")
 
-            self.service = build('sheets', 'v4', credentials=credentials)
+            # One authorized keep-alive connection shared by every API call
+            # (and the bundled static discovery doc - no discovery fetch/cache)
+            self.http = AuthorizedHttp(credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+            self.service = build('sheets', 'v4', http=self.http, cache_discovery=False, static_discovery=True)
             logger.info("✓ Google Sheets service initialized")
 
         except Exception as e:
@@ -91,26 +286,37 @@ class GoogleSheetsQueue:
         try:
             if not self.sheet_id:
                 # Create new spreadsheet
+                # Tabs are created with their header rows already filled in
                 spreadsheet = {
                     'properties': {
                         'title': 'TelegramBotQueue'
                     },
                     'sheets': [
-                        {'properties': {'title': 'commands'}},
-                        {'properties': {'title': 'results'}}
+                        {
+                            'properties': {'title': 'commands'},
+                            'data': [{'startRow': 0, 'startColumn': 0, 'rowData': [_row_data(COMMANDS_HEADER)]}]
+                        },
+                        {
+                            'properties': {'title': 'results'},
+                            'data': [{'startRow': 0, 'startColumn': 0, 'rowData': [_row_data(RESULTS_HEADER)]}]
+                        }
                     ]
                 }
 
                 spreadsheet = self.service.spreadsheets().create(
                     body=spreadsheet,
-                    fields='spreadsheetId'
+                    fields='spreadsheetId,sheets.properties(sheetId,title)'
                 ).execute()
 
                 self.sheet_id = spreadsheet.get('spreadsheetId')
+                self._tab_ids = {
+                    sheet['properties']['title']: sheet['properties']['sheetId']
+                    for sheet in spreadsheet['sheets']
+                }
                 logger.info(f"✓ Created new queue sheet: {self.sheet_id}")
-
-                # Add headers
-                self._add_headers()
+            elif self._verified_marker().is_file():
+                # Tabs were verified on an earlier start
+                logger.info(f"Using existing queue sheet: {self.sheet_id} (verified)")
             else:
                 logger.info(f"Using existing queue sheet: {self.sheet_id}")
 
@@ -120,21 +326,33 @@ class GoogleSheetsQueue:
                 ).execute()
 
                 sheet_titles = [sheet['properties']['title'] for sheet in spreadsheet['sheets']]
+                self._tab_ids = {
+                    sheet['properties']['title']: sheet['properties']['sheetId']
+                    for sheet in spreadsheet['sheets']
+                }
+                next_sheet_id = max(sheet['properties']['sheetId'] for sheet in spreadsheet['sheets']) + 1
 
-                # Create missing tabs
+                # Create missing tabs and their header rows in one request
+                # (our own sheetId lets appendCells target the new tab)
                 requests = []
-                if 'commands' not in sheet_titles:
+                for title, header in (('commands', COMMANDS_HEADER), ('results', RESULTS_HEADER)):
+                    if title in sheet_titles:
+                        continue
+
                     requests.append({
                         'addSheet': {
-                            'properties': {'title': 'commands'}
+                            'properties': {'title': title, 'sheetId': next_sheet_id}
                         }
                     })
-                if 'results' not in sheet_titles:
                     requests.append({
-                        'addSheet': {
-                            'properties': {'title': 'results'}
+                        'appendCells': {
+                            'sheetId': next_sheet_id,
+                            'rows': [_row_data(header)],
+                            'fields': 'userEnteredValue'
                         }
                     })
+                    self._tab_ids[title] = next_sheet_id
+                    next_sheet_id += 1
 
                 if requests:
                     self.service.spreadsheets().batchUpdate(
@@ -142,7 +360,8 @@ class GoogleSheetsQueue:
                         body={'requests': requests}
                     ).execute()
                     logger.info("✓ Created missing tabs")
-                    self._add_headers()
+
+            self._mark_verified()
 
             logger.info("✓ Queue sheets ready")
             logger.info(f"  - Sheet ID: {self.sheet_id}")
@@ -152,31 +371,213 @@ class GoogleSheetsQueue:
             logger.error(f"Failed to setup queue sheets: {e}")
             raise
 
-    def _add_headers(self):
-        """Add headers to command and result tabs."""
+    def _verified_marker(self):
+        """Marker file recording that this sheet's tabs exist."""
+        return SHEET_CACHE_DIR / f"sheets_{self.sheet_id}.ok"
+
+    def _mark_verified(self):
+        """Remember that the tabs exist so the next start skips the check."""
+        try:
+            SHEET_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            self._verified_marker().touch()
+        except OSError as e:
+            logger.warning(f"Could not save sheet marker: {e}")
+
+    def _cursor_file(self):
+        """File holding this sheet's read cursors between runs."""
+        return SHEET_CACHE_DIR / f"sheets_{self.sheet_id}.cursor"
+
+    def _load_cursors(self):
+        """Restore the read cursors saved by an earlier run, if they still fit the tabs."""
+        try:
+            cursors = json.loads(self._cursor_file().read_text())
+            cmd_next_row = max(2, int(cursors['commands']))
+            result_next_row = max(2, int(cursors['results']))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable cursor file: {e}")
+            return
+
+        # A tab cleared or trimmed by hand since then ends above the cursor -
+        # rows appended there would never be read, so start over from row 2
         try:
-            # Commands header
-            commands_header = [['command_id', 'command', 'timestamp', 'data', 'status']]
-            self.service.spreadsheets().values().update(
+            response = self.service.spreadsheets().values().batchGet(
                 spreadsheetId=self.sheet_id,
-                range='commands!A1:E1',
-                valueInputOption='RAW',
-                body={'values': commands_header}
+                ranges=['commands!A2:A', 'results!A2:A'],
+                valueRenderOption='UNFORMATTED_VALUE'
             ).execute()
+            command_ids, result_ids = (r.get('values', []) for r in response.get('valueRanges', [{}, {}]))
+        except Exception as e:
+            logger.warning(f"Could not check saved cursors, reading from row 2: {e}")
+            return
+
+        self._cmd_next_row = cmd_next_row
+        self._result_next_row = result_next_row
+
+        if cmd_next_row > len(command_ids) + 2:
+            logger.warning(f"Commands tab ends above saved row {cmd_next_row}, reading from row 2")
+            cmd_next_row = 2
+        if result_next_row > len(result_ids) + 2:
+            logger.warning(f"Results tab ends above saved row {result_next_row}, reading from row 2")
+            result_next_row = 2
+
+        # Saves the reset so a later start can't pick the stale rows up again
+        self._set_cursors(cmd_next_row, result_next_row)
+        logger.info(f"Resuming at commands row {self._cmd_next_row}, results row {self._result_next_row}")
 
-            # Results header
-            results_header = [['result_id', 'command_id', 'success', 'message', 'timestamp', 'data', 'status']]
-            self.service.spreadsheets().values().update(
+    def _set_cursors(self, cmd_next_row=None, result_next_row=None):
+        """
+        Move the read cursors and save them if they changed.
+
+        Args:
+            cmd_next_row: New first possibly-pending row of the commands tab
+            result_next_row: New first possibly-pending row of the results tab
+        """
+        cmd_next_row = cmd_next_row or self._cmd_next_row
+        result_next_row = result_next_row or self._result_next_row
+
+        if (cmd_next_row, result_next_row) == (self._cmd_next_row, self._result_next_row):
+            return
+
+        self._cmd_next_row = cmd_next_row
+        self._result_next_row = result_next_row
+
+        try:
+            SHEET_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            self._cursor_file().write_text(json.dumps({
+                'commands': cmd_next_row,
+                'results': result_next_row
+            }))
+        except OSError as e:
+            logger.warning(f"Could not save read cursors: {e}")
+
+    def _invalidate_cache(self):
+        """Drop cached reads after this instance changes the queue."""
+        self._cache.clear()
+
+    def _load_tab_ids(self):
+        """Look up the sheetId of each tab (appendCells addresses tabs by id)."""
+        if self._tab_ids is None:
+            spreadsheet = self.service.spreadsheets().get(
                 spreadsheetId=self.sheet_id,
-                range='results!A1:G1',
-                valueInputOption='RAW',
-                body={'values': results_header}
+                fields='sheets.properties(sheetId,title)'
             ).execute()
 
-            logger.info("✓ Headers added to sheets")
+            self._tab_ids = {
+                sheet['properties']['title']: sheet['properties']['sheetId']
+                for sheet in spreadsheet['sheets']
+            }
 
-        except Exception as e:
-            logger.error(f"Failed to add headers: {e}")
+        return self._tab_ids
+
+    def _find_row(self, tab, item_id, start_row):
+        """
+        Find the row holding an id, reading only the id column.
+
+        Rows above the tab's cursor are already processed, so the search
+        starts there instead of row 2.
+
+        Args:
+            tab: "commands" or "results"
+            item_id: command_id / result_id (column A)
+            start_row: First row to search
+
+        Returns:
+            int: Row number, or None if the id is not there
+        """
+        result = self.service.spreadsheets().values().get(
+            spreadsheetId=self.sheet_id,
+            range=f'{tab}!A{start_row}:A',
+            valueRenderOption='UNFORMATTED_VALUE'
+        ).execute()
+
+        for i, row in enumerate(result.get('values', []), start=start_row):
+            if row and row[0] == item_id:
+                return i
+
+        return None
+
+    def _defer_write(self, tab, row):
+        """
+        Queue a row for the next batched append.
+
+        Flushes right away once WRITE_BATCH_SIZE rows are waiting or the
+        oldest one has waited WRITE_FLUSH_DELAY seconds.
+
+        Args:
+            tab: "commands" or "results"
+            row: Cell values for the new row
+        """
+        with self._write_lock:
+            self._pending_writes[tab].append(row)
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+
+            queued = sum(len(rows) for rows in self._pending_writes.values())
+            due = time.monotonic() - self._pending_since >= WRITE_FLUSH_DELAY
+
+        if queued >= WRITE_BATCH_SIZE or due:
+            self.flush_pending()
+
+    def _append_rows(self, rows_by_tab):
+        """
+        Append rows to the queue tabs with one spreadsheets.batchUpdate.
+
+        appendCells sends typed string cells, so Sheets stores them as-is
+        without running its input parser.
+
+        Args:
+            rows_by_tab: {"commands": [row, ...], "results": [row, ...]}
+        """
+        tab_ids = self._load_tab_ids()
+        requests = [
+            {
+                'appendCells': {
+                    'sheetId': tab_ids[tab],
+                    'rows': [_row_data(row) for row in rows],
+                    'fields': 'userEnteredValue'
+                }
+            }
+            for tab, rows in rows_by_tab.items() if rows
+        ]
+
+        self.service.spreadsheets().batchUpdate(
+            spreadsheetId=self.sheet_id,
+            body={'requests': requests}
+        ).execute()
+
+    def flush_pending(self):
+        """
+        Append every deferred row with a single spreadsheets.batchUpdate.
+
+        Called before each read/delete so this instance always sees its own
+        writes; call it on shutdown so nothing queued is lost. Rows that
+        fail to send stay queued for the next flush.
+
+        Returns:
+            int: Number of rows written, or None if the append failed
+        """
+        with self._write_lock:
+            if self._pending_since is None:
+                return 0
+
+            pending = self._pending_writes
+
+            try:
+                self._append_rows(pending)
+            except Exception as e:
+                count = sum(len(rows) for rows in pending.values())
+                logger.error(f"Failed to flush {count} deferred rows (kept for retry): {e}")
+                return None
+
+            self._pending_writes = {'commands': [], 'results': []}
+            self._pending_since = None
+
+            self._invalidate_cache()
+            count = sum(len(rows) for rows in pending.values())
+            logger.info(f"✓ {count} deferred rows written")
+            return count
 
     def write_command(self, command_type, data=None):
         """
@@ -190,11 +591,11 @@ class GoogleSheetsQueue:
             str: Command ID
         """
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            command_id = f"{command_type}_{timestamp}"
+            timestamp = time.strftime(TIMESTAMP_FORMAT)
+            command_id = f"{command_type}_{timestamp}_{_id_suffix()}"
 
             # Prepare row data
-            data_json = json.dumps(data or {})
+            data_json = _dump_data(data or {})
             row = [
                 command_id,
                 command_type,
@@ -204,20 +605,14 @@ class GoogleSheetsQueue:
             ]
 
             # Append to commands sheet
-            self.service.spreadsheets().values().append(
-                spreadsheetId=self.sheet_id,
-                range='commands!A:E',
-                valueInputOption='RAW',
-                insertDataOption='INSERT_ROWS',
-                body={'values': [row]}
-            ).execute()
+            self._append_rows({'commands': [row]})
 
+            self._invalidate_cache()
             logger.info(f"✓ Command written: {command_id}")
             return command_id
 
         except Exception as e:
             logger.error(f"Failed to write command: {e}")
-            import traceback
             logger.error(traceback.format_exc())
             return None
 
@@ -228,39 +623,34 @@ class GoogleSheetsQueue:
         Returns:
             list: List of command dictionaries
         """
+        self.flush_pending()
+
         try:
-            # Read all commands
+            # Only the status column, from the first row that may still be pending
+            start_row = self._cmd_next_row
             result = self.service.spreadsheets().values().get(
                 spreadsheetId=self.sheet_id,
-                range='commands!A2:E'  # Skip header
+                range=f'commands!E{start_row}:E',
+                valueRenderOption='UNFORMATTED_VALUE'
             ).execute()
 
-            rows = result.get('values', [])
+            statuses = result.get('values', [])
+            self._set_cursors(cmd_next_row=_next_pending_row(statuses, start_row, 0))
 
-            if not rows:
+            runs = _pending_runs(statuses, start_row)
+            if not runs:
                 return []
 
+            # Full rows (with the data blobs) only for the pending ones
+            response = self.service.spreadsheets().values().batchGet(
+                spreadsheetId=self.sheet_id,
+                ranges=[f'commands!A{first}:E{last}' for first, last in runs],
+                valueRenderOption='UNFORMATTED_VALUE'
+            ).execute()
+
             commands = []
-            for i, row in enumerate(rows, start=2):  # Start from row 2 (after header)
-                # Skip if not enough columns or already processed
-                if len(row) < 5:
-                    continue
-
-                if row[4] != 'pending':  # status column
-                    continue
-
-                try:
-                    command_data = {
-                        'command_id': row[0],
-                        'command': row[1],
-                        'timestamp': row[2],
-                        'data': json.loads(row[3]) if row[3] else {},
-                        'status': row[4],
-                        'row_number': i  # Store row number for deletion
-                    }
-                    commands.append(command_data)
-                except Exception as e:
-                    logger.error(f"Error parsing command row {i}: {e}")
+            for (first, _), value_range in zip(runs, response.get('valueRanges', [])):
+                commands.extend(self._parse_commands(value_range.get('values', []), first))
 
             return commands
 
@@ -268,6 +658,41 @@ class GoogleSheetsQueue:
             logger.error(f"Failed to check commands: {e}")
             return []
 
+    def _parse_commands(self, rows, start_row=2):
+        """
+        Parse pending command rows from the commands tab.
+
+        Args:
+            rows: Values of commands!A{start_row}:E
+            start_row: Sheet row number of the first entry in rows
+
+        Returns:
+            list: List of command dictionaries
+        """
+        commands = []
+        for i, row in enumerate(rows, start=start_row):
+            # Skip if not enough columns or already processed
+            if len(row) < 5:
+                continue
+
+            if row[4] != 'pending':  # status column
+                continue
+
+            try:
+                command_data = {
+                    'command_id': row[0],
+                    'command': row[1],
+                    'timestamp': row[2],
+                    'data': _load_data(row[3]),
+                    'status': row[4],
+                    'row_number': i  # Store row number for deletion
+                }
+                commands.append(command_data)
+            except Exception as e:
+                logger.error(f"Error parsing command row {i}: {e}")
+
+        return commands
+
     def delete_command(self, command_id=None, row_number=None):
         """
         Mark a command as processed (delete from queue).
@@ -276,6 +701,9 @@ class GoogleSheetsQueue:
             command_id: Command ID (used if row_number not provided)
             row_number: Row number in sheet (preferred)
         """
+        self.flush_pending()
+        self._invalidate_cache()
+
         try:
             if row_number:
                 # Mark as processed in the status column
@@ -288,29 +716,57 @@ class GoogleSheetsQueue:
                 logger.info(f"✓ Command marked as processed (row {row_number})")
             else:
                 # Find row by command_id and mark as processed
-                result = self.service.spreadsheets().values().get(
-                    spreadsheetId=self.sheet_id,
-                    range='commands!A2:E'
-                ).execute()
-
-                rows = result.get('values', [])
-                for i, row in enumerate(rows, start=2):
-                    if len(row) > 0 and row[0] == command_id:
-                        self.service.spreadsheets().values().update(
-                            spreadsheetId=self.sheet_id,
-                            range=f'commands!E{i}',
-                            valueInputOption='RAW',
-                            body={'values': [['processed']]}
-                        ).execute()
-                        logger.info(f"✓ Command {command_id} marked as processed")
-                        return
+                row_number = self._find_row('commands', command_id, self._cmd_next_row)
+                if row_number:
+                    self.service.spreadsheets().values().update(
+                        spreadsheetId=self.sheet_id,
+                        range=f'commands!E{row_number}',
+                        valueInputOption='RAW',
+                        body={'values': [['processed']]}
+                    ).execute()
+                    logger.info(f"✓ Command {command_id} marked as processed")
+                    return
 
                 logger.warning(f"Command {command_id} not found")
 
         except Exception as e:
             logger.error(f"Failed to delete command: {e}")
 
-    def write_result(self, command_id, success, message, data=None):
+    def delete_commands(self, row_numbers):
+        """
+        Mark several commands as processed in a single batchUpdate request.
+
+        Args:
+            row_numbers: Row numbers in the commands tab
+        """
+        flushed = self.flush_pending()
+        self._invalidate_cache()
+
+        if not row_numbers:
+            return
+
+        if flushed is None:
+            # Their deferred results are not written yet - retry next time
+            logger.error(f"Not marking {len(row_numbers)} commands processed: deferred rows unsent")
+            return
+
+        try:
+            self.service.spreadsheets().values().batchUpdate(
+                spreadsheetId=self.sheet_id,
+                body={
+                    'valueInputOption': 'RAW',
+                    'data': [
+                        {'range': f'commands!E{row_number}', 'values': [['processed']]}
+                        for row_number in row_numbers
+                    ]
+                }
+            ).execute()
+            logger.info(f"✓ {len(row_numbers)} commands marked as processed")
+
+        except Exception as e:
+            logger.error(f"Failed to delete commands: {e}")
+
+    def write_result(self, command_id, success, message, data=None, defer=False):
         """
         Write a result to the queue.
 
@@ -319,41 +775,41 @@ class GoogleSheetsQueue:
             success: Boolean indicating success/failure
             message: Result message
             data: Optional additional data
+            defer: Queue the row for the next batched append (flush_pending)
+                   instead of sending it now
 
         Returns:
             str: Result ID
         """
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            result_id = f"RESULT_{command_id}_{timestamp}"
+            timestamp = time.strftime(TIMESTAMP_FORMAT)
+            result_id = f"RESULT_{command_id}_{timestamp}_{_id_suffix()}"
 
             # Prepare row data
-            data_json = json.dumps(data or {})
+            data_json = _dump_data(data or {})
             row = [
                 result_id,
                 command_id,
-                str(success),  # Convert boolean to string
+                '1' if success else '0',  # Success flag as 1/0
                 message,
                 timestamp,
                 data_json,
                 'pending'
             ]
 
+            if defer:
+                self._defer_write('results', row)
+                return result_id
+
             # Append to results sheet
-            self.service.spreadsheets().values().append(
-                spreadsheetId=self.sheet_id,
-                range='results!A:G',
-                valueInputOption='RAW',
-                insertDataOption='INSERT_ROWS',
-                body={'values': [row]}
-            ).execute()
+            self._append_rows({'results': [row]})
 
+            self._invalidate_cache()
             logger.info(f"✓ Result written: {result_id}")
             return result_id
 
         except Exception as e:
             logger.error(f"Failed to write result: {e}")
-            import traceback
             logger.error(traceback.format_exc())
             return None
 
@@ -367,52 +823,106 @@ class GoogleSheetsQueue:
         Returns:
             list: List of result dictionaries
         """
+        self.flush_pending()
+
         try:
-            # Read all results
+            # Only read from the first row that may still be pending
+            start_row = self._result_next_row
             result = self.service.spreadsheets().values().get(
                 spreadsheetId=self.sheet_id,
-                range='results!A2:G'  # Skip header
+                range=f'results!A{start_row}:G',
+                valueRenderOption='UNFORMATTED_VALUE'
             ).execute()
 
             rows = result.get('values', [])
-
-            if not rows:
-                return []
-
-            results_list = []
-            for i, row in enumerate(rows, start=2):  # Start from row 2
-                # Skip if not enough columns or already processed
-                if len(row) < 7:
-                    continue
-
-                if row[6] != 'pending':  # status column
-                    continue
-
-                # Filter by command_id if specified
-                if command_id and row[1] != command_id:
-                    continue
-
-                try:
-                    result_data = {
-                        'result_id': row[0],
-                        'command_id': row[1],
-                        'success': row[2].lower() == 'true',  # Convert string back to boolean
-                        'message': row[3],
-                        'timestamp': row[4],
-                        'data': json.loads(row[5]) if row[5] else {},
-                        'status': row[6],
-                        'row_number': i  # Store row number for deletion
-                    }
-                    results_list.append(result_data)
-                except Exception as e:
-                    logger.error(f"Error parsing result row {i}: {e}")
-
-            return results_list
+            self._set_cursors(result_next_row=_next_pending_row(rows, start_row, 6))
+            return self._parse_results(rows, command_id, start_row)
 
         except Exception as e:
             logger.error(f"Failed to check results: {e}")
             return []
 
+    def _parse_results(self, rows, command_id=None, start_row=2):
+        """
+        Parse pending result rows from the results tab.
+
+        Args:
+            rows: Values of results!A{start_row}:G
+            command_id: Optional - filter for specific command
+            start_row: Sheet row number of the first entry in rows
+
+        Returns:
+            list: List of result dictionaries
+        """
+        results_list = []
+        for i, row in enumerate(rows, start=start_row):
+            # Skip if not enough columns or already processed
+            if len(row) < 7:
+                continue
+
+            if row[6] != 'pending':  # status column
+                continue
+
+            # Filter by command_id if specified
+            if command_id and row[1] != command_id:
+                continue
+
+            try:
+                result_data = {
+                    'result_id': row[0],
+                    'command_id': row[1],
+                    'success': row[2] in SUCCESS_VALUES,
+                    'message': row[3],
+                    'timestamp': row[4],
+                    'data': _load_data(row[5]),
+                    'status': row[6],
+                    'row_number': i  # Store row number for deletion
+                }
+                results_list.append(result_data)
+            except Exception as e:
+                logger.error(f"Error parsing result row {i}: {e}")
+
+        return results_list
+
+    @cached_ttl()
+    def batch_check(self, command_id=None):
+        """
+        Read both queue tabs in a single batchGet request.
+
+        Use this instead of check_commands() + check_results() when both
+        tabs are needed - one round trip instead of two sequential ones.
+
+        Args:
+            command_id: Optional - filter results for specific command
+
+        Returns:
+            tuple: (pending commands, pending results), each a list of dictionaries
+
+        Raises:
+            Exception: If the Sheets request fails
+        """
+        self.flush_pending()
+
+        # Commands from the top - the poller compacts that tab, which would
+        # leave this process's cursor past the end - results from the cursor
+        cmd_start, result_start = 2, self._result_next_row
+        response = self.service.spreadsheets().values().batchGet(
+            spreadsheetId=self.sheet_id,
+            ranges=[f'commands!A{cmd_start}:E', f'results!A{result_start}:G'],
+            valueRenderOption='UNFORMATTED_VALUE'
+        ).execute()
+
+        command_range, result_range = response.get('valueRanges', [{}, {}])
+        command_rows = command_range.get('values', [])
+        result_rows = result_range.get('values', [])
+
+        self._set_cursors(result_next_row=_next_pending_row(result_rows, result_start, 6))
+
+        return (
+            self._parse_commands(command_rows, cmd_start),
+            self._parse_results(result_rows, command_id, result_start)
+        )
+
     def delete_result(self, result_id=None, row_number=None):
         """
         Mark a result as processed (delete from queue).
@@ -421,6 +931,9 @@ class GoogleSheetsQueue:
             result_id: Result ID (used if row_number not provided)
             row_number: Row number in sheet (preferred)
         """
+        self.flush_pending()
+        self._invalidate_cache()
+
         try:
             if row_number:
                 # Mark as processed in the status column
@@ -433,28 +946,119 @@ class GoogleSheetsQueue:
                 logger.info(f"✓ Result marked as processed (row {row_number})")
             else:
                 # Find row by result_id and mark as processed
-                result = self.service.spreadsheets().values().get(
-                    spreadsheetId=self.sheet_id,
-                    range='results!A2:G'
-                ).execute()
-
-                rows = result.get('values', [])
-                for i, row in enumerate(rows, start=2):
-                    if len(row) > 0 and row[0] == result_id:
-                        self.service.spreadsheets().values().update(
-                            spreadsheetId=self.sheet_id,
-                            range=f'results!G{i}',
-                            valueInputOption='RAW',
-                            body={'values': [['processed']]}
-                        ).execute()
-                        logger.info(f"✓ Result {result_id} marked as processed")
-                        return
+                row_number = self._find_row('results', result_id, self._result_next_row)
+                if row_number:
+                    self.service.spreadsheets().values().update(
+                        spreadsheetId=self.sheet_id,
+                        range=f'results!G{row_number}',
+                        valueInputOption='RAW',
+                        body={'values': [['processed']]}
+                    ).execute()
+                    logger.info(f"✓ Result {result_id} marked as processed")
+                    return
 
                 logger.warning(f"Result {result_id} not found")
 
         except Exception as e:
             logger.error(f"Failed to delete result: {e}")
 
+    def delete_results(self, row_numbers):
+        """
+        Mark several results as processed in a single batchUpdate request.
+
+        Args:
+            row_numbers: Row numbers in the results tab
+        """
+        self.flush_pending()
+        self._invalidate_cache()
+
+        if not row_numbers:
+            return
+
+        try:
+            self.service.spreadsheets().values().batchUpdate(
+                spreadsheetId=self.sheet_id,
+                body={
+                    'valueInputOption': 'RAW',
+                    'data': [
+                        {'range': f'results!G{row_number}', 'values': [['processed']]}
+                        for row_number in row_numbers
+                    ]
+                }
+            ).execute()
+            logger.info(f"✓ {len(row_numbers)} results marked as processed")
+
+        except Exception as e:
+            logger.error(f"Failed to delete results: {e}")
+
+    def compact(self, tab, min_rows=COMPACT_MIN_ROWS):
+        """
+        Delete the processed rows at the top of a tab in one batchUpdate.
+
+        The status column above the cursor is re-read first and only the
+        leading run of 'processed' rows goes, so a stale cursor can never
+        delete rows that were not handled. Only the consumer of a tab may
+        compact it (the poller for commands), and only when it holds no row
+        numbers from an earlier read - the remaining rows move up.
+
+        Args:
+            tab: "commands" or "results"
+            min_rows: Skip unless at least this many rows can go
+
+        Returns:
+            int: Number of rows deleted
+        """
+        next_row = self._cmd_next_row if tab == 'commands' else self._result_next_row
+
+        if next_row - 2 < max(min_rows, 1):
+            return 0
+
+        status_column = 'E' if tab == 'commands' else 'G'
+
+        try:
+            result = self.service.spreadsheets().values().get(
+                spreadsheetId=self.sheet_id,
+                range=f'{tab}!{status_column}2:{status_column}{next_row - 1}',
+                valueRenderOption='UNFORMATTED_VALUE'
+            ).execute()
+
+            count = 0
+            for row in result.get('values', []):
+                if not row or row[0] != 'processed':
+                    break
+                count += 1
+
+            if count < max(min_rows, 1):
+                return 0
+
+            self.service.spreadsheets().batchUpdate(
+                spreadsheetId=self.sheet_id,
+                body={'requests': [{
+                    'deleteDimension': {
+                        'range': {
+                            'sheetId': self._load_tab_ids()[tab],
+                            'dimension': 'ROWS',
+                            'startIndex': 1,  # Keep the header
+                            'endIndex': count + 1
+                        }
+                    }
+                }]}
+            ).execute()
+
+        except Exception as e:
+            logger.error(f"Failed to compact {tab}: {e}")
+            return 0
+
+        # Rescan from right below the header (anything above the old cursor
+        # that was not processed is still there and gets read again)
+        if tab == 'commands':
+            self._set_cursors(cmd_next_row=2)
+        else:
+            self._set_cursors(result_next_row=2)
+
+        self._invalidate_cache()
+        logger.info(f"✓ Compacted {tab}: {count} processed rows deleted")
+        return count
 
 def main():
     """Test the Google Sheets queue."""
@@ -467,9 +1071,7 @@ def main():
     command_id = queue.write_command("RUNNIT", {"test": True})
     print(f"Command ID: {command_id}")
 
-    time.sleep(2)
-
-    # Test checking commands
+    # Test checking commands (the append is already committed - no wait needed)
     commands = queue.check_commands()
     print(f"Commands found: {len(commands)}")
     for cmd in commands:
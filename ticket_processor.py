@@ -17,14 +17,28 @@ FEATURES:
 """
 
 import pandas as pd
+import numpy as np
 import os
 import sys
+import codecs
 from datetime import datetime, timedelta
 from pathlib import Path
 import glob
 import traceback
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill
+
+# openpyxl serializes sheet/chart XML through lxml whenever it can be
+# imported (much faster than the stdlib fallback) - only a speedup, so
+# just warn when it's missing
+try:
+    import lxml  # noqa: F401
+except ImportError:
+    print("WARNING: lxml not installed - Excel export uses the slower built-in XML writer")
+    print("Install: pip install lxml")
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill, Font, Border, Side, Alignment
+from openpyxl.utils import get_column_letter
 from openpyxl.chart import BarChart, LineChart, Reference
 from openpyxl.chart.series import DataPoint
 import gspread
@@ -36,10 +50,43 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 import pickle
 
+# TICKET_DEBUG=1 lists every CSV in the raw data folder on each run
+TICKET_DEBUG = os.getenv("TICKET_DEBUG", "").lower() in ("1", "true", "yes")
+
+# Header/index cell style used by DataFrame.to_excel (kept for the write-only export)
+HEADER_FONT = Font(bold=True)
+HEADER_BORDER = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='top')
+
 class TicketsToGPRSFormatter:
     """
     Main class for converting tickets data to GPRS format
     """
+
+    # CSV encodings to try (Arabic text), in this order
+    CSV_ENCODINGS = ['utf-8-sig', 'utf-8', 'cp1256', 'iso-8859-1']
+
+    # Bytes read from the CSV to pick its encoding
+    ENCODING_SAMPLE_SIZE = 65536
+
+    # SubmitDate formats, tried in this order
+    SUBMIT_DATE_FORMATS = [
+        "%Y-%m-%d %H:%M:%S.%f",  # 2025-12-20 14:30:45.000
+        "%Y-%m-%d %H:%M:%S",     # 2025-12-20 14:30:45
+        "%Y-%m-%d",              # 2025-12-20
+        "%d-%m-%Y %H:%M:%S",     # 20-12-2025 14:30:45
+        "%d-%m-%Y",              # 20-12-2025
+        "%b %d %Y %I:%M%p",      # Dec 20 2025 2:30PM
+        "%b  %d %Y %I:%M%p",     # Dec  9 2025 2:30PM (double space)
+    ]
+
+    # OnlineStatus text -> GPRS status (anything else is kept as-is)
+    ONLINE_STATUS_MAP = {
+        "0": "offline", "0.0": "offline",
+        "-1": "never online", "-1.0": "never online",
+        "1": "online", "1.0": "online",
+        "nan": "", "": "",
+    }
     
     def __init__(self):
         """Initialize the formatter with folder paths"""
@@ -60,6 +107,25 @@ class TicketsToGPRSFormatter:
             print(f"Error initializing formatter: {e}")
             raise
     
+    def detect_encoding(self, file_path):
+        """
+        Pick the first CSV encoding that decodes the start of the file
+        Args: file_path - CSV file path
+        Returns: encoding name or None
+        """
+        with open(file_path, 'rb') as f:
+            sample = f.read(self.ENCODING_SAMPLE_SIZE)
+
+        for encoding in self.CSV_ENCODINGS:
+            try:
+                # final=False - the sample may end in the middle of a character
+                codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+                return encoding
+            except UnicodeDecodeError:
+                continue
+
+        return None
+
     def load_latest_tickets(self):
         """
         Load the most recent CSV file from the raw data folder
@@ -73,23 +139,32 @@ class TicketsToGPRSFormatter:
             if not csv_files:
                 raise FileNotFoundError(f"No CSV files found in {self.raw_data_folder}")
 
+            # Stat each file once
+            file_mtimes = [(f, os.path.getmtime(f)) for f in csv_files]
+
             # Get the latest file by modification time (most recently downloaded/modified)
-            latest_file = max(csv_files, key=os.path.getmtime)
+            latest_file, latest_mtime = max(file_mtimes, key=lambda item: item[1])
             filename = os.path.basename(latest_file)
 
             print(f"Loading latest file: {filename}")
             print(f"Total CSV files found: {len(csv_files)}")
-            print(f"File modified: {datetime.fromtimestamp(os.path.getmtime(latest_file)).strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"\n[DEBUG] All CSV files found (sorted by date):")
-            sorted_files = sorted(csv_files, key=os.path.getmtime, reverse=True)
-            for idx, f in enumerate(sorted_files, 1):
-                mtime = datetime.fromtimestamp(os.path.getmtime(f)).strftime("%Y-%m-%d %H:%M:%S")
-                marker = " <-- SELECTED" if f == latest_file else ""
-                print(f"  {idx}. {os.path.basename(f)} | {mtime}{marker}")
-            print()
-            
-            # Try multiple encodings to handle Arabic text
-            encodings = ['utf-8-sig', 'utf-8', 'cp1256', 'iso-8859-1']
+            print(f"File modified: {datetime.fromtimestamp(latest_mtime).strftime('%Y-%m-%d %H:%M:%S')}")
+
+            if TICKET_DEBUG:
+                print(f"\n[DEBUG] All CSV files found (sorted by date):")
+                file_mtimes.sort(key=lambda item: item[1], reverse=True)
+                for idx, (f, file_mtime) in enumerate(file_mtimes, 1):
+                    mtime = datetime.fromtimestamp(file_mtime).strftime("%Y-%m-%d %H:%M:%S")
+                    marker = " <-- SELECTED" if f == latest_file else ""
+                    print(f"  {idx}. {os.path.basename(f)} | {mtime}{marker}")
+                print()
+            
+            # Try multiple encodings to handle Arabic text - start from the one
+            # that decodes a sample, so the whole file is normally read once
+            encodings = self.CSV_ENCODINGS
+            detected = self.detect_encoding(latest_file)
+            if detected:
+                encodings = encodings[encodings.index(detected):]
             
             for encoding in encodings:
                 try:
@@ -146,6 +221,35 @@ class TicketsToGPRSFormatter:
             print(f"Error converting phone {phone}: {e}")
             return str(phone) if not pd.isna(phone) else ""
     
+    def convert_phone_numbers(self, phones):
+        """
+        Vectorized convert_phone_number for a whole column
+        Args: phones - Series of phone numbers (any format)
+        Returns: Series of formatted phone numbers (same rules, same index)
+        """
+        # Same cleanup as convert_phone_number, one pass per step over the column
+        phone_str = (
+            phones.astype(str)
+            .str.replace('.0', '', regex=False)
+            .str.replace(r'[ \-()]', '', regex=True)
+        )
+        length = phone_str.str.len()
+
+        # 962 + 7xxxxxxxx -> 07xxxxxxxx (other 962 numbers stay as-is)
+        from_962 = phone_str.str.startswith('962') & (length == 12) & (phone_str.str[3] == '7')
+        # 7xxxxxxxx -> 07xxxxxxxx
+        missing_zero = (length == 9) & phone_str.str.startswith('7')
+
+        converted = np.select(
+            [from_962, missing_zero],
+            ['0' + phone_str.str[3:], '0' + phone_str],
+            default=phone_str
+        )
+
+        converted = pd.Series(converted, index=phones.index, dtype=object)
+        converted[phones.isna() | (phones == "")] = ""
+        return converted
+
     def process_online_status(self, status):
         """
         Process OnlineStatus values according to mapping rules
@@ -175,6 +279,18 @@ class TicketsToGPRSFormatter:
             print(f"Error processing status {status}: {e}")
             return str(status) if not pd.isna(status) else ""
     
+    def process_online_statuses(self, statuses):
+        """
+        Vectorized process_online_status for a whole column
+        Args: statuses - Series of original status values
+        Returns: Series of mapped status strings (same index)
+        """
+        # One hash lookup per value instead of a Python call per row
+        status_str = statuses.astype(str).str.strip()
+        mapped = status_str.map(self.ONLINE_STATUS_MAP).fillna(status_str)
+        mapped[statuses.isna()] = ""
+        return mapped
+
     def process_coordinates(self, lat_ticket, lon_ticket, lat_app, lon_app):
         """
         Process coordinates with dummy/no location detection
@@ -231,6 +347,55 @@ class TicketsToGPRSFormatter:
             print(f"Error processing coordinates: {e}")
             return "no location", "no location"
     
+    def process_coordinate_columns(self, tickets_df):
+        """
+        Vectorized process_coordinates for every ticket row
+        Args: tickets_df - input dataframe (coordinate columns may be missing)
+        Returns: (latitudes, longitudes) object arrays - rounded floats or
+                 "dummy location" / "no location"
+        """
+        no_values = pd.Series(np.nan, index=tickets_df.index)
+        raw_lat_t = tickets_df.get('Latitude_Ticket', no_values)
+        raw_lon_t = tickets_df.get('Longitude_Ticket', no_values)
+        raw_lat_a = tickets_df.get('Latitude_App', no_values)
+        raw_lon_a = tickets_df.get('Longitude_app', no_values)
+
+        # Unparseable values become NaN (process_coordinates' ValueError path)
+        lat_t = pd.to_numeric(raw_lat_t, errors='coerce').to_numpy(dtype=float)
+        lon_t = pd.to_numeric(raw_lon_t, errors='coerce').to_numpy(dtype=float)
+        lat_a = pd.to_numeric(raw_lat_a, errors='coerce').to_numpy(dtype=float)
+        lon_a = pd.to_numeric(raw_lon_a, errors='coerce').to_numpy(dtype=float)
+
+        # Only flag as dummy if Latitude_ticket=30 AND Longitude_ticket=34
+        dummy = (lat_t == 30) & (lon_t == 34)
+
+        # Ticket coordinates first, app coordinates if the ticket has none;
+        # a ticket with a good latitude but a bad longitude never falls back
+        ticket_present = (raw_lat_t.notna() & raw_lon_t.notna()).to_numpy()
+        use_ticket = ticket_present & ~np.isnan(lat_t) & ~np.isnan(lon_t)
+        blocked = ticket_present & ~np.isnan(lat_t) & np.isnan(lon_t)
+        use_app = ~use_ticket & ~blocked & ~np.isnan(lat_a) & ~np.isnan(lon_a)
+
+        lat = np.where(use_ticket, lat_t, lat_a)
+        lon = np.where(use_ticket, lon_t, lon_a)
+        valid = use_ticket | use_app
+
+        # Swapped coordinates (latitude should be smaller than longitude in Jordan)
+        swapped = valid & (lat > lon)
+        if swapped.any():
+            print(f"Warning: {swapped.sum()} swapped coordinates detected - Correcting...")
+            lat, lon = np.where(swapped, lon, lat), np.where(swapped, lat, lon)
+
+        lat = np.round(lat, 6).astype(object)
+        lon = np.round(lon, 6).astype(object)
+
+        lat = np.where(valid, lat, "no location")
+        lon = np.where(valid, lon, "no location")
+        lat = np.where(dummy, "dummy location", lat)
+        lon = np.where(dummy, "dummy location", lon)
+
+        return lat, lon
+
     def create_street_building(self, category, street):
         """
         Create street_building field by combining category and street
@@ -261,6 +426,24 @@ class TicketsToGPRSFormatter:
             print(f"Error creating street/building: {e}")
             return ""
     
+    def create_street_buildings(self, categories, streets):
+        """
+        Vectorized create_street_building for whole columns
+        Args: categories, streets - input Series (same index)
+        Returns: Series of combined strings
+        """
+        def clean(values):
+            # Stripped text, "" for NaN / empty / "nan"
+            text = values.astype(str).str.strip()
+            return text.where(values.notna() & ~text.isin(["", "nan"]), "")
+
+        cat_str = clean(categories)
+        street_str = clean(streets)
+
+        # Combine with dash only if both exist (values keep their own dashes)
+        both = (cat_str != "") & (street_str != "")
+        return cat_str.str.cat(street_str, sep="-").where(both, cat_str + street_str)
+
     def transform_to_gprs_format(self, tickets_df):
         """
         Transform tickets DataFrame to GPRS format
@@ -273,11 +456,11 @@ class TicketsToGPRSFormatter:
             result_df = pd.DataFrame()
             
             # 1. Serial number
-            result_df['no'] = range(1, len(tickets_df) + 1)
+            result_df['no'] = np.arange(1, len(tickets_df) + 1, dtype=np.int32)
             
             # 2. Status mapping
             if 'OnlineStatus' in tickets_df.columns:
-                result_df['الحالة'] = tickets_df['OnlineStatus'].apply(self.process_online_status)
+                result_df['الحالة'] = self.process_online_statuses(tickets_df['OnlineStatus'])
             else:
                 result_df['الحالة'] = ""
             
@@ -286,51 +469,32 @@ class TicketsToGPRSFormatter:
             result_df['رقم العداد'] = tickets_df.get('Meter_no', "")
             
             # Process communication method and add "NO TECH" for empty meter numbers
-            meter_numbers = tickets_df.get('Meter_no', pd.Series([""]*len(tickets_df)))
-            comm_methods = tickets_df.get('Material_Group_Name', pd.Series([""]*len(tickets_df)))
-            processed_comm_methods = []
+            meter_numbers = tickets_df.get('Meter_no', pd.Series("", index=tickets_df.index))
+            comm_methods = tickets_df.get('Material_Group_Name', pd.Series("", index=tickets_df.index))
             
-            for meter, comm in zip(meter_numbers, comm_methods):
-                if pd.isna(meter) or str(meter).strip() in ["", "nan", "0", "0.0"]:
-                    processed_comm_methods.append("NO TECH")
-                else:
-                    processed_comm_methods.append(str(comm) if not pd.isna(comm) else "")
+            no_tech = meter_numbers.isna() | meter_numbers.astype(str).str.strip().isin(["", "nan", "0", "0.0"])
+            comm_text = comm_methods.astype(str).where(comm_methods.notna(), "")
             
-            result_df['طريقة الإتصال'] = processed_comm_methods
+            result_df['طريقة الإتصال'] = comm_text.mask(no_tech, "NO TECH").to_numpy()
             result_df['اسم المشترك'] = tickets_df.get('customer_name', "")
             
             # 4. Phone conversion
             if 'phone' in tickets_df.columns:
-                result_df['رقم المشترك'] = tickets_df['phone'].apply(self.convert_phone_number)
+                result_df['رقم المشترك'] = self.convert_phone_numbers(tickets_df['phone'])
             else:
                 result_df['رقم المشترك'] = ""
             
             # 5. Street/building combination
-            category_col = tickets_df.get('Category', pd.Series([""]*len(tickets_df)))
-            street_col = tickets_df.get('Street', pd.Series([""]*len(tickets_df)))
+            category_col = tickets_df.get('Category', pd.Series("", index=tickets_df.index))
+            street_col = tickets_df.get('Street', pd.Series("", index=tickets_df.index))
             
-            street_building_list = []
-            for cat, street in zip(category_col, street_col):
-                street_building_list.append(self.create_street_building(cat, street))
-            
-            result_df['شارع_رقم بناية'] = street_building_list
+            result_df['شارع_رقم بناية'] = self.create_street_buildings(category_col, street_col).to_numpy()
             
             # 6. Office
             result_df['المكتب_المنطقة'] = tickets_df.get('OFFICE_NAME', "")
             
-            # 7. Coordinates processing
-            lat_coords = []
-            lon_coords = []
-            
-            for i in range(len(tickets_df)):
-                lat_ticket = tickets_df.get('Latitude_Ticket', pd.Series([None]*len(tickets_df))).iloc[i]
-                lon_ticket = tickets_df.get('Longitude_Ticket', pd.Series([None]*len(tickets_df))).iloc[i]
-                lat_app = tickets_df.get('Latitude_App', pd.Series([None]*len(tickets_df))).iloc[i]
-                lon_app = tickets_df.get('Longitude_app', pd.Series([None]*len(tickets_df))).iloc[i]
-                
-                lat, lon = self.process_coordinates(lat_ticket, lon_ticket, lat_app, lon_app)
-                lat_coords.append(lat)
-                lon_coords.append(lon)
+            # 7. Coordinates processing (whole columns at once)
+            lat_coords, lon_coords = self.process_coordinate_columns(tickets_df)
             
             result_df['Latitude'] = lat_coords
             result_df['Longitude'] = lon_coords
@@ -362,20 +526,14 @@ class TicketsToGPRSFormatter:
                 return None, main_gprs_df
             
             # Filter rows with Solution OR Problem data
-            solution_mask = pd.Series([False] * len(tickets_df))
-            problem_mask = pd.Series([False] * len(tickets_df))
+            def has_text(column):
+                # One string conversion per column (missing values stay <NA>)
+                if column not in tickets_df.columns:
+                    return False
+                text = tickets_df[column].astype('string')
+                return (text.notna() & text.str.strip().ne('') & text.ne('nan')).astype(bool)
             
-            if 'Solution' in tickets_df.columns:
-                solution_mask = (tickets_df['Solution'].notna() & 
-                               (tickets_df['Solution'].astype(str).str.strip() != '') & 
-                               (tickets_df['Solution'].astype(str) != 'nan'))
-            
-            if 'Problem' in tickets_df.columns:
-                problem_mask = (tickets_df['Problem'].notna() & 
-                              (tickets_df['Problem'].astype(str).str.strip() != '') & 
-                              (tickets_df['Problem'].astype(str) != 'nan'))
-            
-            feedback_mask = solution_mask | problem_mask
+            feedback_mask = has_text('Solution') | has_text('Problem')
             
             if not feedback_mask.any():
                 print("No feedback data found (empty Problem/Solution fields)")
@@ -386,18 +544,20 @@ class TicketsToGPRSFormatter:
             feedback_final = main_gprs_df.loc[main_gprs_df.index.isin(feedback_indices)].copy()
             
             # Reset serial numbers for feedback sheet
-            feedback_final['no'] = range(1, len(feedback_final) + 1)
+            feedback_final['no'] = np.arange(1, len(feedback_final) + 1, dtype=np.int32)
             
             # Add Problem and Solution columns
             feedback_tickets = tickets_df.loc[feedback_indices]
-            feedback_final['Problem'] = feedback_tickets.get('Problem', "").values
-            feedback_final['Solution'] = feedback_tickets.get('Solution', "").values
+            feedback_final = feedback_final.assign(**{
+                column: feedback_tickets[column].to_numpy() if column in feedback_tickets.columns else ""
+                for column in ('Problem', 'Solution')
+            })
             
             # Remove feedback entries from main sheet
             updated_main_gprs = main_gprs_df.loc[~main_gprs_df.index.isin(feedback_indices)].copy()
             
             # Reset serial numbers for updated main sheet
-            updated_main_gprs['no'] = range(1, len(updated_main_gprs) + 1)
+            updated_main_gprs['no'] = np.arange(1, len(updated_main_gprs) + 1, dtype=np.int32)
             
             print(f"Feedback sheet created with {len(feedback_final)} records")
             print(f"Main sheet updated: {len(main_gprs_df)} -> {len(updated_main_gprs)} records")
@@ -426,40 +586,30 @@ class TicketsToGPRSFormatter:
             analysis_df = main_df.copy()
             
             # Parse dates and extract date only (without time)
-            parsed_dates = []
-            valid_rows = []
-            
-            for idx, submit_date_str in enumerate(analysis_df['SubmitDate']):
-                submit_date = self.parse_submit_date(submit_date_str)
-                if submit_date is not None:
-                    # Extract just the date part (YYYY-MM-DD)
-                    date_only = submit_date.strftime('%Y-%m-%d')
-                    parsed_dates.append(date_only)
-                    valid_rows.append(idx)
+            parsed = self.parse_submit_dates(analysis_df['SubmitDate'])
+            valid = parsed.notna()
                 
-            if not parsed_dates:
+            if not valid.any():
                 print("No valid dates found for analysis")
                 return None
             
             # Filter to only valid date rows
-            analysis_df = analysis_df.iloc[valid_rows].copy()
-            analysis_df['Date'] = parsed_dates
+            analysis_df = analysis_df.loc[valid].copy()
+            analysis_df['Date'] = parsed[valid].dt.strftime('%Y-%m-%d')
             
             # Clean connection type data
             analysis_df['طريقة الإتصال'] = analysis_df['طريقة الإتصال'].fillna('Unknown')
             analysis_df['طريقة الإتصال'] = analysis_df['طريقة الإتصال'].astype(str).str.strip()
             
-            # Create full pivot table for charts (with all dates)
-            full_pivot_table = pd.pivot_table(
-                analysis_df,
-                values='no',  # Count tickets using the serial number
-                index='طريقة الإتصال',
-                columns='Date',
-                aggfunc='count',
-                fill_value=0,
-                margins=True,  # Add totals
-                margins_name='Total'
+            # Create full pivot table for charts (with all dates) - one
+            # groupby count, totals added by hand
+            full_pivot_table = (
+                analysis_df.groupby(['طريقة الإتصال', 'Date'])
+                .size()
+                .unstack(fill_value=0)
             )
+            full_pivot_table['Total'] = full_pivot_table.sum(axis=1)
+            full_pivot_table.loc['Total'] = full_pivot_table.sum(axis=0)
             
             # Sort dates in chronological order (excluding Total column)
             date_columns = [col for col in full_pivot_table.columns if col != 'Total']
@@ -581,14 +731,11 @@ class TicketsToGPRSFormatter:
             analysis_df.loc[analysis_df['الحالة'].isin(['', 'nan', 'None', 'NaN']), 'الحالة'] = 'blank'
             analysis_df.loc[analysis_df['طريقة الإتصال'].isin(['', 'nan', 'None', 'NaN']), 'طريقة الإتصال'] = 'Unknown'
             
-            # Create pivot table
-            pivot_table = pd.pivot_table(
-                analysis_df,
-                values='no',  # Count tickets using the serial number
-                index='طريقة الإتصال',
-                columns='الحالة',
-                aggfunc='count',
-                fill_value=0
+            # Create pivot table (ticket count per technology/status)
+            pivot_table = (
+                analysis_df.groupby(['طريقة الإتصال', 'الحالة'])
+                .size()
+                .unstack(fill_value=0)
             )
             
             print(f"Pivot table shape: {pivot_table.shape}")
@@ -622,20 +769,17 @@ class TicketsToGPRSFormatter:
                 data_sheet = workbook["ChartData"]
             
             # Write headers
-            data_sheet['A1'] = 'Technology-Status'
-            data_sheet['B1'] = 'Count'
+            data_sheet.append(['Technology-Status', 'Count'])
             
-            # Flatten pivot table into combinations
-            row_idx = 2
-            for tech_index, tech_row in pivot_table.iterrows():
-                for status_col, count in tech_row.items():
-                    if count > 0:  # Only include non-zero combinations
-                        combination = f"{tech_index}-{status_col}"
-                        data_sheet[f'A{row_idx}'] = combination
-                        data_sheet[f'B{row_idx}'] = count
-                        row_idx += 1
+            # Flatten pivot table into combinations (only non-zero ones)
+            flat = pivot_table.stack()
+            flat = flat[flat > 0]
             
-            print(f"Wrote chart data to separate sheet, rows 2 to {row_idx-1}")
+            for (tech_index, status_col), count in flat.items():
+                data_sheet.append([f"{tech_index}-{status_col}", int(count)])
+            
+            last_row = len(flat) + 1
+            print(f"Wrote chart data to separate sheet, rows 2 to {last_row}")
             
             # Create pie chart on the main sheet
             from openpyxl.chart import PieChart, Reference
@@ -647,9 +791,9 @@ class TicketsToGPRSFormatter:
             combo_pie_chart.height = 12
             
             # Data range from the separate sheet
-            if row_idx > 2:  # Make sure we have data
-                data_range = Reference(data_sheet, min_col=2, min_row=2, max_col=2, max_row=row_idx-1)
-                labels_range = Reference(data_sheet, min_col=1, min_row=2, max_col=1, max_row=row_idx-1)
+            if len(flat) > 0:  # Make sure we have data
+                data_range = Reference(data_sheet, min_col=2, min_row=2, max_col=2, max_row=last_row)
+                labels_range = Reference(data_sheet, min_col=1, min_row=2, max_col=1, max_row=last_row)
                 
                 combo_pie_chart.add_data(data_range)
                 combo_pie_chart.set_categories(labels_range)
@@ -664,7 +808,7 @@ class TicketsToGPRSFormatter:
                 main_sheet = workbook[sheet_name]
                 main_sheet.add_chart(combo_pie_chart, "Q8")
                 
-                print(f"Created combined chart with {row_idx - 2} technology-status combinations")
+                print(f"Created combined chart with {len(flat)} technology-status combinations")
             else:
                 print("No data available for combined chart")
             
@@ -746,17 +890,7 @@ class TicketsToGPRSFormatter:
             date_str = str(date_str).strip()
             
             # Common formats to try
-            formats = [
-                "%Y-%m-%d %H:%M:%S.%f",  # 2025-12-20 14:30:45.000
-                "%Y-%m-%d %H:%M:%S",     # 2025-12-20 14:30:45
-                "%Y-%m-%d",              # 2025-12-20
-                "%d-%m-%Y %H:%M:%S",     # 20-12-2025 14:30:45
-                "%d-%m-%Y",              # 20-12-2025
-                "%b %d %Y %I:%M%p",      # Dec 20 2025 2:30PM
-                "%b  %d %Y %I:%M%p",     # Dec  9 2025 2:30PM (double space)
-            ]
-            
-            for fmt in formats:
+            for fmt in self.SUBMIT_DATE_FORMATS:
                 try:
                     return datetime.strptime(date_str, fmt)
                 except ValueError:
@@ -768,111 +902,147 @@ class TicketsToGPRSFormatter:
         except Exception as e:
             return None
     
-    def apply_date_highlighting(self, output_path, main_df, feedback_df=None):
+    def parse_submit_dates(self, values):
         """
-        Apply date-based row highlighting to Excel file
-        - Red: Tickets older than 1 week
-        - Light Green: Tickets from today (same date as sheet)
-        Args: output_path - Excel file path, main_df - main data, feedback_df - feedback data
+        Vectorized parse_submit_date for a whole column
+        Each format is parsed over the still-unparsed values in one call,
+        in the same order as parse_submit_date; the rest fall back to
+        per-value inference
+        Args: values - SubmitDate Series
+        Returns: datetime Series (NaT where nothing matched)
         """
-        try:
-            print("Applying date-based highlighting...")
-            
-            # Load the workbook
-            workbook = load_workbook(output_path)
-            
-            # Get today's date (sheet creation date)
-            today = datetime.now().date()
-            yesterday = today - timedelta(days=1)
-            one_week_ago = today - timedelta(days=7)
-            
-            # Define highlight colors
-            red_fill = PatternFill(start_color="FFCDD2", end_color="FFCDD2", fill_type="solid")      # Light red
-            green_fill = PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")   # Light green
-            
-            # Process main sheet
-            if 'GPRS_Data' in workbook.sheetnames:
-                worksheet = workbook['GPRS_Data']
-                self._highlight_sheet_rows(worksheet, main_df, today, yesterday, one_week_ago, red_fill, green_fill)
-            
-            # Process feedback sheet
-            if feedback_df is not None and 'feedback' in workbook.sheetnames:
-                worksheet = workbook['feedback']
-                self._highlight_sheet_rows(worksheet, feedback_df, today, yesterday, one_week_ago, red_fill, green_fill)
-            
-            # Save the workbook
-            workbook.save(output_path)
-            print("Date highlighting applied successfully")
-            
-        except Exception as e:
-            print(f"Error applying date highlighting: {e}")
-            print(traceback.format_exc())
-    
-    def _highlight_sheet_rows(self, worksheet, df, today, yesterday, one_week_ago, red_fill, green_fill):
+        text = values.astype(str).str.strip()
+        remaining = values.notna() & (values != "")
+        parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+
+        for fmt in self.SUBMIT_DATE_FORMATS:
+            if not remaining.any():
+                break
+            attempt = pd.to_datetime(text[remaining], format=fmt, errors='coerce')
+            matched = attempt.notna()
+            parsed[matched[matched].index] = attempt[matched]
+            remaining[matched[matched].index] = False
+
+        # If none work, try pandas to_datetime as fallback - per value, like
+        # parse_submit_date, keeping the wall-clock time of timezone-suffixed
+        # dates ("2025-12-20T10:00:00Z") so they fit the naive column
+        if remaining.any():
+            fallback = [pd.to_datetime(value, errors='coerce') for value in text[remaining]]
+            parsed[remaining] = [
+                value.tz_localize(None) if not pd.isna(value) and value.tzinfo is not None else value
+                for value in fallback
+            ]
+
+        return parsed
+
+    def _date_highlight_fills(self, df):
         """
-        Apply highlighting to a specific worksheet
-        Args: worksheet - Excel worksheet, df - dataframe, dates and fills
+        Work out the date-based highlight of every row
+        - Red: Tickets older than 1 week
+        - Light Green: Tickets from yesterday (1 day old)
+        Args: df - dataframe with a SubmitDate column
+        Returns: list with one PatternFill (or None) per row
         """
-        try:
-            # Find SubmitDate column
-            submit_date_col = None
-            for col_idx, cell in enumerate(worksheet[1], 1):  # Header row
-                if cell.value == 'SubmitDate':
-                    submit_date_col = col_idx
-                    break
-            
-            if submit_date_col is None:
-                print("SubmitDate column not found in sheet")
-                return
-            
-            red_count = 0
-            green_count = 0
-            
-            # Process each data row (starting from row 2, skipping header)
-            for row_idx in range(2, len(df) + 2):
-                try:
-                    # Get the SubmitDate value from dataframe
-                    df_row_idx = row_idx - 2  # Convert to 0-based index
-                    if df_row_idx >= len(df):
-                        continue
-                    
-                    submit_date_str = df.iloc[df_row_idx]['SubmitDate']
-                    submit_date = self.parse_submit_date(submit_date_str)
-                    
-                    if submit_date is None:
-                        continue
-                    
-                    submit_date_only = submit_date.date()
-                    
-                    # Determine highlight color
-                    fill_color = None
-                    
-                    # Check if older than 1 week (priority - red)
-                    if submit_date_only <= one_week_ago:
-                        fill_color = red_fill
-                        red_count += 1
-                    
-                    # Check if 1 day old (yesterday's entries - green)
-                    elif submit_date_only == yesterday:
-                        fill_color = green_fill
-                        green_count += 1
-                    
-                    # Apply highlighting to entire row
-                    if fill_color is not None:
-                        for col in range(1, worksheet.max_column + 1):
-                            cell = worksheet.cell(row=row_idx, column=col)
-                            cell.fill = fill_color
-                
-                except Exception as row_error:
-                    # Skip problematic rows
+        fills = [None] * len(df)
+
+        if 'SubmitDate' not in df.columns:
+            print("SubmitDate column not found in sheet")
+            return fills
+
+        # Get today's date (sheet creation date)
+        today = datetime.now().date()
+        yesterday = today - timedelta(days=1)
+        one_week_ago = today - timedelta(days=7)
+
+        # Define highlight colors
+        red_fill = PatternFill(start_color="FFCDD2", end_color="FFCDD2", fill_type="solid")      # Light red
+        green_fill = PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")   # Light green
+
+        red_count = 0
+        green_count = 0
+
+        for row_idx, submit_date_str in enumerate(df['SubmitDate']):
+            try:
+                submit_date = self.parse_submit_date(submit_date_str)
+                if submit_date is None or pd.isna(submit_date):
                     continue
-            
-            print(f"  Highlighted {red_count} old rows (>1 week) in red")
-            print(f"  Highlighted {green_count} new rows (1 day old) in green")
-            
-        except Exception as e:
-            print(f"Error highlighting sheet: {e}")
-    
+
+                submit_date_only = submit_date.date()
+
+                # Check if older than 1 week (priority - red)
+                if submit_date_only <= one_week_ago:
+                    fills[row_idx] = red_fill
+                    red_count += 1
+
+                # Check if 1 day old (yesterday's entries - green)
+                elif submit_date_only == yesterday:
+                    fills[row_idx] = green_fill
+                    green_count += 1
+
+            except Exception:
+                # Skip problematic rows
+                continue
+
+        print(f"  Highlighted {red_count} old rows (>1 week) in red")
+        print(f"  Highlighted {green_count} new rows (1 day old) in green")
+        return fills
+
+    def _write_sheet(self, workbook, sheet_name, df, index=False, fills=None):
+        """
+        Stream a dataframe into a new sheet of a write-only workbook
+        Same layout as DataFrame.to_excel: bold bordered header (and index)
+        cells, NaN as empty cells, column widths fitted to the content
+        Args: workbook - write-only Workbook, sheet_name - sheet name, df - data,
+              index - write the index as the first column, fills - optional
+              PatternFill (or None) per data row
+        Returns: the new worksheet
+        """
+        worksheet = workbook.create_sheet(sheet_name)
+
+        if index:
+            index_name = df.index.name
+            df = df.reset_index()
+            df.columns = [index_name or ""] + list(df.columns[1:])
+
+        headers = [str(col) for col in df.columns]
+        values = df.astype(object).where(df.notna(), None)
+
+        # Column width from the longest value (empty cells count as "None"), max 30
+        for col_idx, column in enumerate(headers):
+            lengths = values.iloc[:, col_idx].map(lambda value: len(str(value)))
+            max_length = max(len(column), lengths.max() if len(lengths) else 0)
+            worksheet.column_dimensions[get_column_letter(col_idx + 1)].width = min(max_length + 2, 30)
+
+        def header_cell(value):
+            cell = WriteOnlyCell(worksheet, value=value)
+            cell.font = HEADER_FONT
+            cell.border = HEADER_BORDER
+            cell.alignment = HEADER_ALIGNMENT
+            return cell
+
+        worksheet.append([header_cell(column) for column in headers])
+
+        for row_idx, row in enumerate(values.itertuples(index=False, name=None)):
+            fill = fills[row_idx] if fills else None
+
+            if fill is None and not index:
+                # Plain row - no cell objects needed
+                worksheet.append(row)
+                continue
+
+            cells = []
+            for col_idx, value in enumerate(row):
+                if index and col_idx == 0:
+                    cell = header_cell(value)
+                else:
+                    cell = WriteOnlyCell(worksheet, value=value)
+                if fill is not None:
+                    cell.fill = fill
+                cells.append(cell)
+            worksheet.append(cells)
+
+        return worksheet
+
     def create_location_analysis(self, main_df):
         """
         Create pivot table analyzing tickets by location type (real, dummy, no location)
@@ -938,106 +1108,60 @@ class TicketsToGPRSFormatter:
             if 'طريقة الإتصال' in main_df.columns:
                 main_df = main_df.sort_values('طريقة الإتصال', na_position='last')
                 # Reset serial numbers after sorting
-                main_df['no'] = range(1, len(main_df) + 1)
+                main_df['no'] = np.arange(1, len(main_df) + 1, dtype=np.int32)
                 print(f"Sorted main sheet by communication technology")
 
             # Sort feedback dataframe by communication technology
             if feedback_df is not None and 'طريقة الإتصال' in feedback_df.columns:
                 feedback_df = feedback_df.sort_values('طريقة الإتصال', na_position='last')
                 # Reset serial numbers after sorting
-                feedback_df['no'] = range(1, len(feedback_df) + 1)
+                feedback_df['no'] = np.arange(1, len(feedback_df) + 1, dtype=np.int32)
                 print(f"Sorted feedback sheet by communication technology")
 
-            # Save with Excel writer
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+            # Build the whole workbook in one write-only pass - rows are
+            # streamed to the file instead of kept as a cell model, and the
+            # highlighting/charts go in before the single save
+            workbook = Workbook(write_only=True)
 
-                # Main sheet
-                main_df.to_excel(writer, index=False, sheet_name='GPRS_Data')
-                
-                # Feedback sheet if available
-                if feedback_df is not None:
-                    feedback_df.to_excel(writer, index=False, sheet_name='feedback')
-                    print(f"Added feedback sheet with {len(feedback_df)} records")
-                
-                # Pivot table sheet if available
-                if pivot_df is not None:
-                    # Save full table for charts, but we'll replace it with simple table later
-                    full_table = pivot_df['full_table'] 
-                    full_table.to_excel(writer, index=True, sheet_name='Daily ticket count')
-                    print(f"Added daily analysis sheet with {len(full_table)} connection types")
-                
-                # Location analysis pivot table
-                location_pivot = self.create_location_analysis(main_df)
-                if location_pivot is not None:
-                    location_pivot.to_excel(writer, index=True, sheet_name='Location Analysis')
-                    print(f"Added location analysis sheet with {len(location_pivot)} location types")
-
-                # Original data sheet (at the end)
-                if original_df is not None:
-                    original_df.to_excel(writer, index=False, sheet_name='original Data')
-                    print(f"Added original data sheet with {len(original_df)} records")
-
-                # Auto-adjust column widths for readability
-                for sheet_name in writer.sheets:
-                    worksheet = writer.sheets[sheet_name]
-                    
-                    for column in worksheet.columns:
-                        max_length = 0
-                        column_letter = column[0].column_letter
-                        
-                        for cell in column:
-                            try:
-                                cell_length = len(str(cell.value))
-                                if cell_length > max_length:
-                                    max_length = cell_length
-                            except:
-                                pass
-                        
-                        # Set column width (max 30 characters)
-                        adjusted_width = min(max_length + 2, 30)
-                        worksheet.column_dimensions[column_letter].width = adjusted_width
+            # Main sheet (with date-based highlighting)
+            print("Applying date-based highlighting...")
+            self._write_sheet(workbook, 'GPRS_Data', main_df, fills=self._date_highlight_fills(main_df))
             
-            # Apply date-based highlighting after saving
-            self.apply_date_highlighting(output_path, main_df, feedback_df)
+            # Feedback sheet if available
+            if feedback_df is not None:
+                self._write_sheet(workbook, 'feedback', feedback_df, fills=self._date_highlight_fills(feedback_df))
+                print(f"Added feedback sheet with {len(feedback_df)} records")
+            
+            # Pivot table sheet if available (simplified table - just totals)
+            if pivot_df is not None:
+                simple_table = pivot_df['simple_table'].rename_axis('طريقة الإتصال')
+                self._write_sheet(workbook, 'Daily ticket count', simple_table, index=True)
+                print(f"Added daily analysis sheet with {len(simple_table)} connection types")
+            
+            # Location analysis pivot table
+            location_pivot = self.create_location_analysis(main_df)
+            if location_pivot is not None:
+                self._write_sheet(workbook, 'Location Analysis', location_pivot, index=True)
+                print(f"Added location analysis sheet with {len(location_pivot)} location types")
+
+            # Original data sheet (at the end)
+            if original_df is not None:
+                self._write_sheet(workbook, 'original Data', original_df)
+                print(f"Added original data sheet with {len(original_df)} records")
             
             # Add charts to pivot table sheet if pivot data is available
             if pivot_df is not None:
-                print("Adding charts and simplifying pivot table...")
-                workbook = load_workbook(output_path)
+                print("Adding charts...")
                 
                 # Create charts using full data (pass the updated main_df)
                 self.create_charts_in_workbook(workbook, 'Daily ticket count', pivot_df, main_df)
-                
-                # Add the second chart BEFORE clearing the worksheet
                 self.create_combined_tech_status_chart(workbook, 'Daily ticket count', main_df)
                 
-                # Replace full table with simple table (just totals)
-                worksheet = workbook['Daily ticket count']
-                
-                # Clear the worksheet first
-                for row in worksheet.iter_rows():
-                    for cell in row:
-                        cell.value = None
-                
-                # Add simplified table at the top
-                simple_table = pivot_df['simple_table']
-                
-                # Write headers
-                worksheet['A1'] = 'طريقة الإتصال'
-                worksheet['B1'] = 'Total'
-                
-                # Write data
-                for idx, (index, row) in enumerate(simple_table.iterrows(), 2):
-                    worksheet[f'A{idx}'] = index
-                    worksheet[f'B{idx}'] = row['Total']
-                
                 # Add location charts if location data is available
-                location_pivot = self.create_location_analysis(main_df)
                 if location_pivot is not None:
                     self.create_location_charts(workbook, 'Location Analysis', location_pivot)
-                
-                workbook.save(output_path)
-                print("Charts added and pivot table simplified successfully")
+            
+            workbook.save(output_path)
             
             print(f"File saved successfully: {output_filename}")
             return output_path
@@ -1175,8 +1299,9 @@ class TicketsToGPRSFormatter:
             PERMANENT_SHEET_ID = "13x58yfkrvA9_7bo-Wtzw6EwcPVCjE8x2IUmkF8c6Aro"
 
             # Build Sheets API service
-            sheets_service = build('sheets', 'v4', credentials=credentials)
-            drive_service = build('drive', 'v3', credentials=credentials)
+            # (bundled static discovery docs - no discovery fetch at startup)
+            sheets_service = build('sheets', 'v4', credentials=credentials, cache_discovery=False, static_discovery=True)
+            drive_service = build('drive', 'v3', credentials=credentials, cache_discovery=False, static_discovery=True)
 
             # ========================================================
             # STEP 1: Get all sheet names from temporary spreadsheet
@@ -1346,7 +1471,7 @@ class TicketsToGPRSFormatter:
                 return None
 
             # Build Drive service for file upload
-            drive_service = build('drive', 'v3', credentials=credentials)
+            drive_service = build('drive', 'v3', credentials=credentials, cache_discovery=False, static_discovery=True)
 
             # Your Google Drive folder ID
             folder_id = "1QsBV9mV3ATrZ6qU-QUIi1hBRlQ2pBk0c"
@@ -14,6 +14,7 @@ import sys
 import time
 import subprocess
 import logging
+import functools
 from datetime import datetime
 from pathlib import Path
 
@@ -26,6 +27,8 @@ from sheets_queue import GoogleSheetsQueue
 try:
     from google.oauth2 import service_account
     from googleapiclient.discovery import build
+    from google_auth_httplib2 import AuthorizedHttp
+    import httplib2
 except ImportError:
     pass
 
@@ -38,12 +41,20 @@ GOOGLE_CREDENTIALS_FILE = Path(__file__).parent / "google_credentials.json"
 GOOGLE_SHEET_QUEUE_ID = "1bfdWgSWpk25wt0tq5PPLuLySfJ-Vm4Ou7TVR2gVprag"  # Queue sheet ID (same as cloud bot)
 GOOGLE_SHEET_RESULTS_ID = "13x58yfkrvA9_7bo-Wtzw6EwcPVCjE8x2IUmkF8c6Aro"  # Main results sheet
 DAILY_TICKET_TAB = "Copy of Daily ticket count"  # Tab with daily summary (try both names)
+SHEETS_HTTP_TIMEOUT = 30  # Socket timeout (seconds) for the summary reads
 
 # Local automation script
 AUTOMATION_SCRIPT = Path("C:/Users/mshanab/AAA-Mohammad Khair AbuShanab/ULTIMATE_BACKUP_FOLDER/Project_Organization/RUN_COMPLETE_AUTOMATION_AUTO.bat")
 
-# Polling settings
-POLL_INTERVAL = 15  # Check every 15 seconds
+# Polling settings - the wait doubles from MIN to MAX while the queue is
+# empty and drops back to MIN as soon as a command shows up
+POLL_INTERVAL_MIN = 2
+POLL_INTERVAL_MAX = 32
+POLL_INTERVAL = 15  # Wait after an error
+
+# How many finished command IDs to remember, so a command whose result or
+# "processed" mark has not reached the sheet yet is not run a second time
+COMPLETED_IDS_MAX = 100
 
 # =============================================================================
 # LOGGING CONFIGURATION
@@ -69,6 +80,22 @@ logger = logging.getLogger(__name__)
 # GOOGLE SHEETS SUMMARY READER
 # =============================================================================
 
+@functools.lru_cache(maxsize=None)
+def _summary_service():
+    """
+    Build the read-only Sheets service once per process.
+
+    The AuthorizedHttp keeps its connection alive, so every run after the
+    first skips the TLS handshake (and the bundled static discovery doc
+    avoids fetching the API description).
+    """
+    credentials = service_account.Credentials.from_service_account_file(
+        str(GOOGLE_CREDENTIALS_FILE),
+        scopes=['https://www.googleapis.com/auth/spreadsheets.readonly']
+    )
+    http = AuthorizedHttp(credentials, http=httplib2.Http(timeout=SHEETS_HTTP_TIMEOUT))
+    return build('sheets', 'v4', http=http, cache_discovery=False, static_discovery=True)
+
 def read_daily_ticket_summary():
     """
     Read the daily ticket count summary from Google Sheets.
@@ -84,12 +111,8 @@ def read_daily_ticket_summary():
     try:
         logger.info("Reading daily ticket summary from Google Sheets...")
 
-        # Initialize Google Sheets service
-        credentials = service_account.Credentials.from_service_account_file(
-            str(GOOGLE_CREDENTIALS_FILE),
-            scopes=['https://www.googleapis.com/auth/spreadsheets.readonly']
-        )
-        service = build('sheets', 'v4', credentials=credentials)
+        # Google Sheets service (shared across runs)
+        service = _summary_service()
 
         # Try different tab names (Google Sheets may add "Copy of" prefix)
         tab_names_to_try = [
@@ -297,13 +320,17 @@ def run_local_automation():
 # POLLING LOOP
 # =============================================================================
 
-def process_command(queue, command):
+def process_command(queue, command, processed_rows, completed_ids):
     """
     Process a command from the queue.
 
     Args:
         queue: GoogleDriveQueue instance
         command: Command dictionary
+        processed_rows: List collecting row numbers to mark as processed
+                        (flushed once per poll by polling_loop, which only
+                        marks them once every queued result row is sent)
+        completed_ids: Dict of command IDs already run by this poller
 
     Returns:
         bool: True if processed successfully
@@ -317,29 +344,45 @@ def process_command(queue, command):
         logger.info(f"Command ID: {command_id}")
         logger.info("="*70)
 
+        if command_type == "RUNNIT" and command_id in completed_ids:
+            # Ran already - only its result/mark is still on the way
+            logger.info("Already ran - waiting for its result to be sent")
+            processed_rows.append(command.get('row_number'))
+            return True
+
         if command_type == "RUNNIT":
             # Run the automation
             success, message, data = run_local_automation()
 
-            # Write result to queue
+            # Queue the result and send it now - the bot is waiting for it.
+            # A row that fails to send stays queued and goes out with the
+            # next flush (end of poll, next check_commands or shutdown)
             logger.info("Writing result to Google Sheets...")
-            result_id = queue.write_result(command_id, success, message, data)
+            result_id = queue.write_result(command_id, success, message, data, defer=True)
 
-            if result_id:
-                logger.info(f"✓ Result written: {result_id}")
+            if not result_id:
+                logger.error("Failed to queue result - command left pending")
+                return False
+
+            # Remember it until well after the command has been marked processed
+            completed_ids[command_id] = True
+            while len(completed_ids) > COMPLETED_IDS_MAX:
+                del completed_ids[next(iter(completed_ids))]
+
+            if queue.flush_pending() is None:
+                logger.warning(f"Result {result_id} not sent yet - will retry")
             else:
-                logger.error("Failed to write result")
+                logger.info(f"✓ Result written: {result_id}")
 
-            # Delete command file
-            logger.info("Deleting command file...")
-            queue.delete_command(row_number=command.get('row_number'))
+            # Mark command as processed (flushed after this poll)
+            processed_rows.append(command.get('row_number'))
 
             return True
 
         else:
             logger.warning(f"Unknown command type: {command_type}")
             # Delete unknown command
-            queue.delete_command(row_number=command.get('row_number'))
+            processed_rows.append(command.get('row_number'))
             return False
 
     except Exception as e:
@@ -356,7 +399,7 @@ def polling_loop(queue):
     logger.info("="*70)
     logger.info("WORK COMPUTER POLLER - STARTED")
     logger.info("="*70)
-    logger.info(f"Polling interval: {POLL_INTERVAL} seconds")
+    logger.info(f"Polling interval: {POLL_INTERVAL_MIN}-{POLL_INTERVAL_MAX} seconds")
     logger.info(f"Automation script: {AUTOMATION_SCRIPT}")
     logger.info(f"Log file: {LOG_FILE}")
     logger.info("="*70)
@@ -365,6 +408,12 @@ def polling_loop(queue):
     consecutive_errors = 0
     max_consecutive_errors = 10
 
+    poll_delay = POLL_INTERVAL_MIN
+    empty_polls = 0
+
+    # Commands already run, oldest first (see COMPLETED_IDS_MAX)
+    completed_ids = {}
+
     while True:
         try:
             # Check for commands
@@ -373,20 +422,34 @@ def polling_loop(queue):
             if commands:
                 logger.info(f"Found {len(commands)} command(s) in queue")
 
-                for command in commands:
-                    process_command(queue, command)
+                processed_rows = []
+                try:
+                    for command in commands:
+                        process_command(queue, command, processed_rows, completed_ids)
+                finally:
+                    # One batchUpdate for every command handled this poll
+                    queue.delete_commands(processed_rows)
+
+                # Drop processed rows once enough piled up (no row numbers held now)
+                queue.compact('commands')
 
                 logger.info("All commands processed. Waiting for next poll...")
+
+                # Activity - check again soon
+                poll_delay = POLL_INTERVAL_MIN
+                empty_polls = 0
             else:
-                # No commands - just log every 10 polls
-                if int(time.time()) % (POLL_INTERVAL * 10) == 0:
+                # No commands - back off and just log every 10 polls
+                poll_delay = min(poll_delay * 2, POLL_INTERVAL_MAX)
+                empty_polls += 1
+                if empty_polls % 10 == 0:
                     logger.info(f"Still polling... ({datetime.now().strftime('%H:%M:%S')})")
 
             # Reset error counter on success
             consecutive_errors = 0
 
             # Wait before next poll
-            time.sleep(POLL_INTERVAL)
+            time.sleep(poll_delay)
 
         except KeyboardInterrupt:
             logger.info("Poller stopped by user")
@@ -404,6 +467,10 @@ def polling_loop(queue):
             logger.info(f"Waiting {POLL_INTERVAL} seconds before retry...")
             time.sleep(POLL_INTERVAL)
 
+    # Send any result rows still queued before exiting
+    if queue.flush_pending() is None:
+        logger.error("Exiting with unsent results - their commands stay pending")
+
 # =============================================================================
 # MAIN FUNCTION
 # =============================================================================